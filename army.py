@@ -4,14 +4,26 @@ Cavalry classes with their methods. The Army class is responsible for inputting
 then, setting each army in a stack or queue.
 
 """
+from __future__ import annotations
+
 __author__ = "Zaid"
 
 from abc import ABC, abstractmethod
 from stack_adt import ArrayStack
 from queue_adt import CircularQueue
+from rle_adt import RunQueue, RunStack
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Sequence, TextIO, Tuple, Type
 
 
 class Fighter(ABC):
+    """Abstract unit. Units only hold their life and experience, so they are slotted and carry no __dict__,
+    which keeps large armies small in memory."""
+    __slots__ = ("life", "experience")
+    PLURAL = "units"
+
     def __init__(self, life: int, experience: int) -> None:
         """ initialises the variables using the amounts received as input.
         :param life: Life points of the fighter
@@ -113,7 +125,9 @@ class Fighter(ABC):
 
 class Soldier(Fighter):
     """This class represents Fighter of type Soldier. Always costs 1, Starts with life value of 3 and experience 0."""
+    __slots__ = ()
     COST = 1
+    PLURAL = "soldiers"
 
     def __init__(self) -> None:
         """initialises the variables using Parent's init method with the amounts received as input.
@@ -156,7 +170,9 @@ class Soldier(Fighter):
 
 class Archer(Fighter):
     """This class represents Fighter of type Archer. Always costs 2, Starts with life value of 3 and experience 0."""
+    __slots__ = ()
     COST = 2
+    PLURAL = "archers"
 
     def __init__(self) -> None:
         """initialises the variables using Parent's init method with the amounts received as input.
@@ -198,7 +214,9 @@ class Archer(Fighter):
 
 class Cavalry(Fighter):
     """This class represents Fighter of type Cavalry. Always costs 3, Starts with life value of 4 and experience 0."""
+    __slots__ = ()
     COST = 3
+    PLURAL = "cavalries"
 
     def __init__(self) -> None:
         """Initialises the variables using Parent's init method with the amounts received as input.
@@ -240,102 +258,173 @@ class Cavalry(Fighter):
 
 
 class Army:
-
-    def __init__(self) -> None:
-        """Initialises the name and force to None.
-        :complexity: Best and worst is O(1), just assigning values to None
+    """The force of one player. Every army is bought with a budget of points, spent on units of the types in its
+    roster. By default the budget is BUDGET and the roster is ROSTER, an army is then given as the number of
+    soldiers, archers and cavalries."""
+    BUDGET = 30
+    ROSTER = (Soldier, Archer, Cavalry)
+
+    def __init__(self, budget: int = BUDGET, roster: Sequence[Type[Fighter]] = ROSTER, runs: bool = False) -> None:
+        """Initialises the name, force and units to None.
+        :param budget: points the army can spend on units
+        :param roster: unit types the army can buy, in the order their numbers are given. In the stack formation the
+                       first type ends on top, in the queue formation it ends at the front.
+        :param runs: store the force as runs of identical units, a RunStack or a RunQueue, see rle_adt.py
+        :complexity: Best and worst is O(1), just assigning values
         """
         self.name = None
         self.force = None
+        self.units = None
+        self.budget = budget
+        self.roster = tuple(roster)
+        self.runs = runs
+
+    def __price(self, units: Sequence[int]) -> int:
+        """Returns the cost of buying units[i] units of roster[i] for every i.
+        :complexity: Best and worst O(r) where r is the number of unit types in the roster
+        """
+        return sum(unit_type.COST * count for unit_type, count in zip(self.roster, units))
 
-    def __correct_army_given(self, soldiers: int, archers: int, cavalry: int) -> bool:
-        """Return true if sum of all fighter's cost doesnt exceed the budget which is 30.
-        :param soldiers: number of soldiers in army
-        :param archers: number of archers in army
-        :param cavalry: number of cavalries in army
-        :complexity: Best and worst O(1), just computing the price of the army and compare if exceed budget
+    def __correct_army_given(self, units: Sequence[int]) -> bool:
+        """Return true if sum of all fighter's cost doesnt exceed the budget.
+        :param units: number of units of every type of the roster
+        :complexity: Best and worst O(r) where r is the number of unit types in the roster, just computing the
+                     price of the army and compare if exceed budget
         """
-        for i in [soldiers, archers, cavalry]:
+        if len(units) != len(self.roster):
+            return False
+        for i in units:
             if i < 0:
                 return False
 
-        price = sum([Soldier.COST * soldiers,
-                     Archer.COST * archers,
-                     Cavalry.COST * cavalry])
-        if price > 30 or price < 0:
+        price = self.__price(units)
+        if price > self.budget or price < 0:
             return False
         else:
             return True
 
-    def __assign_army(self, name: str, sold: int, arch: int, cav: int, formation: int) -> None:
+    def __assign_army(self, name: str, units: Sequence[int], formation: int) -> None:
         """Assigns the units into Stack or Queue based on the formation value.
         :param name: name of the player
-        :param sold: number of soldiers
-        :param arch: number of archers
-        :param cav: number of cavalries
+        :param units: number of units of every type of the roster
         :param formation: using Stack or Queue
-        :complexity: Best and worst is O(n) where n is the sum of the number of soldiers, archers and cavalries.
-                     because just looping based on those numbers and assigning into stack or queue.
+        :complexity: Best and worst is O(n) where n is the total number of units.
+                     because just creating that many units and copying them into the stack or queue at once.
+                     O(r) where r is the number of unit types for an army stored as runs, one run per type.
         """
         self.name = name
         self.formation = formation
-        capacity = sum([sold, arch, cav])
-
-        # Stack
+        self.units = tuple(units)
+        if self.runs:
+            self.__assign_runs(units, formation)
+            return
+        capacity = sum(units)
+
+        # Queue order: first type of the roster at the front
+        fighters = []
+        for unit_type, count in zip(self.roster, units):
+            fighters.extend([unit_type() for _ in range(count)])
+
+        # Stack, the last unit pushed ends on top so the order is reversed
         if formation == 0:
+            fighters.reverse()
             self.force = ArrayStack(capacity)
-            # Adding Cavalry
-            for i in range(cav):
-                self.force.push(Cavalry())
-            # Adding Archers
-            for i in range(arch):
-                self.force.push(Archer())
-            # Adding Soldiers
-            for i in range(sold):
-                self.force.push(Soldier())
+            self.force.push_many(fighters)
 
         # Queue
         else:
             self.force = CircularQueue(max_capacity=capacity)
-            # Adding Soldiers
-            for i in range(sold):
-                self.force.append(Soldier())
-            # Adding Archers
-            for i in range(arch):
-                self.force.append(Archer())
-            # Adding Cavalry
-            for i in range(cav):
-                self.force.append(Cavalry())
+            self.force.extend(fighters)
+
+    def __assign_runs(self, units: Sequence[int], formation: int) -> None:
+        """Assigns the units as one run of fresh units per type of the roster, in the order of __assign_army.
+        :complexity: Best and worst is O(r) where r is the number of unit types in the roster
+        """
+        if formation == 0:
+            self.force = RunStack()
+            for unit_type, count in reversed(list(zip(self.roster, units))):
+                fresh = unit_type()
+                self.force.push_run(unit_type, fresh.life, fresh.experience, count)
+        else:
+            self.force = RunQueue()
+            for unit_type, count in zip(self.roster, units):
+                fresh = unit_type()
+                self.force.append_run(unit_type, fresh.life, fresh.experience, count)
+
+    def set_army(self, name: str, units: Sequence[int], formation: int) -> None:
+        """Non-interactive counterpart of choose_army, assigns the army from the number of units of every type of the
+           roster, (soldiers, archers, cavalry) by default, without reading from stdin or printing.
+        :param name: the player's name
+        :param units: number of units of every type of the roster
+        :param formation: using Stack or Queue
+        :raises ValueError: if the units given exceed the budget, are negative or do not match the roster
+        :complexity: Best and worst is O(n) where n is the total number of units, same as __assign_army
+        """
+        if not self.__correct_army_given(units):
+            raise ValueError("Invalid number of units")
+        self.__assign_army(name, units, formation)
+
+    def is_legal(self, units: Sequence[int]) -> bool:
+        """Return true if the units, one number per type of the roster, make an army set_army accepts.
+        :complexity: Best and worst O(r) where r is the number of unit types in the roster, see __correct_army_given
+        """
+        return self.__correct_army_given(units)
+
+    def legal_armies(self) -> List[Tuple[int, ...]]:
+        """Lists every army accepted by __correct_army_given, ordered by the number of units of the first type of the
+           roster, then the second, and so on.
+        :complexity: O(L*r) where L is the number of legal armies and r the number of unit types, every legal army
+                     is built a type at a time from the budget left
+        """
+        armies = [()]
+        for unit_type in self.roster:
+            armies = [army + (count,)
+                      for army in armies
+                      for count in range((self.budget - self.__price(army)) // unit_type.COST + 1)]
+        return armies
 
     def choose_army(self, name: str, formation: int) -> None:
-        """Always the user to input the number of soldiers, archers and cavalries, checks if they are correct,
+        """Always the user to input the number of units of every type of the roster, checks if they are correct,
            then assigns them, then prints them.
         :param name: the player's name
         :param formation: using Stack or Queue
-        :complexity: Best and worst is O(n) because inputting values is O(1), __correct_army_given is always O(1),
-                     __assign_army is O(n) where n is the number of soldiers,archers, and cavalries,
-                     so overall it is O(n)
+        :complexity: Best and worst is O(n) because inputting values is O(1), __correct_army_given is always O(r),
+                     __assign_army is O(n) where n is the total number of units, so overall it is O(n)
         """
         self.name = name
         self.name = formation
 
         while True:
-            s1, a1, c1 = [int(x) for x in input("Player " + name + " choose your army as ").split()]
-            if self.__correct_army_given(s1, a1, c1):
-                self.__assign_army(name, s1, a1, c1, formation)
+            units = [int(x) for x in input("Player " + name + " choose your army as ").split()]
+            if self.__correct_army_given(units):
+                self.__assign_army(name, units, formation)
                 print("Where ", end='')
-                print(f"{s1} is the number of soldiers")
-                print(f"      {a1} is the number of archers")
-                print(f"      {c1} is the number of cavalries")
+                for i, (unit_type, count) in enumerate(zip(self.roster, units)):
+                    indent = "      " if i > 0 else ""
+                    print(f"{indent}{count} is the number of {unit_type.PLURAL}")
             else:
                 print("Invalid number of units, try again")
                 self.choose_army(name, formation)
             break
 
+    def __iter__(self) -> Iterator[Fighter]:
+        """Yields the units of the force in the order they will fight, without removing them.
+        :complexity: O(n) where n is the number of units, see the __iter__ of stack_adt and queue_adt
+        """
+        return iter(self.force)
+
+    def write_to(self, file: TextIO) -> None:
+        """Writes what __str__ returns to file one unit at a time, so that large armies can be logged without
+           building the whole string.
+        :complexity: Best and worst is O(n) where n is the number of units
+        """
+        self.force.write_to(file)
+
     def __str__(self) -> str:
         """
         returns string containing the information of each army element in force.
-        :complexity: Best and worst is O(n) because use's stack_adt or queue_adt __str__ method which is O(n)
+        :complexity: Best and worst is O(n) because use's stack_adt or queue_adt __str__ method which is O(n),
+                     write_to avoids holding the result
         """
         return str(self.force)
 
@@ -0,0 +1,134 @@
+"""
+Seeded random armies for sweeps. Every legal army of a budget and roster, as accepted by Army.set_army, is listed once
+in a table, and armies are drawn from it in O(1) each: uniformly, or weighted by the mix of units they hold with
+Vose's alias method, without retrying rejected draws. The same seed always gives the same armies, and pairings come
+out as the (army1, army2, formation) triples Battle.batch_combat takes.
+
+The table holds every legal army, about budget^3/36 of them with the default roster, so it suits budgets up to a few
+hundred points. count_armies counts them without listing them.
+"""
+__author__ = "Zaid"
+
+import random
+from typing import Iterator, List, Optional, Sequence, Tuple, Type
+
+from army import Army, Fighter
+
+Units = Tuple[int, ...]
+Pairing = Tuple[Units, Units, int]
+
+
+def count_armies(budget: int = Army.BUDGET, roster: Sequence[Type[Fighter]] = Army.ROSTER) -> int:
+    """
+    Returns the number of legal armies of budget and roster, that is of ways to buy units of the roster for at most
+    budget points.
+    :complexity: O(r*b) where r is the number of unit types and b the budget
+    """
+    # ways[points]: number of armies of the types seen so far costing exactly points
+    ways = [1] + [0] * budget
+    for unit_type in roster:
+        for points in range(unit_type.COST, budget + 1):
+            ways[points] += ways[points - unit_type.COST]
+    return sum(ways)
+
+
+class ArmyGenerator:
+    """ Draws legal armies at random.
+
+    Attributes:
+         armies (List[Units]): every legal army, in the order of Army.legal_armies
+         probability (List[float]): alias table, chance of keeping the army drawn at every index
+         alias (List[int]): alias table, index drawn instead when the army is not kept
+    """
+
+    def __init__(self, budget: int = Army.BUDGET, roster: Sequence[Type[Fighter]] = Army.ROSTER,
+                 weights: Optional[Sequence[float]] = None, seed: Optional[int] = None) -> None:
+        """
+        :param budget: budget of the armies, see Army
+        :param roster: unit types of the armies, see Army
+        :param weights: one weight per unit type of the roster. An army holding c[i] units of every type i is drawn
+                        with a chance proportional to the product of weights[i]**c[i], so that a weight above 1
+                        favours armies with many units of its type and 0 rules the type out (the empty army always
+                        weighs 1). None draws uniformly.
+        :param seed: seed of the draws, None seeds from the system
+        :raises ValueError: if weights is not one non-negative number per unit type
+        :complexity: O(L*r) where L is the number of legal armies and r the number of unit types
+        """
+        self.armies: List[Units] = Army(budget, roster).legal_armies()
+        self.random = random.Random(seed)
+        self.probability: List[float] = []
+        self.alias: List[int] = []
+        if weights is not None:
+            if len(weights) != len(self.armies[0]) or any(weight < 0 for weight in weights):
+                raise ValueError("weights must be one non-negative number per unit type")
+            self.__build_alias(weights)
+
+    def __build_alias(self, weights: Sequence[float]) -> None:
+        """
+        Builds the alias table of Vose's method: every index keeps its army with some probability, and otherwise
+        hands over to one alias, so that every army ends up drawn with a chance proportional to its weight.
+        :complexity: O(L*r) where L is the number of legal armies and r the number of unit types
+        """
+        army_weights = []
+        for army in self.armies:
+            weight = 1.0
+            for unit_weight, count in zip(weights, army):
+                weight *= unit_weight ** count
+            army_weights.append(weight)
+        total = sum(army_weights)
+
+        count = len(army_weights)
+        scaled = [weight * count / total for weight in army_weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [index for index, share in enumerate(scaled) if share < 1.0]
+        large = [index for index, share in enumerate(scaled) if share >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # whatever is left is 1 up to rounding errors, those indices always keep their army
+
+    def __len__(self) -> int:
+        """ Returns the number of legal armies."""
+        return len(self.armies)
+
+    def sample(self) -> Units:
+        """
+        Returns one random legal army.
+        :complexity: O(1)
+        """
+        index = self.random.randrange(len(self.armies))
+        if self.alias and self.random.random() >= self.probability[index]:
+            index = self.alias[index]
+        return self.armies[index]
+
+    def stream(self, count: Optional[int] = None) -> Iterator[Units]:
+        """
+        Yields count random legal armies, or never stops when count is None.
+        :complexity: O(1) per army
+        """
+        drawn = 0
+        while count is None or drawn < count:
+            yield self.sample()
+            drawn += 1
+
+    def pairings(self, count: Optional[int] = None, formation: Optional[int] = None) -> Iterator[Pairing]:
+        """
+        Yields count random (army1, army2, formation) triples for Battle.batch_combat, or never stops when count is
+        None.
+        :param formation: formation of every pairing, None draws 0 (stack) or 1 (queue) for each one
+        :complexity: O(1) per pairing
+        """
+        drawn = 0
+        while count is None or drawn < count:
+            army1 = self.sample()
+            army2 = self.sample()
+            yield army1, army2, formation if formation is not None else self.random.randrange(2)
+            drawn += 1
@@ -1,16 +1,149 @@
 """
 Contains Battle class and all it's methods to allow reading and creating player's armies to fight based on what
-formation and then declare a winner or draw.
+formation and then declare a winner or draw. The unit tests are in test_battle.py.
 """
+from __future__ import annotations
 
 __author__ = "Zaid"
 
+import sys
+from collections import OrderedDict
+from time import perf_counter_ns
 from army import Army
 from army import Fighter
+from queue_adt import CircularQueue
+from rle_adt import RunQueue, RunStack
+from stack_adt import ArrayStack
+from unit_rules import loses_one_at_most, stats
+
+# typing and the optional modules are only imported by type checkers, see referential_array.py
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Type, Union
+    from combat_log import CombatRecorder
+    from matchups import MatchupTable
+    from persistent_adt import PersistentQueue, PersistentStack
+    from profiling import BattleProfiler
+    from result_cache import ResultCache
+
+    Units = Tuple[int, ...]
+    Pairing = Tuple[Units, Units, int]
+    # (type, life, experience) of both units at the start of a duel, mapped to their life and experience at its end
+    DuelKey = Tuple[type, int, int, type, int, int]
+    DuelOutcome = Tuple[int, int, int, int]
+    Force = Union[PersistentStack[Fighter], PersistentQueue[Fighter]]
+
+# phases timed by a BattleProfiler, see profiling.py
+TAKE = "take"
+COMBAT = "combat"
+PUSH_BACK = "push_back"
+RESULT = "result"
+
+# outcomes of the duels met, and of the single rounds of the queue formation, kept up to OUTCOMES_MAXSIZE each,
+# the least recently used one dropped first, see result_cache.py
+OUTCOMES_MAXSIZE = 4096
+_duel_outcomes: "OrderedDict[DuelKey, DuelOutcome]" = OrderedDict()
+_round_outcomes: "OrderedDict[DuelKey, DuelOutcome]" = OrderedDict()
+
+
+def _outcome(outcomes: "OrderedDict[DuelKey, DuelOutcome]", key: DuelKey,
+             fight: Callable[[DuelKey], DuelOutcome]) -> DuelOutcome:
+    """ Returns the outcome of key in outcomes, calling fight to get it and remembering it the first time, as the
+        most recently used one.
+    :complexity: O(1), plus the cost of fight when key is not in outcomes
+    """
+    outcome = outcomes.get(key)
+    if outcome is None:
+        outcome = outcomes[key] = fight(key)
+        while len(outcomes) > OUTCOMES_MAXSIZE:
+            outcomes.popitem(last=False)
+    else:
+        outcomes.move_to_end(key)
+    return outcome
+
+
+class BattleState:
+    """ State of a battle that is never changed, see Battle.branch. Both forces are persistent stacks or queues of
+        units that are not changed either, so a state is forked by keeping a reference to it, in O(1).
+
+    Attributes:
+         force1 (PersistentStack[Fighter] or PersistentQueue[Fighter]): force of player1
+         force2 (PersistentStack[Fighter] or PersistentQueue[Fighter]): force of player2
+         formation (int): 0 for Stack, 1 for Queue
+         rounds (int): rounds fought to reach the state
+    """
+    __slots__ = ("force1", "force2", "formation", "rounds")
+
+    def __init__(self, force1: Force, force2: Force, formation: int, rounds: int = 0) -> None:
+        """
+        :complexity: O(1)
+        """
+        self.force1 = force1
+        self.force2 = force2
+        self.formation = formation
+        self.rounds = rounds
+
+    def is_over(self) -> bool:
+        """ True if either force is empty."""
+        return self.force1.is_empty() or self.force2.is_empty()
 
 
 class Battle:
 
+    def __init__(self, matchups: Optional["MatchupTable"] = None, resolve_duels: bool = False,
+                 budget: int = Army.BUDGET, roster: Sequence[Type[Fighter]] = Army.ROSTER,
+                 recorder: Optional["CombatRecorder"] = None, checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = 0, profiler: Optional["BattleProfiler"] = None,
+                 cache: Optional["ResultCache"] = None, oracle: bool = False, runs: bool = False) -> None:
+        """
+        :param matchups: precomputed results consulted by headless_combat instead of simulating, see matchups.py.
+                         A table only holds armies of the default budget and roster, so it cannot be combined with
+                         any other.
+        :param resolve_duels: in the stack formation, resolve the rounds between the same two units in one step with
+                              resolve_duel instead of one round at a time, and end mirrored battles in a draw
+                              without fighting them unless they are recorded, checkpointed or profiled
+        :param budget: budget of the armies created by headless_combat
+        :param roster: unit types of the armies created by headless_combat, see Army
+        :param recorder: receives every round fought, see combat_log.py. Duels are fought round by round while
+                         recording, even with resolve_duels.
+        :param checkpoint_path: file the state of the battle is written to every checkpoint_every rounds, see
+                                checkpoint.py. "{round}" in it is replaced by the number of rounds fought, so
+                                that every checkpoint is kept.
+        :param checkpoint_every: rounds between checkpoints, 0 never writes any. Duels are fought round by round
+                                 while checkpointing, even with resolve_duels.
+        :param profiler: counts and times every phase of the battles while it is enabled, see profiling.py
+        :param cache: results of the matches already fought, by the composition of both armies, see result_cache.py.
+                      A match found in it is not fought again, so it is neither recorded, checkpointed nor profiled.
+        :param oracle: end a battle as soon as the life left in both armies decides its winner, see __life_left.
+                       Battles are fought to the end while recording, and with a roster holding a unit type that
+                       can lose more than 1 life defending, for which the bound does not hold.
+        :param runs: store the armies created by the Battle as runs of identical units, see rle_adt.py, and fight
+                     whole runs at once, see __conduct_run_combat. Ignored while checkpointing, and runs are fought
+                     a unit at a time while recording or profiling.
+        :raises ValueError: if matchups are given with a budget or roster other than the default ones
+        :complexity: Best and worst is O(1), just assigning values
+        """
+        if matchups is not None and (budget != Army.BUDGET or tuple(roster) != Army.ROSTER):
+            raise ValueError("A matchup table only holds armies of the default budget and roster")
+        self.matchups = matchups
+        self.resolve_duels = resolve_duels
+        self.budget = budget
+        self.roster = tuple(roster)
+        self.recorder = recorder
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.profiler = profiler
+        self.cache = cache
+        self.oracle = oracle and loses_one_at_most(self.roster)
+        self.runs = runs
+
+    def __new_army(self) -> Army:
+        """
+        Returns an empty army of the budget and roster of the Battle, stored as runs with runs unless checkpointing.
+        :complexity: O(1)
+        """
+        return Army(self.budget, self.roster, self.runs and self.checkpoint_every == 0)
+
     def gladiatorial_combat(self, player_one: str, player_two: str) -> int:
         """
         reads and creates an army for each player in the stack formation, then sets the armies using choose_army()
@@ -20,12 +153,12 @@ class Battle:
         :complexity: Best and worst is O(n) where n is the length of the Stack. Because when calling __conduct_combat
                      it will loop through all the elements in both armies till one of the armies is empty
         """
-        army1 = Army()
-        army2 = Army()
+        army1 = self.__new_army()
+        army2 = self.__new_army()
         army1.choose_army(player_one, 0)
         army2.choose_army(player_two, 0)
 
-        return self.__conduct_combat(army1, army2, 0)
+        return self.__cached_combat(army1, army2, 0)
 
     def fairer_combat(self, player_one: str, player_two: str) -> int:
         """
@@ -36,26 +169,222 @@ class Battle:
         :complexity: Best and worst is O(n) where n is the length of the Queue. Because when calling __conduct_combat
                      it will loop through all the elements in both armies till one of the armies is empty
         """
-        army1 = Army()
-        army2 = Army()
+        army1 = self.__new_army()
+        army2 = self.__new_army()
         army1.choose_army(player_one, 1)
         army2.choose_army(player_two, 1)
 
-        return self.__conduct_combat(army1, army2, 1)
+        return self.__cached_combat(army1, army2, 1)
+
+    def headless_combat(self, army1: Units, army2: Units, formation: int) -> int:
+        """
+        Creates both armies from (soldiers, archers, cavalry) tuples without reading from stdin, then starts combat
+        between both armies and returns the winner. With another roster the tuples hold the number of units of every
+        type of the roster instead.
+        :param army1: number of soldiers, archers and cavalries of player1
+        :param army2: number of soldiers, archers and cavalries of player2
+        :param formation: The formation of both armies (0 for Stack, 1 for Queue)
+        :raises ValueError: if either army is not a legal army
+        :complexity: Best and worst is O(n) where n is the number of units in both armies, same as __conduct_combat.
+                     O(1) when the Battle has a matchup table or the match is in its cache.
+        """
+        if self.matchups is not None:
+            return self.matchups.lookup(army1, army2, formation)
+        if self.cache is not None:
+            return self.cache.fetch(army1, army2, formation, lambda: self.__headless_combat(army1, army2, formation))
+        return self.__headless_combat(army1, army2, formation)
+
+    def __headless_combat(self, army1: Units, army2: Units, formation: int) -> int:
+        """
+        Creates both armies and fights them, see headless_combat.
+        :complexity: Best and worst is O(n) where n is the number of units in both armies, same as __conduct_combat
+        """
+        first = self.__new_army()
+        second = self.__new_army()
+        first.set_army("1", army1, formation)
+        second.set_army("2", army2, formation)
+
+        profiled = self.profiler is not None and self.profiler.enabled
+        if self.resolve_duels and self.recorder is None and self.checkpoint_every == 0 and not profiled \
+                and tuple(army1) == tuple(army2):
+            # both units of every round are in the same state, so every round ends the same for both: a draw
+            return 0
 
-    def __conduct_combat(self, army1: Army, army2: Army, formation: int) -> int:
+        return self.__conduct_combat(first, second, formation)
+
+    def batch_combat(self, pairings: Iterable[Pairing]) -> Iterator[int]:
+        """
+        Lazily runs one headless combat per pairing, yielding each result as soon as it is known, so that arbitrarily
+        many pairings can be streamed without being held in memory.
+        :param pairings: iterable of (army1, army2, formation) triples
+        :complexity: Best and worst is O(m*n) where m is the number of pairings and n the size of the largest army
+        """
+        for army1, army2, formation in pairings:
+            yield self.headless_combat(army1, army2, formation)
+
+    def sweep(self, armies: Sequence[Units], opponent: Units, formation: int) -> List[int]:
+        """
+        Returns the results of every army against opponent, as headless_combat(army, opponent, formation) would, in
+        the order of armies. In the stack formation the armies are swept through a BattleTrie, fighting the units
+        they start with in common once, see battle_trie.py, unless the Battle has a matchup table or a cache or
+        records, checkpoints or profiles its battles.
+        :raises ValueError: if an army or the opponent is not legal
+        :complexity: O(N*d) in the stack formation, where N is the number of distinct prefixes of the stacks of the
+                     armies and d the number of duels a unit fights, otherwise O(m*n) where m is the number of armies
+                     and n the size of the largest army
+        """
+        plain = (self.matchups is None and self.cache is None and self.recorder is None and self.checkpoint_every == 0
+                 and (self.profiler is None or not self.profiler.enabled))
+        if formation == 0 and plain:
+            from battle_trie import BattleTrie
+
+            return BattleTrie(armies, self.budget, self.roster).sweep(opponent, self)
+        return [self.headless_combat(army, opponent, formation) for army in armies]
+
+    def branch(self, army1: Units, army2: Units, formation: int) -> BattleState:
+        """
+        Returns the state of the battle between both armies before its first round. The battle is fought a round at
+        a time with step and play, which return new states and leave the ones they are given as they are, so that
+        any state can be gone back to and fought on differently, without copying it.
+        :param army1: number of units of every type of the roster of player1, see headless_combat
+        :param army2: number of units of every type of the roster of player2
+        :param formation: The formation of both armies (0 for Stack, 1 for Queue)
+        :raises ValueError: if either army is not a legal army
+        :complexity: O(n) where n is the number of units in both armies
+        """
+        # branched battles are neither recorded, checkpointed nor profiled, their rounds are not those of one battle
+        from persistent_adt import PersistentQueue, PersistentStack
+
+        forces = []
+        for units in (army1, army2):
+            if not Army(self.budget, self.roster).is_legal(units):
+                raise ValueError("Invalid number of units")
+            # the first type of the roster on top of the stack or at the front of the queue, as Army does
+            fighters = [unit_type() for unit_type, count in zip(self.roster, units) for _ in range(count)]
+            if formation == 0:
+                forces.append(PersistentStack(reversed(fighters)))
+            else:
+                forces.append(PersistentQueue(fighters))
+        return BattleState(forces[0], forces[1], formation)
+
+    def step(self, state: BattleState) -> BattleState:
+        """
+        Returns the state after the next round of the battle in state, which is left as it is, or state itself
+        when the battle is over.
+        :complexity: O(1), amortised in the queue formation, see PersistentQueue
+        """
+        if state.is_over():
+            return state
+        if state.formation == 0:
+            U1, force1 = state.force1.pop()
+            U2, force2 = state.force2.pop()
+        else:
+            U1, force1 = state.force1.serve()
+            U2, force2 = state.force2.serve()
+
+        # the units are shared with the states forked from this one, the round is fought by copies of them
+        U1 = self.__copy(U1)
+        U2 = self.__copy(U2)
+        self.__attack_and_defend(U1, U2)
+        alive1, alive2 = self.end_round(U1, U2)
+        if alive1:
+            force1 = force1.push(U1) if state.formation == 0 else force1.append(U1)
+        if alive2:
+            force2 = force2.push(U2) if state.formation == 0 else force2.append(U2)
+        return BattleState(force1, force2, state.formation, state.rounds + 1)
+
+    def play(self, state: BattleState, rounds: Optional[int] = None) -> BattleState:
+        """
+        Returns the state after rounds more rounds of the battle in state, or at its end when rounds is None or the
+        battle ends before. state is left as it is.
+        :complexity: O(r) where r is the number of rounds fought
+        """
+        fought = 0
+        while not state.is_over() and (rounds is None or fought < rounds):
+            state = self.step(state)
+            fought += 1
+        return state
+
+    def finish(self, state: BattleState) -> int:
+        """
+        Fights the battle in state to its end and returns its result, 0, 1 or 2 as result does. state is left as
+        it is.
+        :complexity: O(r) where r is the number of rounds left
+        """
+        state = self.play(state)
+        if state.force1.is_empty() and state.force2.is_empty():
+            return 0
+        return 1 if state.force2.is_empty() else 2
+
+    @staticmethod
+    def __copy(unit: Fighter) -> Fighter:
+        """ Returns a new unit of the type, life and experience of unit.
+        :complexity: O(1)
+        """
+        copy = type(unit)()
+        copy.life = unit.life
+        copy.experience = unit.experience
+        return copy
+
+    def resume(self, path: str) -> int:
+        """
+        Goes on with the battle saved in a checkpoint until the end and returns the winner, see checkpoint.py.
+        :param path: checkpoint written by a Battle with the same roster
+        :complexity: Best and worst is O(n) where n is the number of units left, same as __conduct_combat
+        """
+        from checkpoint import read_checkpoint
+
+        army1, army2, formation, rounds = read_checkpoint(path, self.roster)
+        return self.__conduct_combat(army1, army2, formation, rounds)
+
+    def __cached_combat(self, army1: Army, army2: Army, formation: int) -> int:
+        """
+        Returns the result of the armies from the cache when it is there, otherwise conducts the combat.
+        :complexity: O(r) on a hit where r is the number of unit types, same as __conduct_combat otherwise
+        """
+        if self.cache is None:
+            return self.__conduct_combat(army1, army2, formation)
+        return self.cache.fetch(army1.units, army2.units, formation,
+                                lambda: self.__conduct_combat(army1, army2, formation))
+
+    def __conduct_combat(self, army1: Army, army2: Army, formation: int, rounds: int = 0) -> int:
         """
         Conducts the combat based on formation of the two armies
         :param army1: Army object with a force of units within it
         :param army2: Army object with a force of units within it
         :param formation: The formation of the army (Stack or Queue)
+        :param rounds: rounds already fought, when resuming a battle
         :return: returns an integer 0,1,2 indicating which player won or if it is a draw
         :complexity: Best and worst is O(n) where n is the length of queue or stack, it will loop through all the
         elements in both armies till one of the armies is empty
         """
+        if self.recorder is not None:
+            self.recorder.start_battle()
+        profiler = self.profiler if self.profiler is not None and self.profiler.enabled else None
+        if self.runs and self.recorder is None and profiler is None and isinstance(army1.force, (RunStack, RunQueue)):
+            # before the oracle totals, which walk every unit of both armies
+            return self.__conduct_run_combat(army1, army2, formation)
+        # a resolved duel is many rounds in one, which the rounds counted for checkpoints would miss
+        resolve_duels = formation == 0 and self.resolve_duels and self.recorder is None and self.checkpoint_every == 0
+        oracle = self.oracle and self.recorder is None
+        if oracle:
+            life1, toughness1 = self.__life_left(army1)
+            life2, toughness2 = self.__life_left(army2)
+        if self.checkpoint_every > 0:
+            from checkpoint import write_checkpoint
 
         # step 4: at least one army is empty, end
         while not army1.force.is_empty() and not army2.force.is_empty():
+            if oracle and (toughness2 > life1 or toughness1 > life2):
+                # see __life_left: the army that cannot be destroyed any more wins
+                return 2 if toughness2 > life1 else 1
+            if self.checkpoint_every > 0 and rounds % self.checkpoint_every == 0:
+                write_checkpoint(self.checkpoint_path.format(round=rounds), army1, army2, formation, rounds,
+                                 self.roster)
+            rounds += 1
+            if profiler is not None:
+                clock = perf_counter_ns()
+
             if formation == 0:
                 # step 1: pop/serve units
                 U1 = army1.force.pop()
@@ -63,16 +392,181 @@ class Battle:
             else:
                 U1 = army1.force.serve()
                 U2 = army2.force.serve()
+            if profiler is not None:
+                clock = self.__lap(profiler, TAKE, clock)
+            if oracle:
+                before1 = U1.life
+                before2 = U2.life
+
+            if resolve_duels:
+                # steps 2 and 3 repeat with the same units until one dies, as both are pushed back and popped again
+                self.resolve_duel(U1, U2)
+                if profiler is not None:
+                    clock = self.__lap(profiler, COMBAT, clock)
+                if U1.is_alive():
+                    army1.force.push(U1)
+                if U2.is_alive():
+                    army2.force.push(U2)
+                if profiler is not None:
+                    self.__lap(profiler, PUSH_BACK, clock)
+            else:
+                # step 2: attack & defend
+                self.combat(U1, U2)
+                if profiler is not None:
+                    clock = self.__lap(profiler, COMBAT, clock)
 
-            # step 2: attack & defend
-            self.combat(U1, U2)
+                # step 3: if alive push units back
+                self.alive_units(U1, U2, formation, army1, army2)
+                if profiler is not None:
+                    self.__lap(profiler, PUSH_BACK, clock)
 
-            # step 3: if alive push units back
-            self.alive_units(U1, U2, formation, army1, army2)
+            if oracle:
+                # only the two units that fought changed, a dead unit has no life left
+                after1 = U1.life if U1.life > 0 else 0
+                after2 = U2.life if U2.life > 0 else 0
+                life1 += after1 - before1
+                life2 += after2 - before2
+                toughness1 += after1 // 2 - before1 // 2
+                toughness2 += after2 // 2 - before2 // 2
 
         # Declaring a winner
+        if profiler is None:
+            return self.result(army1, army2)
+        clock = perf_counter_ns()
+        winner = self.result(army1, army2)
+        self.__lap(profiler, RESULT, clock)
+        return winner
+
+    def __conduct_run_combat(self, army1: Army, army2: Army, formation: int) -> int:
+        """
+        Conducts the combat of two armies stored as runs, a run at a time where the rules allow it. In the stack
+        formation the two top units fight until one dies, see resolve_duel. When both die, the next units of both
+        top runs fight the very same duel, so the min(k1, k2) duels of the runs all end at once. In the queue
+        formation the units at the front of both front runs fight in pairs, every pair in the same states, so the
+        min(k1, k2) rounds between them end the same and their survivors join the rear as a single run.
+        :param army1: Army whose force is a RunStack or a RunQueue
+        :param army2: Army whose force is a RunStack or a RunQueue
+        :return: returns an integer 0,1,2 indicating which player won or if it is a draw
+        :complexity: O(s) where s is the number of steps: duels in the stack formation, fewer when runs annihilate
+                     each other, and pairs of front runs in the queue formation, which grows with the number of
+                     distinct unit states rather than with the number of units
+        """
+        force1 = army1.force
+        force2 = army2.force
+        while not force1.is_empty() and not force2.is_empty():
+            run1 = force1.peek_run()
+            run2 = force2.peek_run()
+            type1 = run1.unit_type
+            type2 = run2.unit_type
+            key = (type1, run1.life, run1.experience, type2, run2.life, run2.experience)
+            if formation == 0:
+                life1, experience1, life2, experience2 = self.__duel_outcome(key)
+                count = min(run1.count, run2.count) if life1 <= 0 and life2 <= 0 else 1
+                force1.take(count)
+                force2.take(count)
+                if life1 > 0:
+                    force1.push_run(type1, life1, experience1, 1)
+                if life2 > 0:
+                    force2.push_run(type2, life2, experience2, 1)
+            else:
+                life1, experience1, life2, experience2 = _outcome(_round_outcomes, key, self.__fight_round)
+                count = min(run1.count, run2.count)
+                force1.take(count)
+                force2.take(count)
+                if life1 > 0:
+                    force1.append_run(type1, life1, experience1, count)
+                if life2 > 0:
+                    force2.append_run(type2, life2, experience2, count)
         return self.result(army1, army2)
 
+    def __life_left(self, army: Army) -> Tuple[int, int]:
+        """
+        Returns the total life of the units of army and its toughness, the sum of life // 2 over its units. Oracle
+        battles end as soon as the toughness of an army exceeds the total life of the other one:
+
+        Every life lost is lost one point at a time: defend takes at most 1, which the Battle checks for the unit types
+        of its roster, see unit_rules.loses_one_at_most, and both units lose 1 when both survive,
+        so a unit loses at most 2 life in a round. A unit starting a round with 2 life or more survives the attacks,
+        so its opponent either dies or survives too and then loses 1: that round costs the opponent's army at least
+        1 life. Destroying a unit of life l takes at least l // 2 such rounds, before a last round that may be free
+        at life 1, so destroying an army costs its enemy at least its toughness. An army tougher than the total life
+        of the enemy can no longer be destroyed, and every round costs some life, so it wins. Both cannot hold at
+        once, as toughness is at most half the life of an army.
+        :complexity: O(n) where n is the number of units of army
+        """
+        life = 0
+        toughness = 0
+        for unit in army:
+            life += unit.life
+            toughness += unit.life // 2
+        return life, toughness
+
+    def __lap(self, profiler: "BattleProfiler", phase: str, clock: int) -> int:
+        """
+        Adds the time since clock to phase and returns the current time, the start of the next phase.
+        :complexity: O(1)
+        """
+        now = perf_counter_ns()
+        profiler.add(phase, now - clock)
+        return now
+
+    def resolve_duel(self, U1: Fighter, U2: Fighter) -> None:
+        """
+        Sets both units to their life and experience at the end of the stack duel between them, that is after the
+        rounds they fight until at least one of them dies. A duel is fully determined by the type, life and
+        experience of both units, so it is simulated once and its outcome looked up afterwards.
+        :param U1: Unit from army1
+        :param U2: Unit from army2
+        :complexity: O(1) when the duel was seen before, otherwise O(l) where l is the life of the units
+        """
+        key = (type(U1), U1.get_life(), U1.get_experience(), type(U2), U2.get_life(), U2.get_experience())
+        U1.life, U1.experience, U2.life, U2.experience = self.__duel_outcome(key)
+
+    def __duel_outcome(self, key: DuelKey) -> DuelOutcome:
+        """
+        Returns the outcome of the duel described by key, fighting it the first time it is met.
+        :complexity: O(1) when the duel was seen before, otherwise O(l) where l is the life of the units
+        """
+        return _outcome(_duel_outcomes, key, self.__fight_duel)
+
+    def __fight_duel(self, key: DuelKey) -> DuelOutcome:
+        """
+        Fights the duel described by key step by step, as two armies of a single unit in the stack formation.
+        :complexity: O(l) where l is the life of the units, one round per life point at most
+        """
+        type1, life1, experience1, type2, life2, experience2 = key
+        army1 = Army()
+        army2 = Army()
+        army1.force = ArrayStack(1)
+        army2.force = ArrayStack(1)
+        U1 = type1()
+        U2 = type2()
+        U1.life, U1.experience = life1, experience1
+        U2.life, U2.experience = life2, experience2
+        army1.force.push(U1)
+        army2.force.push(U2)
+        Battle().__conduct_combat(army1, army2, 0)
+        return U1.get_life(), U1.get_experience(), U2.get_life(), U2.get_experience()
+
+    def __fight_round(self, key: DuelKey) -> DuelOutcome:
+        """
+        Fights the single queue round described by key, attacks then the life lost or experience gained after it.
+        :complexity: O(1)
+        """
+        type1, life1, experience1, type2, life2, experience2 = key
+        army1 = Army()
+        army2 = Army()
+        army1.force = CircularQueue(1)
+        army2.force = CircularQueue(1)
+        U1 = type1()
+        U2 = type2()
+        U1.life, U1.experience = life1, experience1
+        U2.life, U2.experience = life2, experience2
+        battle = Battle()
+        battle.combat(U1, U2)
+        battle.alive_units(U1, U2, 1, army1, army2)
+        return U1.get_life(), U1.get_experience(), U2.get_life(), U2.get_experience()
+
     def combat(self, U1: Fighter, U2: Fighter) -> None:
         """
         Implements the second step of Attacking and defending between 2 units of opposite armies.
@@ -82,7 +576,51 @@ class Battle:
         :complexity: Best and worst is O(1), because just if statements, comparing and changing values, which are
                      all constant time operations
         """
-        # step 2: attack & defend
+        if self.recorder is not None:
+            self.recorder.open_round(U1, U2)
+        self.__attack_and_defend(U1, U2)
+
+    def __attack_and_defend(self, U1: Fighter, U2: Fighter) -> None:
+        """
+        Attack and defence of combat, without recording them.
+        :complexity: Best and worst is O(1), see combat
+        """
+        # step 2: attack & defend, with the rules of both units read from their tables, see unit_rules.py
+        row1 = stats(U1)
+        row2 = stats(U2)
+        if row1 is None or row2 is None:
+            # a unit whose rules do not fit in a row fights through its methods
+            self.__dispatch_combat(U1, U2)
+            return
+        speed1, attack1, threshold1, lost1 = row1
+        speed2, attack2, threshold2, lost2 = row2
+        # when U1 is faster than U2
+        if speed1 > speed2:
+            if attack1 >= threshold2:
+                U2.life -= lost2
+            if U2.life > 0 and attack2 >= threshold1:
+                U1.life -= lost1
+
+        # when U2 is faster than U1
+        elif speed2 > speed1:
+            if attack2 >= threshold1:
+                U1.life -= lost1
+            if U1.life > 0 and attack1 >= threshold2:
+                U2.life -= lost2
+
+        # U1 and U2 have equal speed
+        else:
+            if attack2 >= threshold1:
+                U1.life -= lost1
+            if attack1 >= threshold2:
+                U2.life -= lost2
+
+    @staticmethod
+    def __dispatch_combat(U1: Fighter, U2: Fighter) -> None:
+        """
+        Attack and defence of combat, through the methods of both units.
+        :complexity: Best and worst is O(1), a few method calls
+        """
         # when U1 is faster than U2
         if U1.get_speed() > U2.get_speed():
             U2.defend(U1.get_attack_damage())
@@ -109,35 +647,42 @@ class Battle:
         :param army2: player2's army
         :complexity: best and worst O(1) only constant operations, if statements
         """        
-        # if both alive, lose_life(1) and append back for both
-        if U1.is_alive() and U2.is_alive():
-            U1.lose_life(1)
-            U2.lose_life(1)
-
-        # if still alive after both losing life
-        if U1.is_alive() and U2.is_alive():
-            if formation == 0:
+        alive1, alive2 = self.end_round(U1, U2)
+        if formation == 0:
+            if alive1:
                 army1.force.push(U1)
+            if alive2:
                 army2.force.push(U2)
-            else:
+        else:
+            if alive1:
                 army1.force.append(U1)
+            if alive2:
                 army2.force.append(U2)
 
-        # if U1 alive and U2 is not, U1 gain's experience
-        elif U1.is_alive() and not U2.is_alive():
-            U1.gain_experience(1)
-            if formation == 0:
-                army1.force.push(U1)
-            else:
-                army1.force.append(U1)
+        if self.recorder is not None:
+            self.recorder.close_round(U1, U2)
 
-        # if U2 alive and U1 is not, U2 gain's experience
-        elif U2.is_alive() and not U1.is_alive():
+    @staticmethod
+    def end_round(U1: Fighter, U2: Fighter) -> Tuple[bool, bool]:
+        """ Ends the round of two units after they attacked and defended: both lose 1 life if both are alive, and a
+            unit that outlives the other gains 1 experience. Returns whether each unit is still alive.
+        :param U1: Unit1
+        :param U2: Unit2
+        :complexity: best and worst O(1) only constant operations, if statements
+        """
+        # if both alive, lose_life(1) for both
+        if U1.is_alive() and U2.is_alive():
+            U1.lose_life(1)
+            U2.lose_life(1)
+        alive1 = U1.is_alive()
+        alive2 = U2.is_alive()
+
+        # the unit alive when the other is not gains experience
+        if alive1 and not alive2:
+            U1.gain_experience(1)
+        elif alive2 and not alive1:
             U2.gain_experience(1)
-            if formation == 0:
-                army2.force.push(U2)
-            else:
-                army2.force.append(U2)
+        return alive1, alive2
 
     def result(self, army1: Army, army2: Army) -> int:
         """
@@ -161,3 +706,37 @@ class Battle:
         else:
             return player2Win
 
+
+
+def read_pairings(lines: Iterable[str]) -> Iterator[Pairing]:
+    """
+    Parses pairings written one per line as "s1 a1 c1 s2 a2 c2 formation". Blank lines are skipped.
+    :param lines: any iterable of lines, such as an open file
+    :raises ValueError: if a line does not contain exactly 7 integers
+    :complexity: O(m) where m is the number of lines, each line is parsed in constant time
+    """
+    for line in lines:
+        values = [int(x) for x in line.split()]
+        if not values:
+            continue
+        if len(values) != 7:
+            raise ValueError("Pairing must be 7 integers: s1 a1 c1 s2 a2 c2 formation")
+        yield tuple(values[0:3]), tuple(values[3:6]), values[6]
+
+
+def run_batch(source: TextIO, sink: TextIO) -> None:
+    """
+    Reads pairings from source and writes one result (0, 1 or 2) per line to sink, in the same order.
+    :complexity: O(m*n), see Battle.batch_combat
+    """
+    for outcome in Battle().batch_combat(read_pairings(source)):
+        sink.write(f"{outcome}\n")
+
+
+if __name__ == '__main__':
+    # python battle.py [pairings file], reads stdin when no file is given
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as pairings_file:
+            run_batch(pairings_file, sys.stdout)
+    else:
+        run_batch(sys.stdin, sys.stdout)
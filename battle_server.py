@@ -0,0 +1,174 @@
+"""
+Asyncio front-end running many headless matches at once. Clients connect over TCP or a Unix socket and send one JSON
+object per line:
+
+    {"id": 7, "army1": [10, 4, 4], "army2": [0, 0, 10], "formation": 0}
+
+Armies are checked with the budget rules of Army before anything is queued, battles run in a pool of worker
+processes, and every request gets one JSON line back, as soon as its battle is over, carrying the same id:
+
+    {"id": 7, "result": 2}     or     {"id": 7, "error": "Invalid number of units"}
+
+A connection may send new requests before the previous answers arrive, answers then come back in the order the
+battles finish. A request whose worker process died is answered with an error, and a connection the client reset
+is dropped without failing the others.
+"""
+__author__ = "Zaid"
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from army import Army
+from battle import Battle
+
+FORMATIONS = (0, 1)
+# errors of a connection the client closed or reset while it was served
+DISCONNECTED = (ConnectionResetError, BrokenPipeError)
+
+# one Battle per worker process, created on its first match
+_battle: Optional[Battle] = None
+
+
+def fight(army1: List[int], army2: List[int], formation: int) -> int:
+    """ Runs one headless match in a worker process and returns its result."""
+    global _battle
+    if _battle is None:
+        _battle = Battle()
+    return _battle.headless_combat(army1, army2, formation)
+
+
+def validate(request: Any) -> Optional[str]:
+    """ Returns why the request cannot be played, or None if it can.
+    :complexity: O(r) where r is the number of unit types of the roster
+    """
+    if not isinstance(request, dict):
+        return "Request must be a JSON object"
+    if request.get("formation") not in FORMATIONS or isinstance(request.get("formation"), bool):
+        return "formation must be 0 (stack) or 1 (queue)"
+    for key in ("army1", "army2"):
+        units = request.get(key)
+        if not isinstance(units, list) or not all(type(count) is int for count in units):
+            return key + " must be a list of integers"
+        if not Army().is_legal(units):
+            return "Invalid number of units"
+    return None
+
+
+class BattleServer:
+    """ Accepts matches from many connections and plays them in an executor.
+
+    Attributes:
+         executor (Executor): pool the battles run in
+         matches (int): number of matches played so far
+         connections (set): tasks serving the open connections
+    """
+
+    def __init__(self, executor: Optional[Executor] = None) -> None:
+        """
+        :param executor: pool the battles run in, a process pool with one worker per CPU by default
+        """
+        self.executor = executor if executor is not None else ProcessPoolExecutor()
+        self.matches = 0
+        self.server = None
+        self.connections = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> None:
+        """ Starts listening on path when it is given, a Unix socket, or on host and port otherwise. """
+        # play one empty match first so that a forking pool starts its workers now: a worker forked later would
+        # inherit the sockets of the connections open at that time and keep them open after they are closed here
+        await asyncio.get_running_loop().run_in_executor(self.executor, fight, [0, 0, 0], [0, 0, 0], 0)
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+
+    def address(self) -> Any:
+        """ Returns the address of the first listening socket, (host, port) for TCP, the path for a Unix socket. """
+        return self.server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        """ Serves until cancelled."""
+        await self.server.serve_forever()
+
+    async def close(self, grace: float = 5.0) -> None:
+        """ Stops listening, gives the open connections grace seconds to be closed by their clients, then drops
+        them and shuts the executor down. The shutdown waits for the workers in a thread, not in the event loop."""
+        self.server.close()
+        await self.server.wait_closed()
+        if self.connections:
+            _, left = await asyncio.wait(self.connections, timeout=grace)
+            for connection in left:
+                connection.cancel()
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Serves one connection, each request line is answered by its own task."""
+        connection = asyncio.current_task()
+        self.connections.add(connection)
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except DISCONNECTED:
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.answer(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            self.connections.discard(connection)
+            writer.close()
+
+    async def answer(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        """ Plays the match of one request line and writes the answer back, an error if the worker playing it died.
+        The connection is dropped if the client is gone."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+            error = "Request is not valid JSON"
+        else:
+            error = validate(request)
+        response: Dict[str, Any] = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        if error is None:
+            loop = asyncio.get_running_loop()
+            try:
+                response["result"] = await loop.run_in_executor(self.executor, fight, request["army1"],
+                                                                request["army2"], request["formation"])
+                self.matches += 1
+            except BrokenProcessPool:
+                response["error"] = "Battle worker failed"
+        else:
+            response["error"] = error
+        try:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        except DISCONNECTED:
+            writer.close()
+
+
+async def _main(arguments: argparse.Namespace) -> None:
+    server = BattleServer(ProcessPoolExecutor(arguments.workers))
+    await server.start(arguments.host, arguments.port, arguments.unix)
+    print("Serving on", server.address(), flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serves headless matches over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="path of a Unix socket to listen on instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes, one per CPU by default")
+    asyncio.run(_main(parser.parse_args()))
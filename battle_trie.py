@@ -0,0 +1,140 @@
+"""
+Sweeps of many armies against one opponent in the stack formation. The units of an army fight in a fixed order, the
+first type of the roster from the top, each one until it dies, so two armies starting with the same units fight the
+same duels until they differ. A BattleTrie holds the armies as paths of units from the top of their stack, and a
+sweep fights every edge once from the state of its parent, branching where the armies diverge, instead of fighting
+every army from the start.
+
+Only the top of the opponent's stack is ever hurt, the units below it are still fresh, so the state of a battle after
+a prefix is (opponent units destroyed, life and experience of the opponent's top unit, whether a unit of ours is left
+once the opponent is destroyed), and branching it is free. The unit tests are in test_battle_trie.py.
+"""
+__author__ = "Zaid"
+
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from army import Army, Fighter
+from battle import Battle
+
+Units = Tuple[int, ...]
+# opponent units destroyed, life and experience of its top unit, a unit of ours left when it is all destroyed
+State = Tuple[int, int, int, bool]
+
+
+class _Node:
+    """ Prefix of the stacks of some armies.
+
+    Attributes:
+         children (Dict[Type[Fighter], _Node]): prefixes one unit longer, by the type of that unit
+         armies (List[int]): indices of the armies whose stack is exactly this prefix
+    """
+    __slots__ = ("children", "armies")
+
+    def __init__(self) -> None:
+        self.children: Dict[Type[Fighter], _Node] = {}
+        self.armies: List[int] = []
+
+
+class BattleTrie:
+    """ Trie of the stacks of armies, to sweep them against opponents in the stack formation.
+
+    Attributes:
+         armies (List[Units]): armies of the trie, sweeps return their results in this order
+         budget (int): budget of the armies and the opponents
+         roster (Tuple[Type[Fighter], ...]): unit types of the armies and the opponents
+         nodes (int): prefixes in the trie, the root included
+    """
+
+    def __init__(self, armies: Sequence[Sequence[int]], budget: int = Army.BUDGET,
+                 roster: Sequence[Type[Fighter]] = Army.ROSTER) -> None:
+        """
+        :raises ValueError: if an army is not legal
+        :complexity: O(n) where n is the number of units of all the armies
+        """
+        self.armies = [tuple(army) for army in armies]
+        self.budget = budget
+        self.roster = tuple(roster)
+        self.root = _Node()
+        self.nodes = 1
+        army = Army(budget, roster)
+        for index, units in enumerate(self.armies):
+            if not army.is_legal(units):
+                raise ValueError("Invalid number of units")
+            self.__insert(index, units)
+
+    def __insert(self, index: int, units: Units) -> None:
+        """ Adds the path of the stack of army index, from the top, to the trie.
+        :complexity: O(n) where n is the number of units of the army
+        """
+        node = self.root
+        for unit_type, count in zip(self.roster, units):
+            for _ in range(count):
+                child = node.children.get(unit_type)
+                if child is None:
+                    child = node.children[unit_type] = _Node()
+                    self.nodes += 1
+                node = child
+        node.armies.append(index)
+
+    def sweep(self, opponent: Sequence[int], battle: Optional[Battle] = None) -> List[int]:
+        """
+        Fights every army of the trie against opponent in the stack formation and returns the results in the order of
+        armies, as Battle.headless_combat(army, opponent, 0) would.
+        :param opponent: units of every type of the roster of the opponent, who fights as player 2
+        :param battle: Battle fighting the duels, see Battle.resolve_duel
+        :raises ValueError: if the opponent is not legal
+        :complexity: O(N*d) where N is the number of nodes and d the number of duels a unit fights, about as many as
+                     the opponent units it destroys, compared with O(A*n) for A armies of n units fought one by one
+        """
+        if not Army(self.budget, self.roster).is_legal(opponent):
+            raise ValueError("Invalid number of units")
+        theirs = [unit_type for unit_type, count in zip(self.roster, opponent) for _ in range(count)]
+        battle = battle if battle is not None else Battle(budget=self.budget, roster=self.roster)
+        extended: Dict[Tuple[State, Type[Fighter]], State] = {}
+        results = [0] * len(self.armies)
+
+        # depth first, every node is fought once from the state of its parent
+        pending = [(self.root, self.__fresh(theirs, 0, False))]
+        while pending:
+            node, state = pending.pop()
+            if node.armies:
+                destroyed, _, _, ours = state
+                result = 2 if destroyed < len(theirs) else 1 if ours else 0
+                for index in node.armies:
+                    results[index] = result
+            for unit_type, child in node.children.items():
+                key = (state, unit_type)
+                child_state = extended.get(key)
+                if child_state is None:
+                    child_state = extended[key] = self.__fight(battle, theirs, state, unit_type())
+                pending.append((child, child_state))
+        return results
+
+    @staticmethod
+    def __fresh(theirs: List[Type[Fighter]], destroyed: int, ours: bool) -> State:
+        """ Returns the state where destroyed opponent units are gone and the next one is fresh."""
+        if destroyed == len(theirs):
+            return destroyed, 0, 0, ours
+        top = theirs[destroyed]()
+        return destroyed, top.life, top.experience, False
+
+    def __fight(self, battle: Battle, theirs: List[Type[Fighter]], state: State, U1: Fighter) -> State:
+        """
+        Returns the state left when U1 follows the units that left the battle in state, fighting until it or the
+        opponent's stack is gone.
+        :complexity: O(d) where d is the number of duels U1 fights
+        """
+        destroyed, life, experience, ours = state
+        if destroyed == len(theirs):
+            return destroyed, 0, 0, True
+        U2 = theirs[destroyed]()
+        U2.life = life
+        U2.experience = experience
+        while True:
+            battle.resolve_duel(U1, U2)
+            if U2.is_alive():
+                return destroyed, U2.life, U2.experience, False
+            destroyed += 1
+            if destroyed == len(theirs) or not U1.is_alive():
+                return self.__fresh(theirs, destroyed, U1.is_alive())
+            U2 = theirs[destroyed]()
@@ -0,0 +1,5 @@
+"""
+Benchmarks of the game. python -m benchmarks runs the suite over the seeded workloads of benchmarks.workloads and
+reports JSON, the other modules are focused benchmarks that can be run on their own from the repository root, for
+example python -m benchmarks.unit_memory
+"""
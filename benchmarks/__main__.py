@@ -0,0 +1,132 @@
+"""
+Runs the benchmark suite and prints its report as JSON, or writes it to a file:
+
+    python -m benchmarks [--seed N] [--battles N] [--output report.json]
+
+The report holds battles per second for every workload and formation, operations per second of ArrayStack and
+CircularQueue, bytes per army and the import time of battle, so that reports of different versions can be compared.
+"""
+__author__ = "Zaid"
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from army import Army
+from battle import Battle
+from benchmarks import import_time, workloads
+from queue_adt import CircularQueue
+from stack_adt import ArrayStack
+
+FORMATIONS = {"stack": 0, "queue": 1}
+ADT_OPERATIONS = 10000
+
+
+def battles_per_second(pairings: List[Tuple[workloads.Units, workloads.Units]], formation: int,
+                       budget: int) -> float:
+    """Returns how many of the pairings Battle resolves per second."""
+    battle = Battle(budget=budget)
+    start = time.perf_counter()
+    for army1, army2 in pairings:
+        battle.headless_combat(army1, army2, formation)
+    return len(pairings) / (time.perf_counter() - start)
+
+
+def adt_operations_per_second(repeat: int = 5) -> Dict[str, float]:
+    """Returns the push, pop, append and serve operations per second, best of repeat runs."""
+    stack = ArrayStack(ADT_OPERATIONS)
+    queue = CircularQueue(ADT_OPERATIONS)
+
+    def push() -> None:
+        stack.clear()
+        for i in range(ADT_OPERATIONS):
+            stack.push(i)
+
+    def pop() -> None:
+        stack.length = ADT_OPERATIONS
+        for _ in range(ADT_OPERATIONS):
+            stack.pop()
+
+    def append() -> None:
+        queue.clear()
+        for i in range(ADT_OPERATIONS):
+            queue.append(i)
+
+    def serve() -> None:
+        queue.length, queue.front, queue.rear = ADT_OPERATIONS, 0, 0
+        for _ in range(ADT_OPERATIONS):
+            queue.serve()
+
+    cases = {"ArrayStack.push": push, "ArrayStack.pop": pop,
+             "CircularQueue.append": append, "CircularQueue.serve": serve}
+    return {name: ADT_OPERATIONS / min(timeit.repeat(case, number=1, repeat=repeat)) for name, case in cases.items()}
+
+
+def bytes_per_army(name: str, formation: int, count: int, seed: int) -> float:
+    """Returns the average bytes held by an army of the named workload, units and force included."""
+    budget, _ = workloads.WORKLOADS[name]
+    armies = [army for pairing in workloads.pairings(name, count, seed) for army in pairing]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = []
+    for units in armies:
+        army = Army(budget)
+        army.set_army("", units, formation)
+        built.append(army)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(built)
+
+
+def git_revision() -> str:
+    """Returns the current git commit, or "unknown" outside of a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(seed: int, battles: int) -> dict:
+    """Runs the whole suite and returns its report."""
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "seed": seed,
+        "battles_per_second": {},
+        "adt_operations_per_second": adt_operations_per_second(),
+        "bytes_per_army": {},
+        "import_milliseconds": import_time.measure("battle")["milliseconds"],
+    }
+    for name in workloads.WORKLOADS:
+        report["bytes_per_army"][name] = {formation: bytes_per_army(name, number, 10, seed)
+                                          for formation, number in FORMATIONS.items()}
+        budget = workloads.WORKLOADS[name][0]
+        # a battle lasts about as many rounds as there are units, time fewer of the larger ones
+        count = max(1, battles * Army.BUDGET // max(budget, Army.BUDGET))
+        pairings = workloads.pairings(name, count, seed)
+        report["battles_per_second"][name] = {formation: battles_per_second(pairings, number, budget)
+                                              for formation, number in FORMATIONS.items()}
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite and reports the results as JSON.")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the workloads")
+    parser.add_argument("--battles", type=int, default=1000, help="battles timed per workload and formation")
+    parser.add_argument("--output", help="file to write the report to, standard output by default")
+    arguments = parser.parse_args()
+
+    result = run(arguments.seed, arguments.battles)
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(result, output, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
@@ -0,0 +1,66 @@
+"""
+Cost of growing and shrinking the resizable ArrayStack and CircularQueue, compared with a fixed-capacity
+container sized in advance and with collections.deque.
+"""
+__author__ = "Zaid"
+
+import timeit
+from collections import deque
+from typing import Dict
+
+from queue_adt import CircularQueue
+from stack_adt import ArrayStack
+
+
+def stack_push_pop(stack) -> None:
+    """Pushes then pops OPERATIONS elements."""
+    for i in range(OPERATIONS):
+        stack.push(i)
+    for _ in range(OPERATIONS):
+        stack.pop()
+
+
+def queue_append_serve(queue) -> None:
+    """Appends then serves OPERATIONS elements."""
+    for i in range(OPERATIONS):
+        queue.append(i)
+    for _ in range(OPERATIONS):
+        queue.serve()
+
+
+def deque_as_stack(container: deque) -> None:
+    """Same operations as stack_push_pop on a deque."""
+    for i in range(OPERATIONS):
+        container.append(i)
+    for _ in range(OPERATIONS):
+        container.pop()
+
+
+def deque_as_queue(container: deque) -> None:
+    """Same operations as queue_append_serve on a deque."""
+    for i in range(OPERATIONS):
+        container.append(i)
+    for _ in range(OPERATIONS):
+        container.popleft()
+
+
+OPERATIONS = 100000
+
+
+def run(repeat: int = 5) -> Dict[str, float]:
+    """Returns the best time per element, in nanoseconds, of a push and a pop (or an append and a serve)."""
+    cases = {
+        "ArrayStack fixed": lambda: stack_push_pop(ArrayStack(OPERATIONS)),
+        "ArrayStack resizable": lambda: stack_push_pop(ArrayStack(1, resizable=True)),
+        "deque as stack": lambda: deque_as_stack(deque()),
+        "CircularQueue fixed": lambda: queue_append_serve(CircularQueue(OPERATIONS)),
+        "CircularQueue resizable": lambda: queue_append_serve(CircularQueue(1, resizable=True)),
+        "deque as queue": lambda: deque_as_queue(deque()),
+    }
+    return {name: min(timeit.repeat(case, number=1, repeat=repeat)) / OPERATIONS * 1e9
+            for name, case in cases.items()}
+
+
+if __name__ == '__main__':
+    for name, nanoseconds in run().items():
+        print(f"{name}: {nanoseconds:.0f} ns per element")
@@ -0,0 +1,55 @@
+"""
+Per-operation cost of the ArrayR backends: construction, indexing and assignment on the array itself, and the
+push/pop and append/serve of the ADTs built on top of it.
+"""
+__author__ = "Zaid"
+
+import timeit
+from typing import Dict
+
+from queue_adt import CircularQueue
+from referential_array import ArrayR
+from stack_adt import ArrayStack
+
+LENGTH = 1000
+BACKENDS = (ArrayR.CTYPES, ArrayR.LIST, ArrayR.TYPED)
+
+
+def run(number: int = 200, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Returns, for every backend, the best time per operation in nanoseconds."""
+    report = {}
+    for backend in BACKENDS:
+        array = ArrayR(LENGTH, backend)
+        stack = ArrayStack(LENGTH, backend=backend)
+        queue = CircularQueue(LENGTH, backend=backend)
+
+        def setitem() -> None:
+            for i in range(LENGTH):
+                array[i] = i
+
+        def getitem() -> None:
+            for i in range(LENGTH):
+                array[i]
+
+        def push_pop() -> None:
+            for i in range(LENGTH):
+                stack.push(i)
+            for _ in range(LENGTH):
+                stack.pop()
+
+        def append_serve() -> None:
+            for i in range(LENGTH):
+                queue.append(i)
+            for _ in range(LENGTH):
+                queue.serve()
+
+        cases = {"construct": lambda: ArrayR(LENGTH, backend), "setitem": setitem, "getitem": getitem,
+                 "push+pop": push_pop, "append+serve": append_serve}
+        report[backend] = {name: min(timeit.repeat(case, number=number, repeat=repeat)) / (number * LENGTH) * 1e9
+                           for name, case in cases.items()}
+    return report
+
+
+if __name__ == '__main__':
+    for backend, timings in run().items():
+        print(backend + ": " + ", ".join(f"{name} {ns:.1f} ns" for name, ns in timings.items()))
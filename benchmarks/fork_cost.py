@@ -0,0 +1,84 @@
+"""
+Cost of forking a battle state to fight it on differently, for growing armies: copy.deepcopy of both armies, their
+forces and every unit, against a state of Battle.branch, whose persistent forces are forked by keeping a reference
+to it. Both forks are then changed the same way, the unit at the top or front of both forces taken and put back, so
+that the fork holds a state of its own. Both are also timed with the first round of the fork fought instead:
+
+    python -m benchmarks.fork_cost [--units 100 1000 10000] [--repeat 20]
+"""
+__author__ = "Zaid"
+
+import argparse
+import copy
+import timeit
+from typing import Dict, Sequence
+
+from army import Army
+from battle import Battle, BattleState
+from benchmarks.large_battle import mixed_army
+
+ROUNDS_BEFORE_FORK = 10
+
+
+def fork_armies(first: Army, second: Army, formation: int) -> None:
+    """Copies both armies, then takes the unit at the top or front of both copies and puts it back."""
+    for army in copy.deepcopy((first, second)):
+        if formation == 0:
+            army.force.push(army.force.pop())
+        else:
+            army.force.append(army.force.serve())
+
+
+def fork_state(state: BattleState) -> BattleState:
+    """Returns a state forked from state, the unit at the top or front of both forces taken and put back."""
+    forces = []
+    for force in (state.force1, state.force2):
+        if state.formation == 0:
+            unit, rest = force.pop()
+            forces.append(rest.push(unit))
+        else:
+            unit, rest = force.serve()
+            forces.append(rest.append(unit))
+    return BattleState(forces[0], forces[1], state.formation, state.rounds)
+
+
+def run(sizes: Sequence[int] = (100, 1000, 10000), repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """Returns the best seconds of every kind of fork, by formation and number of units per army."""
+    report = {}
+    for units in sizes:
+        army1 = mixed_army(units)
+        army2 = (0, 0, units)
+        budget = 3 * units
+        battle = Battle(budget=budget)
+        for name, formation in (("stack", 0), ("queue", 1)):
+            first = Army(budget)
+            second = Army(budget)
+            first.set_army("1", army1, formation)
+            second.set_army("2", army2, formation)
+            state = battle.play(battle.branch(army1, army2, formation), ROUNDS_BEFORE_FORK)
+
+            def deepcopy_round() -> None:
+                fork1, fork2 = copy.deepcopy((first, second))
+                if formation == 0:
+                    U1, U2 = fork1.force.pop(), fork2.force.pop()
+                else:
+                    U1, U2 = fork1.force.serve(), fork2.force.serve()
+                battle.combat(U1, U2)
+                battle.alive_units(U1, U2, formation, fork1, fork2)
+
+            cases = {"deepcopy": lambda: fork_armies(first, second, formation),
+                     "deepcopy_round": deepcopy_round,
+                     "persistent": lambda: fork_state(state),
+                     "persistent_round": lambda: battle.step(state)}
+            report[f"{name}_{units}"] = {case: min(timeit.repeat(function, number=1, repeat=repeat))
+                                         for case, function in cases.items()}
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times forking a battle with deepcopy and with persistent forces.")
+    parser.add_argument("--units", type=int, nargs="+", default=[100, 1000, 10000], help="units per army")
+    parser.add_argument("--repeat", type=int, default=20, help="runs, the best one is kept")
+    arguments = parser.parse_args()
+    for key, timings in run(arguments.units, arguments.repeat).items():
+        print(f"{key}: " + ", ".join(f"{case} {seconds * 1e6:.1f} us" for case, seconds in timings.items()))
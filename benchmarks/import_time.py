@@ -0,0 +1,64 @@
+"""
+Start-up cost of the battle modules. Imports a module in a fresh interpreter with python -X importtime, reports its
+cumulative import time, best of a few runs, and fails when it exceeds the budget or when a module kept off the
+runtime import path (the tests, typing, ctypes) is imported:
+
+    python -m benchmarks.import_time [--module battle] [--budget-ms 20] [--repeat 5]
+"""
+__author__ = "Zaid"
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = 20.0
+# modules that importing battle must not pull in
+FORBIDDEN = ("unittest", "typing", "ctypes")
+
+
+def import_times(module: str) -> List[Tuple[str, int]]:
+    """Imports module in a fresh interpreter and returns every module it imported with its cumulative import time
+    in microseconds, as printed by -X importtime."""
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(cumulative)))
+    return times
+
+
+def measure(module: str = "battle", repeat: int = 5) -> Dict[str, object]:
+    """Returns the best cumulative import time of module over repeat runs, in milliseconds, and the forbidden
+    modules it imported."""
+    best = None
+    imported = set()
+    for _ in range(repeat):
+        times = import_times(module)
+        imported.update(name for name, _ in times)
+        cumulative = dict(times)[module]
+        best = cumulative if best is None else min(best, cumulative)
+    return {"module": module, "milliseconds": best / 1000,
+            "forbidden": sorted(name for name in imported if name.split(".")[0] in FORBIDDEN)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Checks the import time of a module against a budget.")
+    parser.add_argument("--module", default="battle", help="module to import")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="largest accepted import time")
+    parser.add_argument("--repeat", type=int, default=5, help="runs, the best one is kept")
+    arguments = parser.parse_args()
+
+    report = measure(arguments.module, arguments.repeat)
+    report["budget_ms"] = arguments.budget_ms
+    print(json.dumps(report, indent=2))
+    if report["forbidden"]:
+        sys.exit(f"{arguments.module} imports {', '.join(report['forbidden'])}")
+    if report["milliseconds"] > arguments.budget_ms:
+        sys.exit(f"{arguments.module} takes {report['milliseconds']:.1f} ms to import, over {arguments.budget_ms} ms")
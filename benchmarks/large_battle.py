@@ -0,0 +1,50 @@
+"""
+Battles between armies of a million units per side, the size the configurable budget allows for stress tests.
+Times building both armies and fighting the battle, in both formations.
+"""
+__author__ = "Zaid"
+
+import argparse
+import time
+from typing import Dict
+
+from army import Army
+from battle import Battle
+
+UNITS = 10 ** 6
+
+
+def mixed_army(units: int) -> tuple:
+    """Returns (soldiers, archers, cavalry) of units units, half soldiers and a quarter each of archers and cavalry."""
+    return units - 2 * (units // 4), units // 4, units // 4
+
+
+def run(units: int = UNITS, runs: bool = False) -> Dict[str, Dict[str, float]]:
+    """Returns the seconds spent building both armies, and building them then fighting, for both formations.
+    runs stores the armies as runs of identical units, see rle_adt.py."""
+    army1 = mixed_army(units)
+    army2 = (0, 0, units)
+    # enough for army2, the most expensive of the two
+    budget = 3 * units
+    report = {}
+    for name, formation in (("stack", 0), ("queue", 1)):
+        start = time.perf_counter()
+        first = Army(budget, runs=runs)
+        second = Army(budget, runs=runs)
+        first.set_army("1", army1, formation)
+        second.set_army("2", army2, formation)
+        built = time.perf_counter()
+        outcome = Battle(budget=budget, runs=runs).headless_combat(army1, army2, formation)
+        fought = time.perf_counter()
+        report[name] = {"build_seconds": built - start, "battle_seconds": fought - built, "result": outcome}
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times battles between very large armies.")
+    parser.add_argument("--units", type=int, default=UNITS, help="units per side")
+    parser.add_argument("--runs", action="store_true", help="store the armies as runs of identical units")
+    arguments = parser.parse_args()
+    for formation, timings in run(arguments.units, arguments.runs).items():
+        print(f"{formation}: build {timings['build_seconds']:.2f} s, "
+              f"battle (build included) {timings['battle_seconds']:.2f} s, result {timings['result']}")
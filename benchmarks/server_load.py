@@ -0,0 +1,83 @@
+"""
+Load test of battle_server. Starts a server on a local Unix socket, or uses a running one, then opens many client
+connections that each send their matches one after the other, and reports matches per second and latency
+percentiles.
+
+    python -m benchmarks.server_load [--clients 32] [--matches 100] [--workers N] [--unix PATH | --port PORT]
+"""
+__author__ = "Zaid"
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from battle_server import BattleServer
+from benchmarks import workloads
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the value below which the given fraction of values lie, nearest rank."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+async def client(connect, number: int, matches: int, seed: int, latencies: List[float]) -> None:
+    """Plays matches one at a time over a single connection, appending the latency of every one to latencies."""
+    reader, writer = await connect()
+    pairings = workloads.pairings("maxed", matches, seed * 1000 + number)
+    for i, (army1, army2) in enumerate(pairings):
+        start = time.perf_counter()
+        writer.write(json.dumps({"id": i, "army1": army1, "army2": army2, "formation": i % 2}).encode() + b"\n")
+        await writer.drain()
+        answer = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if "result" not in answer:
+            raise RuntimeError(f"Server refused a match: {answer}")
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load(clients: int, matches: int, workers: int, seed: int, unix: str, port: int) -> Dict[str, float]:
+    """Runs the load test and returns its report."""
+    server = None
+    directory = None
+    if unix is None and port is None:
+        directory = tempfile.TemporaryDirectory()
+        unix = os.path.join(directory.name, "battle.sock")
+        server = BattleServer(ProcessPoolExecutor(workers))
+        await server.start(path=unix)
+
+    def connect():
+        if unix is not None:
+            return asyncio.open_unix_connection(unix)
+        return asyncio.open_connection("127.0.0.1", port)
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(connect, number, matches, seed, latencies) for number in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+        directory.cleanup()
+    return {"matches": len(latencies), "seconds": elapsed, "matches_per_second": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measures matches per second and latency of battle_server.")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--matches", type=int, default=100, help="matches sent by every connection")
+    parser.add_argument("--workers", type=int, help="worker processes of the local server, one per CPU by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unix", help="Unix socket of a running server")
+    parser.add_argument("--port", type=int, help="TCP port of a running server on 127.0.0.1")
+    arguments = parser.parse_args()
+    report = asyncio.run(load(arguments.clients, arguments.matches, arguments.workers, arguments.seed,
+                              arguments.unix, arguments.port))
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,46 @@
+"""
+Exhaustive stack-formation sweep: every legal army of a budget against a few opponents, fought one army at a time
+with Battle.headless_combat, then through a BattleTrie built once. Checks that both give the same results:
+
+    python -m benchmarks.stack_sweep [--budget 60] [--opponents 3] [--seed 0]
+"""
+__author__ = "Zaid"
+
+import argparse
+import random
+import time
+from typing import Dict
+
+from army import Army
+from battle import Battle
+from battle_trie import BattleTrie
+
+
+def run(budget: int = 60, opponents: int = 3, seed: int = 0) -> Dict[str, float]:
+    """Returns the seconds spent by both sweeps, building the trie included, and the size of the trie."""
+    armies = Army(budget).legal_armies()
+    chosen = random.Random(seed).sample(armies, opponents)
+    battle = Battle(budget=budget)
+
+    start = time.perf_counter()
+    one_by_one = [[battle.headless_combat(army, opponent, 0) for army in armies] for opponent in chosen]
+    middle = time.perf_counter()
+    trie = BattleTrie(armies, budget)
+    built = time.perf_counter()
+    swept = [trie.sweep(opponent, battle) for opponent in chosen]
+    end = time.perf_counter()
+    if swept != one_by_one:
+        raise AssertionError("the trie sweep disagrees with headless_combat")
+    return {"armies": len(armies), "nodes": trie.nodes, "one_by_one_seconds": middle - start,
+            "build_seconds": built - middle, "sweep_seconds": end - built}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times an exhaustive stack-formation sweep with and without a trie.")
+    parser.add_argument("--budget", type=int, default=60, help="budget of the armies")
+    parser.add_argument("--opponents", type=int, default=3, help="opponents every army is fought against")
+    parser.add_argument("--seed", type=int, default=0, help="seed choosing the opponents")
+    arguments = parser.parse_args()
+    report = run(arguments.budget, arguments.opponents, arguments.seed)
+    print(f"{report['armies']} armies, {report['nodes']} trie nodes: one by one {report['one_by_one_seconds']:.2f} s, "
+          f"trie {report['build_seconds']:.2f} s to build and {report['sweep_seconds']:.3f} s to sweep")
@@ -0,0 +1,48 @@
+"""
+Memory taken by one unit. Compares the slotted Soldier, Archer and Cavalry with the same classes carrying a
+per-instance __dict__, as they were before Fighter defined __slots__.
+"""
+__author__ = "Zaid"
+
+import sys
+import tracemalloc
+from typing import Callable, Dict
+
+from army import Archer, Cavalry, Fighter, Soldier
+
+
+class DictSoldier(Soldier):
+    """Soldier with a __dict__, the layout of a unit before slots."""
+
+
+class DictArcher(Archer):
+    """Archer with a __dict__, the layout of a unit before slots."""
+
+
+class DictCavalry(Cavalry):
+    """Cavalry with a __dict__, the layout of a unit before slots."""
+
+
+def bytes_per_unit(make_unit: Callable[[], Fighter], count: int = 100000) -> float:
+    """Returns the bytes allocated per unit when count units are alive at once, as measured by tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    units = [make_unit() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the units is not part of their footprint
+    return (after - before - sys.getsizeof(units)) / len(units)
+
+
+def run(count: int = 100000) -> Dict[str, Dict[str, float]]:
+    """Returns the bytes per unit of every unit type, with a __dict__ ("before") and with slots ("after")."""
+    report = {}
+    for slotted, with_dict in [(Soldier, DictSoldier), (Archer, DictArcher), (Cavalry, DictCavalry)]:
+        report[slotted.__name__] = {"before": bytes_per_unit(with_dict, count),
+                                    "after": bytes_per_unit(slotted, count)}
+    return report
+
+
+if __name__ == '__main__':
+    for unit_type, footprint in run().items():
+        print(f"{unit_type}: {footprint['before']:.1f} bytes with __dict__, {footprint['after']:.1f} bytes slotted")
@@ -0,0 +1,37 @@
+"""
+Reproducible workloads for the benchmarks. Every workload is a list of army pairings generated from a seed, so two
+runs with the same seed time exactly the same battles.
+"""
+__author__ = "Zaid"
+
+import random
+from typing import Dict, List, Tuple
+
+from army import Archer, Cavalry, Soldier
+
+Units = Tuple[int, int, int]
+
+# name: (budget, whether every army spends the whole budget)
+WORKLOADS: Dict[str, Tuple[int, bool]] = {
+    "tiny": (6, False),
+    "maxed": (30, True),
+    "scaled": (3000, True),
+}
+
+
+def random_army(rng: random.Random, budget: int, maxed: bool) -> Units:
+    """Returns a random (soldiers, archers, cavalry) costing at most budget, or exactly budget when maxed."""
+    if not maxed:
+        budget = rng.randint(0, budget)
+    cavalry = rng.randint(0, budget // Cavalry.COST)
+    budget -= cavalry * Cavalry.COST
+    archers = rng.randint(0, budget // Archer.COST)
+    budget -= archers * Archer.COST
+    return budget // Soldier.COST, archers, cavalry
+
+
+def pairings(name: str, count: int, seed: int = 0) -> List[Tuple[Units, Units]]:
+    """Returns count pairings of the named workload, always the same ones for the same seed."""
+    budget, maxed = WORKLOADS[name]
+    rng = random.Random(f"{name}-{seed}")
+    return [(random_army(rng, budget, maxed), random_army(rng, budget, maxed)) for _ in range(count)]
@@ -0,0 +1,127 @@
+"""
+Snapshots of a battle in progress. A checkpoint holds both forces exactly as they are in memory, the contents of the
+stack or queue, the capacity and the front of a queue, and the life and experience of every unit, so that the battle
+can be resumed with Battle.resume and go on as if it had never stopped.
+
+File layout (little endian):
+    magic b"CKPT", version (uint16), formation (uint8), rounds fought (uint64)
+    then for each army: name length (uint16) and name (utf-8), budget, capacity, front and number of units
+    (uint64 each), the type code of every unit (uint8 each, index in the roster), their life and their experience
+    (int64 each). Units are listed from the bottom of a stack, or from the front of a queue.
+"""
+__author__ = "Zaid"
+
+import os
+import struct
+from array import array
+from typing import BinaryIO, NamedTuple, Sequence, Type
+
+from army import Army, Fighter
+from queue_adt import CircularQueue
+from stack_adt import ArrayStack
+
+MAGIC = b"CKPT"
+VERSION = 1
+HEADER = struct.Struct("<4sHBQ")
+NAME = struct.Struct("<H")
+FORCE = struct.Struct("<QQQQ")
+
+
+class Checkpoint(NamedTuple):
+    """ State of a battle read from a checkpoint."""
+    army1: Army
+    army2: Army
+    formation: int
+    rounds: int
+
+
+def _write_army(file: BinaryIO, army: Army, formation: int, codes: dict) -> None:
+    """ Writes the force of army, units from the bottom of a stack or the front of a queue.
+    :complexity: O(n) where n is the number of units
+    """
+    units = list(army)
+    if formation == 0:
+        units.reverse()
+        front = 0
+    else:
+        front = army.force.front
+    name = str(army.name).encode()
+    file.write(NAME.pack(len(name)))
+    file.write(name)
+    file.write(FORCE.pack(army.budget, len(army.force.array), front, len(units)))
+    file.write(bytes(codes[type(unit)] for unit in units))
+    file.write(array("q", [unit.get_life() for unit in units]).tobytes())
+    file.write(array("q", [unit.get_experience() for unit in units]).tobytes())
+
+
+def _read_army(data: memoryview, offset: int, formation: int, roster: Sequence[Type[Fighter]]) -> tuple:
+    """ Rebuilds an army written by _write_army at offset.
+    :return: the army and the offset following it
+    :complexity: O(n) where n is the number of units
+    """
+    (length,) = NAME.unpack_from(data, offset)
+    offset += NAME.size
+    name = bytes(data[offset:offset + length]).decode()
+    offset += length
+    budget, capacity, front, count = FORCE.unpack_from(data, offset)
+    offset += FORCE.size
+    codes = data[offset:offset + count]
+    offset += count
+    lives = array("q")
+    lives.frombytes(data[offset:offset + 8 * count])
+    offset += 8 * count
+    experiences = array("q")
+    experiences.frombytes(data[offset:offset + 8 * count])
+    offset += 8 * count
+
+    units = []
+    for code, life, experience in zip(codes, lives, experiences):
+        unit = roster[code]()
+        unit.life, unit.experience = life, experience
+        units.append(unit)
+
+    army = Army(budget, roster)
+    army.name = name
+    army.formation = formation
+    if formation == 0:
+        army.force = ArrayStack(capacity)
+        army.force.push_many(units)
+    else:
+        army.force = CircularQueue(capacity)
+        army.force.front = army.force.rear = front
+        army.force.extend(units)
+    return army, offset
+
+
+def write_checkpoint(path: str, army1: Army, army2: Army, formation: int, rounds: int,
+                     roster: Sequence[Type[Fighter]] = Army.ROSTER) -> None:
+    """
+    Writes the state of a battle to path. The file is written next to path first and then renamed, so a crash while
+    writing leaves the previous checkpoint intact.
+    :param rounds: rounds fought so far
+    :param roster: unit types of the armies, a unit is stored as the index of its type
+    :complexity: O(n) where n is the number of units in both armies
+    """
+    codes = {unit_type: code for code, unit_type in enumerate(roster)}
+    partial = path + ".partial"
+    with open(partial, "wb") as checkpoint_file:
+        checkpoint_file.write(HEADER.pack(MAGIC, VERSION, formation, rounds))
+        _write_army(checkpoint_file, army1, formation, codes)
+        _write_army(checkpoint_file, army2, formation, codes)
+    os.replace(partial, path)
+
+
+def read_checkpoint(path: str, roster: Sequence[Type[Fighter]] = Army.ROSTER) -> Checkpoint:
+    """
+    Reads a checkpoint written by write_checkpoint with the same roster.
+    :raises ValueError: if the file is not a checkpoint
+    :complexity: O(n) where n is the number of units in both armies
+    """
+    with open(path, "rb") as checkpoint_file:
+        data = memoryview(checkpoint_file.read())
+    magic, version, formation, rounds = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a checkpoint: " + path)
+    army1, offset = _read_army(data, HEADER.size, formation, roster)
+    army2, offset = _read_army(data, offset, formation, roster)
+    return Checkpoint(army1, army2, formation, rounds)
@@ -0,0 +1,137 @@
+"""
+Event stream of combat. A CombatRecorder given to Battle writes one fixed-width binary record per round fought, and a
+CombatLog memory-maps such a file so that the rounds can be scanned or indexed later without parsing it up front.
+
+Every record is RECORD_SIZE bytes, little endian:
+    battle (uint32), round (uint32), type of both units (uint8 each, index in the roster), 2 padding bytes,
+    speed of both units, attack damage of both units, then life and experience of both units after the round
+    (int32 each)
+Speed and attack damage are the ones the units had when the round started.
+"""
+__author__ = "Zaid"
+
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterator, NamedTuple, Sequence, Type
+
+from army import Army, Fighter
+
+RECORD = struct.Struct("<IIBBxxiiiiiiii")
+RECORD_SIZE = RECORD.size
+
+
+class Event(NamedTuple):
+    """ One round of a battle, as stored in a record."""
+    battle: int
+    round: int
+    type1: int
+    type2: int
+    speed1: int
+    speed2: int
+    damage1: int
+    damage2: int
+    life1: int
+    experience1: int
+    life2: int
+    experience2: int
+
+
+class CombatRecorder:
+    """ Writes the rounds fought by a Battle to a binary file. Records are gathered in a buffer and written
+    BUFFER_RECORDS at a time.
+
+    Attributes:
+         file (BinaryIO): file the records are written to
+         codes (dict): type code of every unit type of the roster
+         battle (int): number of the current battle, counting from 1
+         round (int): number of rounds of the current battle recorded so far
+    """
+    BUFFER_RECORDS = 4096
+
+    def __init__(self, file: BinaryIO, roster: Sequence[Type[Fighter]] = Army.ROSTER) -> None:
+        """
+        :param file: binary file open for writing
+        :param roster: unit types that can appear, a type is recorded as its index in roster
+        """
+        self.file = file
+        self.codes = {unit_type: code for code, unit_type in enumerate(roster)}
+        self.battle = 0
+        self.round = 0
+        self.buffer = bytearray()
+        self.opening = (0, 0, 0, 0)
+
+    def start_battle(self) -> None:
+        """ Called by Battle before the first round of a battle.
+        :complexity: O(1)
+        """
+        self.battle += 1
+        self.round = 0
+
+    def open_round(self, U1: Fighter, U2: Fighter) -> None:
+        """ Called by Battle.combat before the units attack, keeps what they start the round with.
+        :complexity: O(1)
+        """
+        self.opening = (U1.get_speed(), U2.get_speed(), U1.get_attack_damage(), U2.get_attack_damage())
+
+    def close_round(self, U1: Fighter, U2: Fighter) -> None:
+        """ Called by Battle.alive_units at the end of the round, writes its record.
+        :complexity: O(1), amortised over the buffered records
+        """
+        self.round += 1
+        self.buffer += RECORD.pack(self.battle, self.round, self.codes[type(U1)], self.codes[type(U2)],
+                                   *self.opening, U1.get_life(), U1.get_experience(),
+                                   U2.get_life(), U2.get_experience())
+        if len(self.buffer) >= self.BUFFER_RECORDS * RECORD_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """ Writes the buffered records to the file.
+        :complexity: O(b) where b is the number of buffered records
+        """
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.file.flush()
+
+
+class CombatLog:
+    """ Read-only, memory-mapped view of a file written by a CombatRecorder. """
+
+    def __init__(self, path: str) -> None:
+        """ Maps the log in memory.
+        :raises ValueError: if the size of the file is not a whole number of records
+        :complexity: O(1)
+        """
+        self.length = os.path.getsize(path) // RECORD_SIZE
+        if os.path.getsize(path) % RECORD_SIZE:
+            raise ValueError("Not a combat log: " + path)
+        self.data = None
+        if self.length:
+            with open(path, "rb") as log_file:
+                self.data = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        """ Returns the number of recorded rounds."""
+        return self.length
+
+    def __getitem__(self, index: int) -> Event:
+        """ Returns the event at index.
+        :raises IndexError: if there is no such event
+        :complexity: O(1)
+        """
+        if not 0 <= index < self.length:
+            raise IndexError("Event index out of range")
+        return Event(*RECORD.unpack_from(self.data, index * RECORD_SIZE))
+
+    def __iter__(self) -> Iterator[Event]:
+        """ Yields every event in order.
+        :complexity: O(n) where n is the number of events
+        """
+        if self.data is not None:
+            for values in RECORD.iter_unpack(self.data):
+                yield Event(*values)
+
+    def close(self) -> None:
+        """ Unmaps the log."""
+        if self.data is not None:
+            self.data.close()
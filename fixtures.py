@@ -0,0 +1,29 @@
+"""
+Unit types shared by the unit tests, which the game itself does not have.
+"""
+__author__ = "Zaid"
+
+from army import Fighter
+
+
+class Ogre(Fighter):
+    """Unit type losing 3 life whenever it defends, so the toughness bound of Battle.__life_left does not hold for
+    rosters holding it."""
+    __slots__ = ()
+    COST = 3
+    PLURAL = "ogres"
+
+    def __init__(self) -> None:
+        super().__init__(6, 0)
+
+    def get_speed(self) -> int:
+        return 2
+
+    def get_attack_damage(self) -> int:
+        return 1 + self.get_experience()
+
+    def defend(self, damage: int) -> None:
+        self.lose_life(3)
+
+    def __str__(self) -> str:
+        return f"Ogre's life = {self.get_life()} and experience = {self.get_experience()}"
@@ -0,0 +1,123 @@
+"""
+Precomputed matchup table. Every legal army is resolved against every other legal army in both formations once, and
+the results are stored in a file that Battle can consult in O(1) instead of simulating.
+
+File layout (little endian):
+    magic b"MTCH", version (uint16), number of armies N (uint32)
+    N times (soldiers, archers, cavalry) as uint16
+    2*N*N results of 2 bits each, four per byte, result of armies[i] against armies[j] in formation f at position
+    (f*N + i)*N + j
+"""
+__author__ = "Zaid"
+
+import mmap
+import struct
+import sys
+from typing import Optional, Sequence, Tuple
+
+from army import Army
+
+Units = Tuple[int, int, int]
+
+MAGIC = b"MTCH"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+ARMY = struct.Struct("<3H")
+
+
+def build_table(path: str, armies: Optional[Sequence[Units]] = None, chunk: int = 50000) -> None:
+    """
+    Resolves every pairing of armies in both formations and writes the table to path.
+    Only half of the pairings are simulated: combat treats both units alike, so army2 against army1 is army1 against
+    army2 with the winner swapped, and an army against itself is always a draw.
+    :param path: file to write the table to
+    :param armies: armies to include, every legal army by default
+    :param chunk: number of battles handed to the vectorised kernel at a time
+    :complexity: O(N^2*r) where N is the number of armies and r the number of rounds of a battle
+    """
+    import numpy as np
+    from vectorised_battle import vectorised_combat
+
+    if armies is None:
+        armies = Army().legal_armies()
+    army_array = np.asarray(armies, dtype=np.int64).reshape(-1, 3)
+    count = len(army_array)
+    first, second = np.triu_indices(count, 1)
+    swapped = np.array([0, 2, 1], dtype=np.uint8)
+
+    results = np.zeros((2, count, count), dtype=np.uint8)
+    for formation in (0, 1):
+        for start in range(0, len(first), chunk):
+            i = first[start:start + chunk]
+            j = second[start:start + chunk]
+            outcome = vectorised_combat(army_array[i], army_array[j], formation).astype(np.uint8)
+            results[formation, i, j] = outcome
+            results[formation, j, i] = swapped[outcome]
+
+    flat = results.reshape(-1)
+    flat = np.concatenate([flat, np.zeros(-len(flat) % 4, dtype=np.uint8)])
+    packed = flat[0::4] | (flat[1::4] << 2) | (flat[2::4] << 4) | (flat[3::4] << 6)
+
+    with open(path, "wb") as table_file:
+        table_file.write(HEADER.pack(MAGIC, VERSION, count))
+        for army in armies:
+            table_file.write(ARMY.pack(*army))
+        table_file.write(packed.tobytes())
+
+
+class MatchupTable:
+    """ Read-only view of a table written by build_table. The file is memory-mapped so that only the pages holding
+    the looked-up results are ever read.
+
+    Attributes:
+         armies (List[Units]): armies covered by the table, in file order
+         index (dict): position of every army in armies
+    """
+
+    def __init__(self, path: str) -> None:
+        """ Maps the table file in memory and reads its header.
+        :raises ValueError: if the file is not a matchup table
+        :complexity: O(N) where N is the number of armies in the table
+        """
+        with open(path, "rb") as table_file:
+            self.data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a matchup table: " + path)
+        self.armies = [ARMY.unpack_from(self.data, HEADER.size + ARMY.size * i) for i in range(count)]
+        self.index = {army: i for i, army in enumerate(self.armies)}
+        self.body = HEADER.size + ARMY.size * count
+
+    def __len__(self) -> int:
+        """ Returns the number of armies in the table."""
+        return len(self.armies)
+
+    def __contains__(self, army: Units) -> bool:
+        """ True if the table has the results of the given army."""
+        return tuple(army) in self.index
+
+    def lookup(self, army1: Units, army2: Units, formation: int) -> int:
+        """ Returns the result (0, 1 or 2) of army1 against army2 in the given formation.
+        :raises ValueError: if either army is not in the table, or formation is neither 0 nor 1
+        :complexity: O(1), two dictionary lookups and a byte read
+        """
+        if formation not in (0, 1):
+            raise ValueError("Formation must be 0 (Stack) or 1 (Queue)")
+        try:
+            i = self.index[tuple(army1)]
+            j = self.index[tuple(army2)]
+        except KeyError:
+            raise ValueError("Invalid number of units") from None
+        position = (formation * len(self.armies) + i) * len(self.armies) + j
+        return (self.data[self.body + (position >> 2)] >> ((position & 3) * 2)) & 3
+
+    def close(self) -> None:
+        """ Unmaps the table file."""
+        self.data.close()
+
+
+if __name__ == '__main__':
+    # python matchups.py <path> precomputes the full table
+    if len(sys.argv) != 2:
+        sys.exit("usage: python matchups.py <path>")
+    build_table(sys.argv[1])
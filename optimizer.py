@@ -0,0 +1,263 @@
+"""
+Best response to a known opponent: the cheapest legal army that beats it in a formation. The armies are searched by
+branch and bound over the number of units of every type, in roster order, which is also the order the units of an
+army fight in: a prefix of the army fights exactly as it would in any army extending it, so a battle is re-simulated
+a unit at a time as the search goes deeper and the state it leaves is shared by every army below it.
+
+    python optimizer.py soldiers archers cavalry formation [--budget 30]
+
+States are tuples of (type, life, experience) units, ours then theirs. In the stack formation our units fight to the
+death one after the other, so after a prefix only the opponent's stack is left, or our survivors once it is empty.
+In the queue formation every unit of ours fights its first round as it reaches the front, before any survivor comes
+back, so after a prefix the state holds our survivors and the opponent's queue, and the battle is fought to its end
+from there at the leaves. Branches are cut when:
+
+- they cost at least the best army found so far, or more than the budget,
+- the life they can still buy cannot reach the toughness of the opponent, see Battle.__life_left: an army with less
+  life than the opponent's toughness loses. Like the oracle of Battle, this bound only holds when no unit of the
+  roster loses more than 1 life defending, see unit_rules.loses_one_at_most, and is not used otherwise,
+- the same state was reached at the same depth for no more points, since whatever follows only depends on the state.
+"""
+__author__ = "Zaid"
+
+import argparse
+from typing import Dict, Optional, Sequence, Tuple, Type
+
+from army import Army, Fighter
+from battle import Battle
+from queue_adt import CircularQueue
+from unit_rules import loses_one_at_most
+
+Units = Tuple[int, ...]
+UnitState = Tuple[Type[Fighter], int, int]
+State = Tuple[Tuple[UnitState, ...], Tuple[UnitState, ...]]
+Survivors = Tuple[Optional[UnitState], Optional[UnitState]]
+
+WIN = 1
+
+
+def _unit(state: UnitState) -> Fighter:
+    """ Returns a new unit in state."""
+    unit_type, life, experience = state
+    unit = unit_type()
+    unit.life = life
+    unit.experience = experience
+    return unit
+
+
+def _state(unit: Fighter) -> UnitState:
+    """ Returns the state of unit."""
+    return type(unit), unit.life, unit.experience
+
+
+class Optimizer:
+    """ Searches the cheapest army that beats an opponent.
+
+    Attributes:
+         opponent (Units): units of every type of the roster of the opponent, who fights as player 2
+         formation (int): 0 for Stack, 1 for Queue
+         army (Optional[Units]): cheapest winning army once solved, the one with the fewest units of the first type
+                                 of the roster, then of the second and so on among those of the same cost. None when
+                                 no army of the budget wins.
+         cost (int): cost of army, budget + 1 when there is none
+         nodes (int): armies and prefixes of armies explored by the search
+    """
+
+    def __init__(self, opponent: Sequence[int], formation: int, budget: int = Army.BUDGET,
+                 roster: Sequence[Type[Fighter]] = Army.ROSTER) -> None:
+        """
+        :raises ValueError: if the opponent is not a legal army of the budget and roster
+        :complexity: O(r) where r is the number of unit types
+        """
+        if not Army(budget, roster).is_legal(opponent):
+            raise ValueError("The opponent must be a legal army of the budget and roster")
+        self.opponent = tuple(opponent)
+        self.formation = formation
+        self.budget = budget
+        self.roster = tuple(roster)
+        self.battle = Battle()
+        self.lives = [unit_type().life for unit_type in self.roster]
+        # no toughness to reach, so no branch is cut, when the bound does not hold for the roster
+        self.toughness = sum(count * life // 2 for count, life in zip(self.opponent, self.lives)) \
+            if loses_one_at_most(self.roster) else 0
+        self.army: Optional[Units] = None
+        self.cost = budget + 1
+        self.nodes = 0
+        self.__extended: Dict[Tuple[State, Type[Fighter]], State] = {}
+        self.__finished: Dict[State, int] = {}
+        self.__seen: Dict[Tuple[int, State], int] = {}
+        self.__rounds: Dict[Tuple[UnitState, UnitState], Survivors] = {}
+
+    def solve(self) -> Optional[Units]:
+        """
+        Searches the cheapest winning army, see the attributes.
+        :complexity: O(L*n) at worst where L is the number of legal armies and n the number of units of the
+                     opponent, every army being extended a unit at a time, far fewer once the bounds cut branches
+        """
+        theirs = tuple(_state(unit_type()) for unit_type, count in zip(self.roster, self.opponent)
+                       for _ in range(count))
+        self.__search(0, (), ((), theirs), 0, 0)
+        return self.army
+
+    def __search(self, depth: int, counts: Units, state: State, cost: int, life: int) -> None:
+        """
+        Explores every army starting with counts, whose units leave the battle in state.
+        :param depth: number of unit types chosen in counts
+        :param cost: cost of counts
+        :param life: life of the units of counts
+        """
+        self.nodes += 1
+        if depth == len(self.roster):
+            if self.__finish(state) == WIN and cost < self.cost:
+                self.army = counts
+                self.cost = cost
+            return
+        key = (depth, state)
+        if self.__seen.get(key, self.budget + 1) <= cost:
+            return
+        self.__seen[key] = cost
+
+        unit_type = self.roster[depth]
+        count = 0
+        while cost <= self.budget and cost < self.cost:
+            if cost + self.__cost_to_survive(depth + 1, life) < self.cost:
+                self.__search(depth + 1, counts + (count,), state, cost, life)
+            count += 1
+            cost += unit_type.COST
+            life += self.lives[depth]
+            state = self.__extend(state, unit_type)
+
+    def __cost_to_survive(self, depth: int, life: int) -> float:
+        """
+        Returns a lower bound on the points the unit types from depth on cost to bring the life of the army up to the
+        toughness of the opponent, a relaxation that buys fractions of units.
+        :complexity: O(r) where r is the number of unit types
+        """
+        needed = self.toughness - life
+        if needed <= 0:
+            return 0
+        if depth == len(self.roster):
+            return float("inf")
+        return min(-(-needed * unit_type.COST // unit_life)
+                   for unit_type, unit_life in zip(self.roster[depth:], self.lives[depth:]))
+
+    def __extend(self, state: State, unit_type: Type[Fighter]) -> State:
+        """
+        Returns the state the battle is left in when a fresh unit of unit_type follows the units that left it in
+        state, fighting until it dies in the stack formation, or its first round in the queue formation.
+        :complexity: O(1) when met before, otherwise O(n) where n is the number of units in state
+        """
+        key = (state, unit_type)
+        extended = self.__extended.get(key)
+        if extended is None:
+            ours, theirs = state
+            if not theirs:
+                extended = ours + (_state(unit_type()),), theirs
+            elif self.formation == 0:
+                extended = self.__fight_stack(unit_type(), theirs)
+            else:
+                extended = self.__fight_round(ours, _state(unit_type()), theirs)
+            self.__extended[key] = extended
+        return extended
+
+    def __fight_stack(self, U1: Fighter, theirs: Tuple[UnitState, ...]) -> State:
+        """
+        Returns the state left when U1 fights the opponent's stack, theirs from the top, until one of them is gone.
+        :complexity: O(n) where n is the number of units in theirs
+        """
+        for index, top in enumerate(theirs):
+            U2 = _unit(top)
+            self.battle.resolve_duel(U1, U2)
+            if U2.is_alive():
+                return (), (_state(U2),) + theirs[index + 1:]
+            if not U1.is_alive():
+                return (), theirs[index + 1:]
+        return (_state(U1),), ()
+
+    def __round(self, first: UnitState, second: UnitState) -> Survivors:
+        """
+        Returns the survivors of a queue round between units in states first and second, None for a unit that died.
+        :complexity: O(1)
+        """
+        survivors = self.__rounds.get((first, second))
+        if survivors is None:
+            U1 = _unit(first)
+            U2 = _unit(second)
+            self.battle.combat(U1, U2)
+            army1 = Army()
+            army2 = Army()
+            army1.force = CircularQueue(1)
+            army2.force = CircularQueue(1)
+            self.battle.alive_units(U1, U2, 1, army1, army2)
+            survivors = self.__rounds[(first, second)] = (_state(U1) if U1.is_alive() else None,
+                                                          _state(U2) if U2.is_alive() else None)
+        return survivors
+
+    def __fight_round(self, ours: Tuple[UnitState, ...], first: UnitState, theirs: Tuple[UnitState, ...]) -> State:
+        """
+        Returns the state left when a unit in state first fights a round against the front of the opponent's queue,
+        theirs from the front, both survivors going to the rear.
+        :complexity: O(n) where n is the number of units in ours and theirs
+        """
+        survivor1, survivor2 = self.__round(first, theirs[0])
+        if survivor1 is not None:
+            ours = ours + (survivor1,)
+        theirs = theirs[1:]
+        if survivor2 is not None:
+            theirs = theirs + (survivor2,)
+        return ours, theirs
+
+    def __finish(self, state: State) -> int:
+        """
+        Returns the result of the battle left in state once every unit of ours has fought, 0, 1 or 2 as
+        Battle.result. In the queue formation the rest of the battle is fought round by round, both queues being
+        lists read from a front index.
+        :complexity: O(1) when met before, otherwise O(1) in the stack formation and the length of the rest of the
+                     battle in the queue formation
+        """
+        outcome = self.__finished.get(state)
+        if outcome is None:
+            ours, theirs = state
+            if self.formation == 1 and ours and theirs:
+                ours = list(ours)
+                theirs = list(theirs)
+                front1 = 0
+                front2 = 0
+                while front1 < len(ours) and front2 < len(theirs):
+                    survivor1, survivor2 = self.__round(ours[front1], theirs[front2])
+                    front1 += 1
+                    front2 += 1
+                    if survivor1 is not None:
+                        ours.append(survivor1)
+                    if survivor2 is not None:
+                        theirs.append(survivor2)
+                ours = ours[front1:]
+                theirs = theirs[front2:]
+            outcome = self.__finished[state] = 0 if not ours and not theirs else 1 if not theirs else 2
+        return outcome
+
+
+def best_response(opponent: Sequence[int], formation: int, budget: int = Army.BUDGET,
+                  roster: Sequence[Type[Fighter]] = Army.ROSTER) -> Tuple[Optional[Units], int]:
+    """
+    Returns the cheapest legal army beating opponent in formation, None if there is none, and the number of nodes
+    the search explored. See Optimizer.
+    :raises ValueError: if the opponent is not a legal army of the budget and roster
+    """
+    optimizer = Optimizer(opponent, formation, budget, roster)
+    return optimizer.solve(), optimizer.nodes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Finds the cheapest army that beats an opponent.")
+    parser.add_argument("opponent", type=int, nargs=3, help="soldiers archers cavalry of the opponent")
+    parser.add_argument("formation", type=int, choices=(0, 1), help="0 for Stack, 1 for Queue")
+    parser.add_argument("--budget", type=int, default=Army.BUDGET, help="budget of both armies")
+    arguments = parser.parse_args()
+    solver = Optimizer(arguments.opponent, arguments.formation, arguments.budget)
+    army = solver.solve()
+    if army is None:
+        print(f"no army of {arguments.budget} points wins, {solver.nodes} nodes explored")
+    else:
+        print(f"{army} costs {solver.cost} points, {solver.nodes} nodes explored "
+              f"out of {len(Army(arguments.budget).legal_armies())} legal armies")
@@ -0,0 +1,216 @@
+""" Persistent stack and queue.
+
+Counterparts of ArrayStack and CircularQueue that are never changed: push, pop, append and serve return a new
+stack or queue and leave the one they are called on as it was. New versions share the cells of the older ones
+instead of copying them, so keeping a version to come back to later, forking it, is keeping a reference to it, in
+O(1), whatever its length. The elements themselves are shared too and must not be changed while in a persistent
+stack or queue. The unit tests are in test_persistent_adt.py.
+"""
+from __future__ import annotations
+
+__author__ = "Zaid"
+__docformat__ = 'reStructuredText'
+
+from referential_array import Generic, T
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, Optional, Tuple
+
+    # (element, rest of the list), None for the empty list
+    Cells = Optional[Tuple[T, "Cells"]]
+
+
+def _reverse(cells: Cells) -> Cells:
+    """ Returns the cells of a new list holding the elements of cells in reverse order.
+    :complexity: O(n) where n is the number of elements
+    """
+    reversed_cells = None
+    while cells is not None:
+        item, cells = cells
+        reversed_cells = (item, reversed_cells)
+    return reversed_cells
+
+
+def _items(cells: Cells) -> Iterator[T]:
+    """ Yields the elements of cells from the first one on.
+    :complexity: O(1) per element
+    """
+    while cells is not None:
+        item, cells = cells
+        yield item
+
+
+class PersistentStack(Generic[T]):
+    """ Persistent stack, a linked list of (element, rest) cells with the top first.
+
+    Attributes:
+         top (Cells): cells of the stack, from the top
+         length (int): number of elements in the stack
+    """
+    __slots__ = ("top", "length")
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        """ Creates a stack holding items, the last one on top.
+        :complexity: O(n) where n is the number of items
+        """
+        self.top: Cells = None
+        self.length = 0
+        for item in items:
+            self.top = (item, self.top)
+            self.length += 1
+
+    @classmethod
+    def __of(cls, top: Cells, length: int) -> PersistentStack[T]:
+        """ Returns a stack made of the given cells.
+        :complexity: O(1)
+        """
+        stack = cls.__new__(cls)
+        stack.top = top
+        stack.length = length
+        return stack
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the stack."""
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ True if the stack is empty. """
+        return self.length == 0
+
+    def push(self, item: T) -> PersistentStack[T]:
+        """ Returns the stack with item pushed on top.
+        :complexity: O(1)
+        """
+        return self.__of((item, self.top), self.length + 1)
+
+    def pop(self) -> Tuple[T, PersistentStack[T]]:
+        """ Returns the element at the top and the stack without it.
+        :pre: stack is not empty
+        :raises Exception: if the stack is empty
+        :complexity: O(1)
+        """
+        if self.top is None:
+            raise Exception("Stack is empty")
+        item, rest = self.top
+        return item, self.__of(rest, self.length - 1)
+
+    def peek(self) -> T:
+        """ Returns the element at the top.
+        :pre: stack is not empty
+        :raises Exception: if the stack is empty
+        :complexity: O(1)
+        """
+        if self.top is None:
+            raise Exception("Stack is empty")
+        return self.top[0]
+
+    def __iter__(self) -> Iterator[T]:
+        """ Yields the elements of the stack from the top to the bottom.
+        :complexity: O(n) where n is the number of elements, O(1) per element
+        """
+        return _items(self.top)
+
+    def __str__(self) -> str:
+        """ Returns the elements of the stack from the top to the bottom, separated by commas.
+        :complexity: O(n) where n is the number of elements
+        """
+        return ",".join(str(item) for item in self)
+
+
+class PersistentQueue(Generic[T]):
+    """ Persistent queue, two linked lists of (element, rest) cells: the front from the front, and the rear from
+        the rear. Elements are appended to the rear list and served from the front list, and the rear list is
+        reversed into the front list when the front list runs out. A queue reverses its rear list at most once:
+        the reversed list replaces its own lists, which hold the same elements in the same order, so that every
+        version served again does not reverse it again. Serving is amortised O(1) when the versions are used once,
+        and a version forked from another one before its reversal reverses its own rear list once.
+
+    Attributes:
+         front (Cells): cells at the front of the queue, from the front
+         rear (Cells): cells at the rear of the queue, from the rear
+         length (int): number of elements in the queue
+    """
+    __slots__ = ("front", "rear", "length")
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        """ Creates a queue holding items, the first one at the front.
+        :complexity: O(n) where n is the number of items
+        """
+        self.rear: Cells = None
+        self.length = 0
+        for item in items:
+            self.rear = (item, self.rear)
+            self.length += 1
+        self.front: Cells = _reverse(self.rear)
+        self.rear = None
+
+    @classmethod
+    def __of(cls, front: Cells, rear: Cells, length: int) -> PersistentQueue[T]:
+        """ Returns a queue made of the given cells.
+        :complexity: O(1)
+        """
+        queue = cls.__new__(cls)
+        queue.front = front
+        queue.rear = rear
+        queue.length = length
+        return queue
+
+    def __rotate(self) -> None:
+        """ Reverses the rear list into the front list once the front list is empty. The queue holds the same
+            elements in the same order.
+        :complexity: O(n) where n is the number of elements, done at most once per queue
+        """
+        if self.front is None and self.rear is not None:
+            self.front = _reverse(self.rear)
+            self.rear = None
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the queue."""
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ True if the queue is empty. """
+        return self.length == 0
+
+    def append(self, item: T) -> PersistentQueue[T]:
+        """ Returns the queue with item added to the rear.
+        :complexity: O(1)
+        """
+        return self.__of(self.front, (item, self.rear), self.length + 1)
+
+    def serve(self) -> Tuple[T, PersistentQueue[T]]:
+        """ Returns the element at the front and the queue without it.
+        :pre: queue is not empty
+        :raises Exception: if the queue is empty
+        :complexity: O(1), amortised, see the class
+        """
+        if self.length == 0:
+            raise Exception("Queue is empty")
+        self.__rotate()
+        item, rest = self.front
+        return item, self.__of(rest, self.rear, self.length - 1)
+
+    def peek(self) -> T:
+        """ Returns the element at the front.
+        :pre: queue is not empty
+        :raises Exception: if the queue is empty
+        :complexity: O(1), amortised, see the class
+        """
+        if self.length == 0:
+            raise Exception("Queue is empty")
+        self.__rotate()
+        return self.front[0]
+
+    def __iter__(self) -> Iterator[T]:
+        """ Yields the elements of the queue from the front to the rear.
+        :complexity: O(n) where n is the number of elements
+        """
+        yield from _items(self.front)
+        yield from _items(_reverse(self.rear))
+
+    def __str__(self) -> str:
+        """ Returns the elements of the queue from the front to the rear, separated by commas.
+        :complexity: O(n) where n is the number of elements
+        """
+        return ",".join(str(item) for item in self)
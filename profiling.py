@@ -0,0 +1,71 @@
+"""
+Per-phase counters of Battle. A BattleProfiler given to Battle counts how many times every phase of
+Battle.__conduct_combat runs and how long it takes in total, and exports them as a dictionary or in the Prometheus
+text format.
+"""
+__author__ = "Zaid"
+
+from typing import Dict
+
+from battle import COMBAT, PUSH_BACK, RESULT, TAKE
+
+# phases of Battle.__conduct_combat, in the order they happen: step 1 pops/serves both units, step 2 attacks and
+# defends (or fights a whole duel with resolve_duels), step 3 pushes back the units still alive, then the winner
+# is declared
+PHASES = (TAKE, COMBAT, PUSH_BACK, RESULT)
+
+
+class BattleProfiler:
+    """ Counters and cumulative timings of the phases of a battle.
+
+    Attributes:
+         enabled (bool): whether Battle records into the profiler, read once at the start of every battle
+         calls (Dict[str, int]): number of times every phase ran
+         nanoseconds (Dict[str, int]): total time spent in every phase
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        """ Initialises every counter to 0.
+        :complexity: O(1)
+        """
+        self.enabled = enabled
+        self.calls = {}
+        self.nanoseconds = {}
+        self.reset()
+
+    def enable(self) -> None:
+        """ Starts recording from the next battle on."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """ Stops recording from the next battle on."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """ Sets every counter back to 0."""
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.nanoseconds = dict.fromkeys(PHASES, 0)
+
+    def add(self, phase: str, nanoseconds: int) -> None:
+        """ Records one run of phase that took the given time.
+        :complexity: O(1)
+        """
+        self.calls[phase] += 1
+        self.nanoseconds[phase] += nanoseconds
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """ Returns, for every phase, its number of calls and its total time in seconds."""
+        return {phase: {"calls": self.calls[phase], "seconds": self.nanoseconds[phase] / 1e9} for phase in PHASES}
+
+    def to_prometheus(self, prefix: str = "battle") -> str:
+        """ Returns the counters in the Prometheus text exposition format, one counter family for the calls and one
+        for the time, labelled by phase.
+        """
+        lines = [f"# HELP {prefix}_phase_calls_total Number of times a phase of a battle ran.",
+                 f"# TYPE {prefix}_phase_calls_total counter"]
+        lines += [f'{prefix}_phase_calls_total{{phase="{phase}"}} {self.calls[phase]}' for phase in PHASES]
+        lines += [f"# HELP {prefix}_phase_seconds_total Time spent in a phase of a battle.",
+                  f"# TYPE {prefix}_phase_seconds_total counter"]
+        lines += [f'{prefix}_phase_seconds_total{{phase="{phase}"}} {self.nanoseconds[phase] / 1e9}'
+                  for phase in PHASES]
+        return "\n".join(lines) + "\n"
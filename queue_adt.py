@@ -1,15 +1,19 @@
 """ Queue ADT and an array implementation.
 
 Defines a generic abstract queue with the usual methods, and implements 
-a circular queue using arrays. Also defines UnitTests for the class.
+a circular queue using arrays. The unit tests are in test_queue_adt.py.
 """
+from __future__ import annotations
+
 __author__ = "Maria Garcia de la Banda for the base"+"XXXXX student for"
 __docformat__ = 'reStructuredText'
 
-import unittest
-from abc import ABC, abstractmethod 
-from typing import TypeVar, Generic
-from referential_array import ArrayR, T
+from abc import ABC, abstractmethod
+from referential_array import ArrayR, Generic, T
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Sequence, TextIO
 
 class Queue(ABC, Generic[T]):
     """ Abstract class for a generic Queue. """
@@ -44,6 +48,17 @@ class Queue(ABC, Generic[T]):
         """ Clears all elements from the queue. """
         self.length = 0
 
+    def write_to(self, file: TextIO) -> None:
+        """ Writes the elements, as __str__ would show them, to file one element at a time,
+            without building the whole string.
+        :complexity: O(n) where n is the number of elements
+        """
+        separator = ""
+        for item in self:
+            file.write(separator)
+            file.write(str(item))
+            separator = ","
+
 class CircularQueue(Queue[T]):
     """ Circular implementation of a queue with arrays.
     
@@ -54,23 +69,61 @@ class CircularQueue(Queue[T]):
          array (ArrayR[T]): array storing the elements of the queue
 
     ArrayR cannot create empty arrays. So MIN_CAPCITY used to avoid this.
+    A resizable queue doubles its array when appending to a full queue and halves
+    it when serving leaves it a quarter full, never going below the initial capacity.
     """
     MIN_CAPACITY = 1 
 
-    def __init__(self,max_capacity:int) -> None:
+    def __init__(self,max_capacity:int, resizable: bool = False, backend: str = ArrayR.LIST,
+                 typecode: str = "q") -> None:
+        """ backend and typecode select the storage of the array, see ArrayR."""
         Queue.__init__(self)
         self.front = 0
         self.rear = 0
-        self.array = ArrayR(max(self.MIN_CAPACITY,max_capacity))
+        self.resizable = resizable
+        self.initial_capacity = max(self.MIN_CAPACITY,max_capacity)
+        self.array = ArrayR(self.initial_capacity, backend, typecode)
 
+    def __resize(self, capacity: int) -> None:
+        """ Moves the elements, from front to rear, to the start of a new array of the given capacity.
+        :complexity: O(n) where n is the number of elements
+        """
+        array = self.array.empty_like(capacity)
+        array.set_slice(0, self.__read(self.front, len(self)))
+        self.array = array
+        self.front = 0
+        self.rear = len(self) % capacity
+
+    def __read(self, start: int, count: int) -> List[T]:
+        """ Returns the count elements of the array from position start on, wrapping around its end.
+        :complexity: O(count), at most two slice copies
+        """
+        stop = start + count
+        if stop <= len(self.array):
+            return self.array.get_slice(start, stop)
+        return self.array.get_slice(start, len(self.array)) + self.array.get_slice(0, stop - len(self.array))
+
+    def __write(self, start: int, items: Sequence[T]) -> None:
+        """ Writes items into the array from position start on, wrapping around its end.
+        :complexity: O(n) where n is the number of items, at most two slice copies
+        """
+        room = len(self.array) - start
+        if len(items) <= room:
+            self.array.set_slice(start, items)
+        else:
+            self.array.set_slice(start, items[:room])
+            self.array.set_slice(0, items[room:])
 
     def append(self, item: T) -> None:
         """ Adds an element to the rear of the queue.
         :pre: queue is not full
         :raises Exception: if the queueu is full
+        :complexity: O(1), amortised O(1) for a resizable queue
         """
         if self.is_full():
             raise Exception("Queue is full")
+        if len(self) == len(self.array):
+            self.__resize(2 * len(self.array))
 
         self.array[self.rear] = item
         self.length += 1
@@ -80,6 +133,7 @@ class CircularQueue(Queue[T]):
         """ Deletes and returns the element at the queue's front.
         :pre: queue is not empty
         :raises Exception: if the queue is empty
+        :complexity: O(1), amortised O(1) for a resizable queue
         """
         if self.is_empty(): 
             raise Exception("Queue is empty")
@@ -87,11 +141,59 @@ class CircularQueue(Queue[T]):
         self.length -= 1
         item = self.array[self.front] 
         self.front = (self.front+1) % len(self.array)
-        return item 
+        if self.resizable and len(self.array) > self.initial_capacity and len(self) <= len(self.array) // 4:
+            self.__resize(max(self.initial_capacity, len(self.array) // 2))
+        return item
+
+    def peek(self) -> T:
+        """ Returns the element at the front, without serving it.
+        :pre: queue is not empty
+        :raises Exception: if the queue is empty
+        :complexity: O(1)
+        """
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        return self.array[self.front]
+
+    def extend(self, items: Sequence[T]) -> None:
+        """ Appends the items in order, so that the last one ends at the rear of the queue.
+            The items are copied into the array at once.
+        :pre: the queue has room for all the items
+        :raises Exception: if the queue does not have room for all the items
+        :complexity: O(n) where n is the number of items, amortised for a resizable queue
+        """
+        needed = len(self) + len(items)
+        if needed > len(self.array):
+            if not self.resizable:
+                raise Exception("Queue is full")
+            self.__resize(max(needed, 2 * len(self.array)))
+        self.__write(self.rear, list(items))
+        self.length = needed
+        self.rear = (self.rear + len(items)) % len(self.array)
+
+    def serve_many(self, count: int) -> List[T]:
+        """ Deletes and returns the count elements at the front of the queue, front first.
+        :pre: the queue has at least count elements
+        :raises ValueError: if count is negative
+        :raises Exception: if the queue has fewer than count elements
+        :complexity: O(count), amortised for a resizable queue
+        """
+        if count < 0:
+            raise ValueError("count cannot be negative")
+        if count > len(self):
+            raise Exception("Queue is empty")
+        items = self.__read(self.front, count)
+        self.length -= count
+        self.front = (self.front + count) % len(self.array)
+        if self.resizable and len(self.array) > self.initial_capacity and len(self) <= len(self.array) // 4:
+            self.__resize(max(self.initial_capacity, len(self.array) // 2))
+        return items
 
     def is_full(self) -> T:
-        """ True if the queue is full and no element can be appended. """
-        return len(self) == len(self.array)
+        """ True if the queue is full and no element can be appended. 
+            A resizable queue is never full.
+        """
+        return not self.resizable and len(self) == len(self.array)
  
     def clear(self) -> None:
         """ Clears all elements from the queue. """
@@ -99,107 +201,18 @@ class CircularQueue(Queue[T]):
         self.front = 0
         self.rear = 0
 
-    def __str__(self) -> str:
-        """returns string containing every element of the CircularArray.
-        :complexity: Best and worst is O(n) where n is the number of elements. Because loops over all the elements in
-                     the array
+    def __iter__(self) -> Iterator[T]:
+        """ Yields the elements of the queue from the front to the rear, without serving them.
+        :complexity: O(n) where n is the number of elements, O(1) per element
         """
         index = self.front
-        if not self.is_empty():
-            string = ""
-            for i in range(len(self)):
-                string += str(self.array[index]) + ","
-                index = (index+1) % len(self.array)
-        else:
-            string = ""
-        string = string[:len(string)-1]
-        return string
-
-class TestQueue(unittest.TestCase):
-    """ Tests for the above class."""
-    EMPTY = 0
-    ROOMY = 5
-    LARGE = 10
-    CAPACITY = 20
-
-    def setUp(self):
-        self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
-        self.queues = [CircularQueue(self.CAPACITY) for i in range(len(self.lengths))]
-        for queue, length in zip(self.queues, self.lengths):
-            for i in range(length):
-                queue.append(i)
-        self.empty_queue = self.queues[0]
-        self.roomy_queue = self.queues[1]
-        self.large_queue = self.queues[2]
-        #we build empty queues from clear.
-        #this is an indirect way of testing if clear works!
-        #(perhaps not the best)
-        self.clear_queue = self.queues[3]
-        self.clear_queue.clear()
-        self.lengths[3] = 0
-        self.queues[4].clear()
-        self.lengths[4] = 0
-
-    def tearDown(self):
-        for s in self.queues:
-            s.clear()
-
-    def test_init(self):
-        self.assertTrue(self.empty_queue.is_empty())
-        self.assertEqual(len(self.empty_queue), 0)
-            
-    def test_len(self):
-        """ Tests the length of all queues created during setup."""
-        for queue, length in zip(self.queues, self.lengths):
-            self.assertEqual(len(queue), length)
-            
-    def test_is_empty_add(self):
-        """ Tests queues that have been created empty/non-empty."""
-        self.assertTrue(self.empty_queue.is_empty())
-        self.assertFalse(self.roomy_queue.is_empty())
-        self.assertFalse(self.large_queue.is_empty())
-    
-    def test_is_empty_clear(self):
-        """ Tests queues that have been cleared."""
-        for queue in self.queues:
-            queue.clear()
-            self.assertTrue(queue.is_empty())
-            
-    def test_is_empty_serve(self):
-        """ Tests queues that have been served completely."""
-        for queue in self.queues:
-            #we empty the queue
-            try:
-                while True:
-                    was_empty = queue.is_empty()
-                    queue.serve()
-                    #if we have served without raising an assertion,
-                    #then the queue was not empty.
-                    self.assertFalse(was_empty)
-            except:
-                self.assertTrue(queue.is_empty())
-            
-    def test_is_full_add(self):
-        """ Tests queues that have been created not full."""
-        self.assertFalse(self.empty_queue.is_full())
-        self.assertFalse(self.roomy_queue.is_full())
-        self.assertFalse(self.large_queue.is_full())
-        
-    def test_append_and_serve(self):
-        for queue in self.queues:
-            nitems = self.ROOMY
-            for i in range(nitems):
-                queue.append(i)
-            for i in range(nitems):
-                self.assertEqual(queue.serve(), i)
-                
-    def test_clear(self):
-        for queue in self.queues:
-            queue.clear()
-            self.assertEqual(len(queue), 0)
-            self.assertTrue(queue.is_empty())
-
-if __name__ == '__main__':
-    testtorun = TestQueue()
-    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
-    unittest.TextTestRunner().run(suite)
+        for _ in range(len(self)):
+            yield self.array[index]
+            index = (index+1) % len(self.array)
+
+    def __str__(self) -> str:
+        """returns string containing every element of the CircularArray, from the front to the rear.
+        :complexity: Best and worst is O(n) where n is the number of elements. Because every element is converted
+                     once and the strings are joined at the end
+        """
+        return ",".join(str(item) for item in self)
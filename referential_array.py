@@ -12,25 +12,74 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+The storage behind the array is chosen at construction with backend:
+LIST (the default) preallocates a plain Python list, which is the
+cheapest to build and to index; CTYPES is the py_object array described
+above; TYPED uses the array module with the given typecode, and stores
+numbers unboxed, so it can only hold values of that type. Empty slots
+hold None, or 0 for TYPED arrays. ctypes is only imported the first time
+a CTYPES array is built.
+
+typing is only imported by type checkers, to keep it off the start-up
+path of the battle modules: at run time T is None and Generic is a plain
+base class whose subscriptions (ArrayR[T], Stack[T]...) return the class
+itself. stack_adt and queue_adt take both from here.
 """
+from __future__ import annotations
+
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
-from ctypes import py_object
-from typing import TypeVar, Generic
+from array import array
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Generic, List, Sequence, TypeVar
+
+    T = TypeVar('T')
+else:
+    T = None
+
+    class Generic:
+        """ Run-time stand-in for typing.Generic."""
+        __slots__ = ()
+
+        def __class_getitem__(cls, item: object) -> type:
+            return cls
 
-T = TypeVar('T')
 
 class ArrayR(Generic[T]):
-    def __init__(self, length: int) -> None:
+    LIST = "list"
+    CTYPES = "ctypes"
+    TYPED = "typed"
+
+    def __init__(self, length: int, backend: str = LIST, typecode: str = "q") -> None:
         """ Creates an array of references to objects of the given length
         :complexity: O(length) for best/worst case to initialise to None
         :pre: length > 0
+        :raises ValueError: if length <= 0 or backend is unknown
         """
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
-        self.array = (length * py_object)() # initialises the space 
-        self.array[:] =  [None for _ in range(length)]
+        self.backend = backend
+        self.typecode = typecode
+        if backend == ArrayR.LIST:
+            self.array = [None] * length
+        elif backend == ArrayR.CTYPES:
+            from ctypes import py_object
+            self.array = (length * py_object)() # initialises the space 
+            self.array[:] =  [None] * length
+        elif backend == ArrayR.TYPED:
+            self.array = array(typecode, bytes(length * array(typecode).itemsize))
+        else:
+            raise ValueError("Unknown array backend " + str(backend))
+
+    def empty_like(self, length: int) -> 'ArrayR[T]':
+        """ Creates an array of the given length with the same backend as this one.
+        :complexity: O(length), see __init__
+        """
+        return ArrayR(length, self.backend, self.typecode)
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -52,3 +101,22 @@ class ArrayR(Generic[T]):
         """
         self.array[index] = value
 
+    def get_slice(self, start: int, stop: int) -> List[T]:
+        """ Returns the objects in positions start to stop - 1 as a list.
+        :complexity: O(stop - start), a single copy
+        :pre: 0 <= start <= stop <= length
+        """
+        return list(self.array[start:stop])
+
+    def set_slice(self, start: int, values: Sequence[T]) -> None:
+        """ Sets the objects in positions start to start + len(values) - 1 to values, in one copy.
+        :complexity: O(len(values))
+        :pre: 0 <= start and start + len(values) <= length
+        :raises IndexError: if values do not fit in the array from start
+        """
+        stop = start + len(values)
+        if start < 0 or stop > len(self.array):
+            raise IndexError("Slice does not fit in the array.")
+        if self.backend == ArrayR.TYPED:
+            values = array(self.typecode, values)
+        self.array[start:stop] = values
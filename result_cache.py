@@ -0,0 +1,134 @@
+"""
+Memoised battle results. A ResultCache given to Battle remembers the winner of every (army1, army2, formation) it has
+seen, keyed on the number of units of every type of both armies, and answers repeated matches without fighting them.
+The most recently used results are kept in memory up to maxsize, the least recently used one is evicted first, and
+every result can also be kept in a shelf on disk so that it survives the process.
+
+A cache only holds results of one budget and roster: give it to Battles configured alike.
+"""
+__author__ = "Zaid"
+
+import shelve
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+Units = Tuple[int, ...]
+Key = Tuple[Units, Units, int]
+
+# result of army2 against army1, given the result of army1 against army2
+SWAPPED = (0, 2, 1)
+
+
+def canonical(army1: Sequence[int], army2: Sequence[int], formation: int) -> Tuple[Key, bool]:
+    """
+    Returns the key of a match and whether the armies were swapped to build it. Combat treats both armies alike, so
+    army2 against army1 is army1 against army2 with the winner swapped, and both are stored under one key, the one
+    with the smaller army first.
+    :complexity: O(r) where r is the number of unit types of the roster
+    """
+    first = tuple(int(count) for count in army1)
+    second = tuple(int(count) for count in army2)
+    if second < first:
+        return (second, first, formation), True
+    return (first, second, formation), False
+
+
+class ResultCache:
+    """ Bounded least recently used cache of battle results, optionally backed by a shelf.
+
+    Attributes:
+         maxsize (int): number of results kept in memory
+         hits (int): lookups answered from memory or from the shelf
+         misses (int): lookups that had to be fought
+         evictions (int): results dropped from memory to make room
+    """
+
+    def __init__(self, maxsize: int = 4096, path: Optional[str] = None) -> None:
+        """
+        :param maxsize: number of results kept in memory, at least 1
+        :param path: shelf file holding every result ever stored, None keeps the results in memory only
+        :raises ValueError: if maxsize is smaller than 1
+        :complexity: O(1)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.results: "OrderedDict[Key, int]" = OrderedDict()
+        self.shelf = shelve.open(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of results held in memory."""
+        return len(self.results)
+
+    def get(self, army1: Sequence[int], army2: Sequence[int], formation: int) -> Optional[int]:
+        """
+        Returns the result of army1 against army2 if it is known, None otherwise, and counts the hit or the miss.
+        A result found in the shelf is brought back into memory.
+        :complexity: O(r) where r is the number of unit types, plus one read of the shelf when it is not in memory
+        """
+        key, swapped = canonical(army1, army2, formation)
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+        elif self.shelf is not None:
+            result = self.shelf.get(repr(key))
+            if result is not None:
+                self.__remember(key, result)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return SWAPPED[result] if swapped else result
+
+    def put(self, army1: Sequence[int], army2: Sequence[int], formation: int, result: int) -> None:
+        """
+        Stores the result of army1 against army2, in the shelf too when there is one.
+        :complexity: O(r) where r is the number of unit types, plus one write to the shelf
+        """
+        key, swapped = canonical(army1, army2, formation)
+        if swapped:
+            result = SWAPPED[result]
+        self.__remember(key, result)
+        if self.shelf is not None:
+            self.shelf[repr(key)] = result
+
+    def fetch(self, army1: Sequence[int], army2: Sequence[int], formation: int, fight: Callable[[], int]) -> int:
+        """
+        Returns the result of army1 against army2, calling fight to get it and storing it when it is not known.
+        :complexity: O(r) on a hit, the cost of fight on a miss
+        """
+        result = self.get(army1, army2, formation)
+        if result is None:
+            result = fight()
+            self.put(army1, army2, formation, result)
+        return result
+
+    def __remember(self, key: Key, result: int) -> None:
+        """ Keeps result in memory as the most recently used one, evicting the least recently used if full.
+        :complexity: O(1)
+        """
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """ Returns the hits, misses, evictions, size and hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.results),
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def clear(self) -> None:
+        """ Drops the results held in memory and resets the statistics, the shelf is kept."""
+        self.results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        """ Writes the shelf back to disk and closes it."""
+        if self.shelf is not None:
+            self.shelf.close()
+            self.shelf = None
@@ -0,0 +1,242 @@
+"""
+Run-length encoded forces. A RunStack or a RunQueue stores consecutive units of the same type, life and experience as
+a single Run holding their number, so an army bought as blocks of fresh units takes memory for its runs rather than
+for its units. Both keep the unit-level interface of Stack and Queue, units popped or served are built from their
+run on the way out, and add run-level methods for Battle to fight whole runs at once. The unit tests are in
+test_rle_adt.py.
+"""
+from __future__ import annotations
+
+__author__ = "Zaid"
+
+from queue_adt import CircularQueue, Queue
+from stack_adt import ArrayStack, Stack
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, Optional, Type
+    from army import Fighter
+
+
+class Run:
+    """ count units of the same type, life and experience, in a row."""
+    __slots__ = ("unit_type", "life", "experience", "count")
+
+    def __init__(self, unit_type: Type[Fighter], life: int, experience: int, count: int) -> None:
+        """
+        :complexity: O(1)
+        """
+        self.unit_type = unit_type
+        self.life = life
+        self.experience = experience
+        self.count = count
+
+    def holds(self, unit_type: Type[Fighter], life: int, experience: int) -> bool:
+        """ True if a unit of that type, life and experience belongs to this run.
+        :complexity: O(1)
+        """
+        return self.unit_type is unit_type and self.life == life and self.experience == experience
+
+    def unit(self) -> Fighter:
+        """ Returns a new unit in the state of the units of the run.
+        :complexity: O(1)
+        """
+        unit = self.unit_type()
+        unit.life = self.life
+        unit.experience = self.experience
+        return unit
+
+    def __str__(self) -> str:
+        """ Returns the description of one unit of the run, as many times as there are units."""
+        return ",".join([str(self.unit())] * self.count)
+
+
+class RunStack(Stack["Fighter"]):
+    """ Stack of units stored as runs, the top run holds the units at the top of the stack.
+
+    Attributes:
+         length (int): number of units in the stack (inherited)
+         runs (ArrayStack[Run]): runs of the stack, the top run at the top
+    """
+
+    def __init__(self) -> None:
+        """ Creates an empty stack, it grows with the number of runs.
+        :complexity: O(1)
+        """
+        Stack.__init__(self)
+        self.runs = ArrayStack(1, resizable=True)
+
+    def is_full(self) -> bool:
+        """ A run stack is never full."""
+        return False
+
+    def clear(self) -> None:
+        """ Clears all units from the stack."""
+        Stack.clear(self)
+        self.runs.clear()
+
+    def push(self, item: Fighter) -> None:
+        """ Pushes a unit to the top of the stack, joining the top run when it is in the same state.
+        :complexity: O(1), amortised
+        """
+        self.push_run(type(item), item.life, item.experience, 1)
+
+    def pop(self) -> Fighter:
+        """ Pops the unit at the top of the stack.
+        :raises Exception: if the stack is empty
+        :complexity: O(1), amortised
+        """
+        unit = self.peek_run().unit()
+        self.take(1)
+        return unit
+
+    def peek(self) -> Fighter:
+        """ Returns a copy of the unit at the top of the stack, changing it leaves the stack as it is.
+        :raises Exception: if the stack is empty
+        :complexity: O(1)
+        """
+        return self.peek_run().unit()
+
+    def push_run(self, unit_type: Type[Fighter], life: int, experience: int, count: int) -> None:
+        """ Pushes count units of the same state at once.
+        :complexity: O(1), amortised
+        """
+        if count <= 0:
+            return
+        top = self.runs.peek() if self.length else None
+        if top is not None and top.holds(unit_type, life, experience):
+            top.count += count
+        else:
+            self.runs.push(Run(unit_type, life, experience, count))
+        self.length += count
+
+    def peek_run(self) -> Run:
+        """ Returns the top run. It belongs to the stack: change it through take and push_run only.
+        :raises Exception: if the stack is empty
+        :complexity: O(1)
+        """
+        return self.runs.peek()
+
+    def take(self, count: int) -> None:
+        """ Removes count units from the top run.
+        :pre: the top run holds at least count units
+        :raises Exception: if the stack is empty
+        :complexity: O(1), amortised
+        """
+        run = self.runs.peek()
+        run.count -= count
+        self.length -= count
+        if run.count == 0:
+            self.runs.pop()
+
+    def __iter__(self) -> Iterator[Fighter]:
+        """ Yields a copy of every unit from the top to the bottom.
+        :complexity: O(n) where n is the number of units
+        """
+        for run in self.runs:
+            for _ in range(run.count):
+                yield run.unit()
+
+    def __str__(self) -> str:
+        """ Returns the description of every unit, from the top to the bottom.
+        :complexity: O(n) where n is the number of units
+        """
+        return ",".join(str(run) for run in self.runs)
+
+
+class RunQueue(Queue["Fighter"]):
+    """ Queue of units stored as runs, the front run holds the units at the front of the queue.
+
+    Attributes:
+         length (int): number of units in the queue (inherited)
+         runs (CircularQueue[Run]): runs of the queue, the front run at the front
+         last (Optional[Run]): run at the rear, that units appended in the same state join
+    """
+
+    def __init__(self) -> None:
+        """ Creates an empty queue, it grows with the number of runs.
+        :complexity: O(1)
+        """
+        Queue.__init__(self)
+        self.runs = CircularQueue(1, resizable=True)
+        self.last: Optional[Run] = None
+
+    def is_full(self) -> bool:
+        """ A run queue is never full."""
+        return False
+
+    def clear(self) -> None:
+        """ Clears all units from the queue."""
+        Queue.clear(self)
+        self.runs.clear()
+        self.last = None
+
+    def append(self, item: Fighter) -> None:
+        """ Adds a unit to the rear of the queue, joining the rear run when it is in the same state.
+        :complexity: O(1), amortised
+        """
+        self.append_run(type(item), item.life, item.experience, 1)
+
+    def serve(self) -> Fighter:
+        """ Deletes and returns the unit at the front of the queue.
+        :raises Exception: if the queue is empty
+        :complexity: O(1), amortised
+        """
+        unit = self.peek_run().unit()
+        self.take(1)
+        return unit
+
+    def peek(self) -> Fighter:
+        """ Returns a copy of the unit at the front of the queue, changing it leaves the queue as it is.
+        :raises Exception: if the queue is empty
+        :complexity: O(1)
+        """
+        return self.peek_run().unit()
+
+    def append_run(self, unit_type: Type[Fighter], life: int, experience: int, count: int) -> None:
+        """ Appends count units of the same state at once.
+        :complexity: O(1), amortised
+        """
+        if count <= 0:
+            return
+        if self.last is not None and self.last.holds(unit_type, life, experience):
+            self.last.count += count
+        else:
+            self.last = Run(unit_type, life, experience, count)
+            self.runs.append(self.last)
+        self.length += count
+
+    def peek_run(self) -> Run:
+        """ Returns the front run. It belongs to the queue: change it through take and append_run only.
+        :raises Exception: if the queue is empty
+        :complexity: O(1)
+        """
+        return self.runs.peek()
+
+    def take(self, count: int) -> None:
+        """ Removes count units from the front run.
+        :pre: the front run holds at least count units
+        :raises Exception: if the queue is empty
+        :complexity: O(1), amortised
+        """
+        run = self.runs.peek()
+        run.count -= count
+        self.length -= count
+        if run.count == 0:
+            self.runs.serve()
+            if self.runs.is_empty():
+                self.last = None
+
+    def __iter__(self) -> Iterator[Fighter]:
+        """ Yields a copy of every unit from the front to the rear.
+        :complexity: O(n) where n is the number of units
+        """
+        for run in self.runs:
+            for _ in range(run.count):
+                yield run.unit()
+
+    def __str__(self) -> str:
+        """ Returns the description of every unit, from the front to the rear.
+        :complexity: O(n) where n is the number of units
+        """
+        return ",".join(str(run) for run in self.runs)
@@ -1,15 +1,19 @@
 """ Stack ADT and an array implementation.
 
 Defines a generic abstract stack with the usual methods, and implements 
-a stack using arrays. Also defines UnitTests for the class.
+a stack using arrays. The unit tests are in test_stack_adt.py.
 """
+from __future__ import annotations
+
 __author__ = "Maria Garcia de la Banda for the base"+"XXXXX student for"
 __docformat__ = 'reStructuredText'
 
-import unittest
-from abc import ABC, abstractmethod 
-from typing import TypeVar, Generic
-from referential_array import ArrayR, T
+from abc import ABC, abstractmethod
+from referential_array import ArrayR, Generic, T
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Sequence, TextIO
 
 class Stack(ABC, Generic[T]):
     def __init__(self) -> None:
@@ -47,6 +51,17 @@ class Stack(ABC, Generic[T]):
         """ Clears all elements from the stack. """
         self.length = 0
 
+    def write_to(self, file: TextIO) -> None:
+        """ Writes the elements, as __str__ would show them, to file one element at a time,
+            without building the whole string.
+        :complexity: O(n) where n is the number of elements
+        """
+        separator = ""
+        for item in self:
+            file.write(separator)
+            file.write(str(item))
+            separator = ","
+
 
 class ArrayStack(Stack[T]):
     """ Implementation of a stack with arrays.
@@ -56,27 +71,46 @@ class ArrayStack(Stack[T]):
          array (ArrayR[T]): array storing the elements of the queue
 
     ArrayR cannot create empty arrays. So MIN_CAPCITY used to avoid this.
+    A resizable stack doubles its array when pushing onto a full stack and halves
+    it when popping leaves it a quarter full, never going below the initial capacity.
     """
     MIN_CAPACITY = 1 
 
-    def __init__(self, max_capacity: int) -> None:
+    def __init__(self, max_capacity: int, resizable: bool = False, backend: str = ArrayR.LIST,
+                 typecode: str = "q") -> None:
         """ Initialises the length and the array with the given capacity.
             If max_capacity is 0, the array is created with MIN_CAPACITY.
+            backend and typecode select the storage of the array, see ArrayR.
         """
         Stack.__init__(self)
-        self.array = ArrayR(max(self.MIN_CAPACITY, max_capacity))
-        
+        self.resizable = resizable
+        self.initial_capacity = max(self.MIN_CAPACITY, max_capacity)
+        self.array = ArrayR(self.initial_capacity, backend, typecode)
+
     def is_full(self) -> bool:
-        """ True if the stack is full and no element can be pushed. """
-        return len(self) == len(self.array)
+        """ True if the stack is full and no element can be pushed. 
+            A resizable stack is never full.
+        """
+        return not self.resizable and len(self) == len(self.array)
+
+    def __resize(self, capacity: int) -> None:
+        """ Moves the elements to a new array of the given capacity.
+        :complexity: O(n) where n is the number of elements
+        """
+        array = self.array.empty_like(capacity)
+        array.set_slice(0, self.array.get_slice(0, len(self)))
+        self.array = array
 
     def push(self, item: T) -> None:
         """ Pushes an element to the top of the stack.
         :pre: stack is not full
         :raises Exception: if the stack is full
+        :complexity: O(1), amortised O(1) for a resizable stack
         """
         if self.is_full():
             raise Exception("Stack is full")
+        if len(self) == len(self.array):
+            self.__resize(2 * len(self.array))
         self.array[len(self)] = item
         self.length += 1
 
@@ -84,11 +118,48 @@ class ArrayStack(Stack[T]):
         """ Pops the element at the top of the stack.
         :pre: stack is not empty
         :raises Exception: if the stack is empty
+        :complexity: O(1), amortised O(1) for a resizable stack
         """
         if self.is_empty():
             raise Exception("Stack is empty")
         self.length -= 1
-        return self.array[self.length]
+        item = self.array[self.length]
+        if self.resizable and len(self.array) > self.initial_capacity and len(self) <= len(self.array) // 4:
+            self.__resize(max(self.initial_capacity, len(self.array) // 2))
+        return item
+
+    def push_many(self, items: Sequence[T]) -> None:
+        """ Pushes the items in order, so that the last one ends at the top of the stack.
+            The items are copied into the array at once.
+        :pre: the stack has room for all the items
+        :raises Exception: if the stack does not have room for all the items
+        :complexity: O(n) where n is the number of items, amortised for a resizable stack
+        """
+        needed = len(self) + len(items)
+        if needed > len(self.array):
+            if not self.resizable:
+                raise Exception("Stack is full")
+            self.__resize(max(needed, 2 * len(self.array)))
+        self.array.set_slice(len(self), items)
+        self.length = needed
+
+    def pop_many(self, count: int) -> List[T]:
+        """ Pops count elements and returns them in the order they were popped, top first.
+        :pre: the stack has at least count elements
+        :raises ValueError: if count is negative
+        :raises Exception: if the stack has fewer than count elements
+        :complexity: O(count), amortised for a resizable stack
+        """
+        if count < 0:
+            raise ValueError("count cannot be negative")
+        if count > len(self):
+            raise Exception("Stack is empty")
+        self.length -= count
+        items = self.array.get_slice(len(self), len(self) + count)
+        items.reverse()
+        if self.resizable and len(self.array) > self.initial_capacity and len(self) <= len(self.array) // 4:
+            self.__resize(max(self.initial_capacity, len(self.array) // 2))
+        return items
 
     def peek(self) -> T:
         """ Returns the element at the top, without popping it from stack.
@@ -99,106 +170,16 @@ class ArrayStack(Stack[T]):
             raise Exception("Stack is empty")
         return self.array[self.length-1]
 
+    def __iter__(self) -> Iterator[T]:
+        """ Yields the elements of the stack from the top to the bottom, without popping them.
+        :complexity: O(n) where n is the number of elements, O(1) per element
+        """
+        for index in range(len(self) - 1, -1, -1):
+            yield self.array[index]
+
     def __str__(self) -> str:
-        """returns string containing every element of the StackArray.
-        :complexity: Best and worst is O(n) where n is the number of elements. Because loops over all the elements in
-                     the array
+        """returns string containing every element of the StackArray, from the top to the bottom.
+        :complexity: Best and worst is O(n) where n is the number of elements. Because every element is converted
+                     once and the strings are joined at the end
         """
-        string = ''
-        if len(self) > 0:
-            for i in self.array:
-                string = str(i) + "," + string
-        else:
-            string = ''
-        string = string[:len(string)-1]
-        return string
-
-
-class TestStack(unittest.TestCase):
-    """ Tests for the above class."""
-    EMPTY = 0
-    ROOMY = 5
-    LARGE = 10
-    CAPACITY = 20
-
-    def setUp(self):
-        self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
-        self.stacks = [ArrayStack(self.CAPACITY) for i in range(len(self.lengths))]
-        for stack, length in zip(self.stacks, self.lengths):
-            for i in range(length):
-                stack.push(i)
-        self.empty_stack = self.stacks[0]
-        self.roomy_stack = self.stacks[1]
-        self.large_stack = self.stacks[2]
-        #we build empty stacks from clear.
-        #this is an indirect way of testing if clear works!
-        #(perhaps not the best)
-        self.clear_stack = self.stacks[3]
-        self.clear_stack.clear()
-        self.lengths[3] = 0
-        self.stacks[4].clear()
-        self.lengths[4] = 0
-
-    def tearDown(self):
-        for s in self.stacks:
-            s.clear()
-
-    def test_init(self):
-        self.assertTrue(self.empty_stack.is_empty())
-        self.assertEqual(len(self.empty_stack), 0)
-            
-    def test_len(self):
-        """ Tests the length of all stacks created during setup."""
-        for stack, length in zip(self.stacks, self.lengths):
-            self.assertEqual(len(stack), length)
-            
-    def test_is_empty_add(self):
-        """ Tests stacks that have been created empty/non-empty."""
-        self.assertTrue(self.empty_stack.is_empty())
-        self.assertFalse(self.roomy_stack.is_empty())
-        self.assertFalse(self.large_stack.is_empty())
-    
-    def test_is_empty_clear(self):
-        """ Tests stacks that have been cleared."""
-        for stack in self.stacks:
-            stack.clear()
-            self.assertTrue(stack.is_empty())
-            
-    def test_is_empty_pop(self):
-        """ Tests stacks that have been popped completely."""
-        for stack in self.stacks:
-            #we empty the stack
-            try:
-                while True:
-                    was_empty = stack.is_empty()
-                    stack.pop()
-                    #if we have popped without raising an assertion,
-                    #then the stack was not empty.
-                    self.assertFalse(was_empty)
-            except:
-                self.assertTrue(stack.is_empty())
-            
-    def test_is_full_add(self):
-        """ Tests stacks that have been created not full."""
-        self.assertFalse(self.empty_stack.is_full())
-        self.assertFalse(self.roomy_stack.is_full())
-        self.assertFalse(self.large_stack.is_full())
-        
-    def test_push_and_pop(self):
-        for stack in self.stacks:
-            nitems = self.ROOMY
-            for i in range(nitems):
-                stack.push(i)
-            for i in range(nitems-1, -1, -1):
-                self.assertEqual(stack.pop(), i)
-                
-    def test_clear(self):
-        for stack in self.stacks:
-            stack.clear()
-            self.assertEqual(len(stack), 0)
-            self.assertTrue(stack.is_empty())
-
-if __name__ == '__main__':
-    testtorun = TestStack()
-    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
-    unittest.TextTestRunner().run(suite)
+        return ",".join(str(item) for item in self)
@@ -0,0 +1,66 @@
+"""
+Tests for army_generator.py.
+"""
+__author__ = "Zaid"
+
+import unittest
+from collections import Counter
+from itertools import islice
+
+from army import Army, Cavalry, Soldier
+from army_generator import ArmyGenerator, count_armies
+from battle import Battle
+
+
+class TestArmyGenerator(unittest.TestCase):
+    """ Tests for count_armies and ArmyGenerator."""
+    DRAWS = 30000
+
+    def test_count_armies(self):
+        for budget in (0, 1, 6, 30, 47):
+            self.assertEqual(count_armies(budget), len(Army(budget).legal_armies()))
+        self.assertEqual(count_armies(30, (Soldier, Cavalry)), len(Army(30, (Soldier, Cavalry)).legal_armies()))
+        self.assertEqual(len(ArmyGenerator()), count_armies())
+
+    def test_seeded(self):
+        first = list(ArmyGenerator(seed=7).pairings(50))
+        self.assertEqual(first, list(ArmyGenerator(seed=7).pairings(50)))
+        self.assertNotEqual(first, list(ArmyGenerator(seed=8).pairings(50)))
+        army = Army()
+        for army1, army2, formation in first:
+            self.assertTrue(army.is_legal(army1) and army.is_legal(army2))
+            self.assertIn(formation, (0, 1))
+
+    def test_uniform(self):
+        generator = ArmyGenerator(budget=6, seed=1)
+        counts = Counter(generator.stream(self.DRAWS))
+        self.assertEqual(set(counts), set(generator.armies))
+        expected = self.DRAWS / len(generator)
+        for count in counts.values():
+            self.assertLess(abs(count - expected), 0.2 * expected)
+
+    def test_weighted(self):
+        # an army weighs 2 to the power of its number of cavalries
+        generator = ArmyGenerator(budget=6, weights=(1, 1, 2), seed=1)
+        counts = Counter(generator.stream(self.DRAWS))
+        total = sum(2 ** army[2] for army in generator.armies)
+        for army in generator.armies:
+            expected = self.DRAWS * 2 ** army[2] / total
+            self.assertLess(abs(counts[army] - expected), 0.2 * expected + 30)
+        only_soldiers = ArmyGenerator(budget=6, weights=(1, 0, 0), seed=1)
+        self.assertEqual({army[1:] for army in only_soldiers.stream(500)}, {(0, 0)})
+        self.assertEqual(set(ArmyGenerator(budget=6, weights=(0, 0, 0)).stream(20)), {(0, 0, 0)})
+        self.assertRaises(ValueError, ArmyGenerator, 6, weights=(1, -1, 1))
+        self.assertRaises(ValueError, ArmyGenerator, 6, weights=(1, 1))
+
+    def test_batch_combat(self):
+        pairings = list(islice(ArmyGenerator(seed=3).pairings(formation=1), 40))
+        self.assertEqual({formation for _, _, formation in pairings}, {1})
+        results = list(Battle().batch_combat(ArmyGenerator(seed=3).pairings(40, formation=1)))
+        self.assertEqual(results, [Battle().headless_combat(army1, army2, 1) for army1, army2, _ in pairings])
+
+
+if __name__ == '__main__':
+    testtorun = TestArmyGenerator()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
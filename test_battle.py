@@ -0,0 +1,256 @@
+"""
+Tests for battle.py.
+"""
+__author__ = "Zaid"
+
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+from army import Archer, Army, Cavalry, Soldier
+from army_generator import ArmyGenerator
+import battle as battle_module
+from battle import Battle, TAKE, read_pairings, run_batch
+from combat_log import CombatRecorder
+from fixtures import Ogre
+from profiling import BattleProfiler
+
+
+class TestBattle(unittest.TestCase):
+    """ Tests for the optional engine paths of Battle, which must give the results of the plain one."""
+
+    def setUp(self):
+        rng = random.Random(2021)
+        legal = Army().legal_armies()
+        self.pairings = [(rng.choice(legal), rng.choice(legal)) for _ in range(300)]
+        self.pairings += [((30, 0, 0), (0, 0, 10)), ((0, 15, 0), (0, 15, 0)), ((0, 0, 0), (1, 0, 0))]
+
+    def assertSameResults(self, battle: "Battle", formation: int) -> None:
+        for army1, army2 in self.pairings:
+            self.assertEqual(battle.headless_combat(army1, army2, formation),
+                             Battle().headless_combat(army1, army2, formation))
+
+    def test_resolve_duels(self):
+        for formation in (0, 1):
+            self.assertSameResults(Battle(resolve_duels=True), formation)
+
+    def test_budget_and_roster(self):
+        battle = Battle(budget=3000)
+        self.assertEqual(battle.headless_combat((3000, 0, 0), (0, 0, 1000), 1), 1)
+        self.assertRaises(ValueError, Battle().headless_combat, (31, 0, 0), (0, 0, 0), 0)
+        without_archers = Battle(roster=(Soldier, Cavalry))
+        for army1, army2 in self.pairings:
+            for formation in (0, 1):
+                self.assertEqual(without_archers.headless_combat((army1[0], army1[2]), (army2[0], army2[2]), formation),
+                                 Battle().headless_combat((army1[0], 0, army1[2]), (army2[0], 0, army2[2]), formation))
+        self.assertRaises(ValueError, without_archers.headless_combat, (1, 0, 0), (1, 0), 0)
+        # the first type of the roster ends on top of the stack
+        army = Army(roster=(Cavalry, Soldier))
+        army.set_army("1", (1, 1), 0)
+        self.assertIsInstance(army.force.peek(), Cavalry)
+
+    def test_outcomes_bounded(self):
+        # the duel and round outcomes kept are capped, the battles fought past the cap give the same results
+        with mock.patch("battle.OUTCOMES_MAXSIZE", 3), mock.patch("battle._duel_outcomes", OrderedDict()), \
+                mock.patch("battle._round_outcomes", OrderedDict()):
+            for army1, army2 in self.pairings:
+                for battle, formation in ((Battle(resolve_duels=True), 0), (Battle(runs=True), 0),
+                                          (Battle(runs=True), 1)):
+                    self.assertEqual(battle.headless_combat(army1, army2, formation),
+                                     Battle().headless_combat(army1, army2, formation))
+            self.assertEqual(len(battle_module._duel_outcomes), 3)
+            self.assertEqual(len(battle_module._round_outcomes), 3)
+
+    def test_resolve_duel_states(self):
+        for first in Army().legal_armies()[::40]:
+            for second in Army().legal_armies()[::40]:
+                army1 = Army()
+                army2 = Army()
+                army1.set_army("1", first, 0)
+                army2.set_army("2", second, 0)
+                while not army1.force.is_empty() and not army2.force.is_empty():
+                    U1 = army1.force.pop()
+                    U2 = army2.force.pop()
+                    copy1 = type(U1)()
+                    copy2 = type(U2)()
+                    copy1.life, copy1.experience, copy2.life, copy2.experience = \
+                        U1.life, U1.experience, U2.life, U2.experience
+                    Battle().resolve_duel(copy1, copy2)
+                    while True:
+                        Battle().combat(U1, U2)
+                        if U1.is_alive() and U2.is_alive():
+                            U1.lose_life(1)
+                            U2.lose_life(1)
+                        if not U1.is_alive() or not U2.is_alive():
+                            break
+                    if U1.is_alive():
+                        U1.gain_experience(1)
+                        army1.force.push(U1)
+                    if U2.is_alive():
+                        U2.gain_experience(1)
+                        army2.force.push(U2)
+                    self.assertEqual((copy1.life, copy1.experience, copy2.life, copy2.experience),
+                                     (U1.life, U1.experience, U2.life, U2.experience))
+
+    def test_oracle(self):
+        for formation in (0, 1):
+            self.assertSameResults(Battle(oracle=True), formation)
+            self.assertSameResults(Battle(oracle=True, resolve_duels=True), formation)
+        # corpus of seeded random armies, larger budgets leave more rounds to cut
+        for budget, seed in ((30, 1), (90, 2)):
+            oracle = Battle(budget=budget, oracle=True)
+            for army1, army2, formation in ArmyGenerator(budget, seed=seed).pairings(400):
+                self.assertEqual(oracle.headless_combat(army1, army2, formation),
+                                 Battle(budget=budget).headless_combat(army1, army2, formation))
+
+    def test_oracle_roster(self):
+        # an ogre can lose 3 life in a round, the oracle is not used with it
+        roster = (Soldier, Archer, Ogre)
+        self.assertFalse(Battle(roster=roster, oracle=True).oracle)
+        self.assertTrue(Battle(roster=(Soldier, Cavalry), oracle=True).oracle)
+        self.assertEqual(Battle(roster=roster, oracle=True).headless_combat((3, 5, 1), (2, 4, 5), 1),
+                         Battle(roster=roster).headless_combat((3, 5, 1), (2, 4, 5), 1))
+        for army1, army2, formation in ArmyGenerator(roster=roster, seed=20).pairings(300):
+            self.assertEqual(Battle(roster=roster, oracle=True).headless_combat(army1, army2, formation),
+                             Battle(roster=roster).headless_combat(army1, army2, formation))
+
+    def test_oracle_ends_early(self):
+        # 30 soldiers need at least 30 rounds paid for to be destroyed, a cavalry only has 4 life to pay with
+        profiler = BattleProfiler()
+        self.assertEqual(Battle(oracle=True, profiler=profiler).headless_combat((0, 0, 1), (30, 0, 0), 1), 2)
+        self.assertEqual(profiler.calls[TAKE], 0)
+        profiler.reset()
+        self.assertEqual(Battle(profiler=profiler).headless_combat((0, 0, 1), (30, 0, 0), 1), 2)
+        self.assertGreater(profiler.calls[TAKE], 0)
+
+    def test_runs(self):
+        for formation in (0, 1):
+            self.assertSameResults(Battle(runs=True), formation)
+        for budget, seed in ((30, 3), (90, 4)):
+            runs = Battle(budget=budget, runs=True)
+            for army1, army2, formation in ArmyGenerator(budget, seed=seed).pairings(400):
+                self.assertEqual(runs.headless_combat(army1, army2, formation),
+                                 Battle(budget=budget).headless_combat(army1, army2, formation))
+        # a million units per side in the queue formation take a few steps per distinct state
+        self.assertEqual(Battle(budget=3 * 10 ** 6, runs=True).headless_combat((0, 0, 10 ** 6), (10 ** 6, 0, 0), 1),
+                         Battle(budget=3 * 10 ** 3).headless_combat((0, 0, 10 ** 3), (10 ** 3, 0, 0), 1))
+        # the oracle totals walk every unit, battles in runs are dispatched before them
+        with mock.patch.object(Battle, "_Battle__life_left", side_effect=AssertionError):
+            self.assertEqual(Battle(budget=3 * 10 ** 6, runs=True, oracle=True)
+                             .headless_combat((10 ** 6, 0, 0), (10 ** 6 - 1, 0, 0), 0), 1)
+        # profiled battles are fought a unit at a time
+        profiler = BattleProfiler()
+        self.assertEqual(Battle(runs=True, profiler=profiler).headless_combat((10, 0, 0), (0, 0, 5), 0),
+                         Battle().headless_combat((10, 0, 0), (0, 0, 5), 0))
+        self.assertGreater(profiler.calls[TAKE], 0)
+
+    def test_branch(self):
+        battle = Battle()
+        for formation in (0, 1):
+            for army1, army2 in self.pairings:
+                self.assertEqual(battle.finish(battle.branch(army1, army2, formation)),
+                                 Battle().headless_combat(army1, army2, formation))
+        self.assertRaises(ValueError, battle.branch, (31, 0, 0), (0, 0, 0), 0)
+        # branched battles are not recorded
+        recorder = CombatRecorder(io.BytesIO())
+        recording = Battle(recorder=recorder)
+        self.assertEqual(recording.finish(recording.branch((5, 3, 4), (2, 5, 4), 0)),
+                         Battle().headless_combat((5, 3, 4), (2, 5, 4), 0))
+        self.assertEqual((recorder.battle, recorder.round, len(recorder.buffer)), (0, 0, 0))
+
+    def test_end_round(self):
+        # both alive: both lose 1 life, one dead: the other gains 1 experience
+        for lives, expected in (((3, 2), (2, 0, 1, 0, True, True)), ((3, 1), (2, 1, 0, 0, True, False)),
+                                ((0, 2), (0, 0, 2, 1, False, True)), ((0, 0), (0, 0, 0, 0, False, False))):
+            U1, U2 = Soldier(), Archer()
+            U1.life, U2.life = lives
+            alive1, alive2 = Battle.end_round(U1, U2)
+            self.assertEqual((U1.life, U1.experience, U2.life, U2.experience, alive1, alive2), expected)
+
+    def test_branch_forks(self):
+        battle = Battle()
+        for formation in (0, 1):
+            start = battle.branch((10, 5, 3), (4, 4, 5), formation)
+            middle = battle.play(start, 7)
+            before = (str(middle.force1), str(middle.force2))
+            # fighting on from middle, twice, leaves it as it was
+            end = battle.play(middle)
+            self.assertTrue(end.is_over())
+            self.assertEqual(battle.finish(middle), battle.finish(start))
+            self.assertEqual((str(middle.force1), str(middle.force2)), before)
+            self.assertEqual((start.rounds, middle.rounds), (0, 7))
+            self.assertIs(battle.step(end), end)
+            self.assertEqual(battle.finish(start), Battle().headless_combat((10, 5, 3), (4, 4, 5), formation))
+
+    def test_read_pairings(self):
+        source = io.StringIO("5 3 4 2 5 4 0\n\n  \n30 0 0 0 0 10 1\n")
+        self.assertEqual(list(read_pairings(source)), [((5, 3, 4), (2, 5, 4), 0), ((30, 0, 0), (0, 0, 10), 1)])
+        for line in ("5 3 4 2 5 4\n", "5 3 4 2 5 4 0 1\n", "5 3 4 two 5 4 0\n"):
+            self.assertRaises(ValueError, list, read_pairings(io.StringIO(line)))
+        # lines before a bad one are still parsed
+        pairings = read_pairings(io.StringIO("1 0 0 0 1 0 0\nbad\n"))
+        self.assertEqual(next(pairings), ((1, 0, 0), (0, 1, 0), 0))
+        self.assertRaises(ValueError, next, pairings)
+
+    def test_run_batch(self):
+        pairings = [((5, 3, 4), (2, 5, 4), 0), ((30, 0, 0), (0, 0, 10), 1), ((1, 0, 0), (1, 0, 0), 0)]
+        sink = io.StringIO()
+        run_batch(io.StringIO("".join(f"{' '.join(map(str, a + b))} {f}\n" for a, b, f in pairings)), sink)
+        self.assertEqual(sink.getvalue(), "".join(f"{Battle().headless_combat(a, b, f)}\n" for a, b, f in pairings))
+
+        # results are written as soon as they are known, before the next line is read
+        written = []
+
+        def source():
+            for army1, army2, formation in pairings:
+                written.append(sink.getvalue().count("\n"))
+                yield f"{' '.join(map(str, army1 + army2))} {formation}\n"
+        sink = io.StringIO()
+        run_batch(source(), sink)
+        self.assertEqual(written, [0, 1, 2])
+
+        # a bad line stops the batch after the results of the lines before it
+        sink = io.StringIO()
+        self.assertRaises(ValueError, run_batch, io.StringIO("0 0 1 1 0 0 1\n0 0 1\n"), sink)
+        self.assertEqual(sink.getvalue(), f"{Battle().headless_combat((0, 0, 1), (1, 0, 0), 1)}\n")
+        # so does an illegal army, the same as headless_combat
+        self.assertRaises(ValueError, Battle().headless_combat, (31, 0, 0), (1, 0, 0), 0)
+        self.assertRaises(ValueError, Battle().headless_combat, (-1, 0, 0), (1, 0, 0), 0)
+        self.assertRaises(ValueError, run_batch, io.StringIO("31 0 0 1 0 0 0\n"), io.StringIO())
+
+    def test_command_line(self):
+        # python battle.py reads the pairings from stdin, or from the file given
+        directory = os.path.dirname(os.path.abspath(__file__))
+        lines = "5 3 4 2 5 4 0\n0 0 1 3 0 0 1\n"
+        expected = [str(Battle().headless_combat((5, 3, 4), (2, 5, 4), 0)),
+                    str(Battle().headless_combat((0, 0, 1), (3, 0, 0), 1))]
+        result = subprocess.run([sys.executable, "battle.py"], cwd=directory, input=lines, capture_output=True,
+                                text=True, check=True)
+        self.assertEqual(result.stdout.split(), expected)
+        with tempfile.TemporaryDirectory() as pairings_directory:
+            path = os.path.join(pairings_directory, "pairings.txt")
+            with open(path, "w") as pairings_file:
+                pairings_file.write(lines)
+            result = subprocess.run([sys.executable, "battle.py", path], cwd=directory, capture_output=True,
+                                    text=True, check=True)
+        self.assertEqual(result.stdout.split(), expected)
+
+    def test_import_path(self):
+        # the runtime modules must not pull in the tests, typing or ctypes, see benchmarks/import_time.py
+        imported = subprocess.run([sys.executable, "-c", "import sys, battle; print(' '.join(sys.modules))"],
+                                  cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+                                  check=True).stdout.split()
+        for module in ("unittest", "typing", "ctypes"):
+            self.assertNotIn(module, imported)
+
+
+if __name__ == '__main__':
+    testtorun = TestBattle()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,124 @@
+"""
+Tests for battle_server.py.
+"""
+__author__ = "Zaid"
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+
+from battle import Battle
+from battle_server import BattleServer
+
+
+class BreakingExecutor(ThreadPoolExecutor):
+    """Executor whose worker dies after the first match, as a process pool whose worker was killed."""
+
+    def __init__(self) -> None:
+        super().__init__(1)
+        self.submitted = 0
+        self.shutdown_thread = None
+
+    def submit(self, *args, **kwargs) -> Future:
+        self.submitted += 1
+        if self.submitted == 1:
+            return super().submit(*args, **kwargs)
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker process terminated abruptly"))
+        return future
+
+    def shutdown(self, *args, **kwargs) -> None:
+        self.shutdown_thread = threading.current_thread()
+        super().shutdown(*args, **kwargs)
+
+
+class GoneWriter:
+    """Writer of a connection the client reset."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        raise BrokenPipeError
+
+    async def drain(self) -> None:
+        raise ConnectionResetError
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestBattleServer(unittest.TestCase):
+    """ Tests for BattleServer, over a Unix socket and over TCP."""
+
+    def exchange(self, requests: List[Any], unix: bool, executor=None) -> List[Dict[str, Any]]:
+        async def run() -> List[Dict[str, Any]]:
+            server = BattleServer(executor if executor is not None else ProcessPoolExecutor(1))
+            with tempfile.TemporaryDirectory() as directory:
+                if unix:
+                    await server.start(path=os.path.join(directory, "battle.sock"))
+                    reader, writer = await asyncio.open_unix_connection(server.address())
+                else:
+                    await server.start()
+                    reader, writer = await asyncio.open_connection(*server.address())
+                for request in requests:
+                    line = request if isinstance(request, bytes) else json.dumps(request).encode()
+                    writer.write(line + b"\n")
+                await writer.drain()
+                answers = [json.loads(await reader.readline()) for _ in requests]
+                writer.close()
+                await writer.wait_closed()
+                await server.close()
+            return answers
+
+        return asyncio.run(run())
+
+    def test_matches(self):
+        requests = [{"id": i, "army1": list(army1), "army2": list(army2), "formation": formation}
+                    for i, (army1, army2, formation) in enumerate([((30, 0, 0), (0, 0, 10), 0),
+                                                                   ((0, 0, 10), (30, 0, 0), 1),
+                                                                   ((3, 3, 3), (3, 3, 3), 0)])]
+        for unix in (True, False):
+            answers = {answer["id"]: answer for answer in self.exchange(requests, unix)}
+            for request in requests:
+                expected = Battle().headless_combat(request["army1"], request["army2"], request["formation"])
+                self.assertEqual(answers[request["id"]], {"id": request["id"], "result": expected})
+
+    def test_invalid(self):
+        requests = [{"id": 1, "army1": [31, 0, 0], "army2": [0, 0, 0], "formation": 0},
+                    {"id": 2, "army1": [1, 0, 0], "army2": [0, 0, 0], "formation": 2},
+                    {"id": 3, "army1": ["1", 0, 0], "army2": [0, 0, 0], "formation": 1},
+                    b"not json"]
+        answers = {answer["id"]: answer for answer in self.exchange(requests, True)}
+        self.assertEqual(answers[1]["error"], "Invalid number of units")
+        self.assertIn("formation", answers[2]["error"])
+        self.assertIn("army1", answers[3]["error"])
+        self.assertEqual(answers[None]["error"], "Request is not valid JSON")
+
+    def test_worker_failed(self):
+        executor = BreakingExecutor()
+        answers = self.exchange([{"id": 1, "army1": [1, 0, 0], "army2": [0, 0, 0], "formation": 0}], True, executor)
+        self.assertEqual(answers, [{"id": 1, "error": "Battle worker failed"}])
+        # the workers are waited for out of the event loop
+        self.assertIsNotNone(executor.shutdown_thread)
+        self.assertIsNot(executor.shutdown_thread, threading.main_thread())
+
+    def test_client_gone(self):
+        writer = GoneWriter()
+        server = BattleServer(ThreadPoolExecutor(1))
+        asyncio.run(server.answer(b'{"id": 1, "army1": [1, 0, 0], "army2": [0, 0, 0], "formation": 0}', writer))
+        self.assertTrue(writer.closed)
+        self.assertEqual(server.matches, 1)
+        server.executor.shutdown()
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleServer()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,61 @@
+"""
+Tests for battle_trie.py.
+"""
+__author__ = "Zaid"
+
+import random
+import unittest
+
+from army import Army, Cavalry, Soldier
+from battle import Battle
+from battle_trie import BattleTrie
+from result_cache import ResultCache
+
+
+class TestBattleTrie(unittest.TestCase):
+    """ Tests for BattleTrie and Battle.sweep, which must give the results of headless_combat."""
+
+    def setUp(self):
+        self.armies = Army().legal_armies()
+        self.opponents = random.Random(24).sample(self.armies, 10) + [(0, 0, 0), (30, 0, 0), (0, 0, 10), (1, 0, 0)]
+
+    def test_sweep(self):
+        trie = BattleTrie(self.armies)
+        # every prefix of a legal army is a legal army
+        self.assertEqual(trie.nodes, len(self.armies))
+        for opponent in self.opponents:
+            self.assertEqual(trie.sweep(opponent), [Battle().headless_combat(army, opponent, 0)
+                                                    for army in self.armies])
+
+    def test_some_armies(self):
+        armies = [(3, 1, 2), (0, 0, 0), (3, 1, 2), (3, 0, 2), (10, 0, 0)]
+        trie = BattleTrie(armies)
+        self.assertEqual(trie.nodes, 1 + 10 + 1 + 2 + 2)
+        for opponent in self.opponents:
+            self.assertEqual(trie.sweep(opponent), [Battle().headless_combat(army, opponent, 0) for army in armies])
+        self.assertRaises(ValueError, BattleTrie, [(31, 0, 0)])
+        self.assertRaises(ValueError, trie.sweep, (0, 0, 11))
+
+    def test_budget_and_roster(self):
+        roster = (Soldier, Cavalry)
+        armies = Army(45, roster).legal_armies()
+        battle = Battle(budget=45, roster=roster)
+        for opponent in ((20, 5), (0, 15), (45, 0)):
+            self.assertEqual(battle.sweep(armies, opponent, 0),
+                             [battle.headless_combat(army, opponent, 0) for army in armies])
+
+    def test_battle_sweep(self):
+        opponent = self.opponents[0]
+        for formation in (0, 1):
+            expected = [Battle().headless_combat(army, opponent, formation) for army in self.armies]
+            self.assertEqual(Battle().sweep(self.armies, opponent, formation), expected)
+            # fought one army at a time through the cache
+            cache = ResultCache()
+            self.assertEqual(Battle(cache=cache).sweep(self.armies, opponent, formation), expected)
+            self.assertEqual(len(cache), len(self.armies))
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleTrie()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
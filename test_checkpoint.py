@@ -0,0 +1,87 @@
+"""
+Tests for checkpoint.py.
+"""
+__author__ = "Zaid"
+
+import os
+import tempfile
+import unittest
+
+from army import Army
+from battle import Battle
+from checkpoint import read_checkpoint, write_checkpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+    """ Tests for write_checkpoint, read_checkpoint and for resuming battles from them."""
+    PAIRINGS = [((5, 3, 4), (2, 5, 4)), ((30, 0, 0), (0, 0, 10)), ((3, 3, 3), (3, 3, 3))]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.template = os.path.join(self.directory.name, "battle-{round}.ckpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for formation in (0, 1):
+            army1 = Army()
+            army2 = Army()
+            army1.set_army("zaid", (2, 1, 1), formation)
+            army2.set_army("diaz", (1, 1, 0), formation)
+            # move the front of the queue and damage a unit so that the state is not a fresh one
+            if formation == 0:
+                unit = army1.force.pop()
+                unit.lose_life(1)
+                army1.force.push(unit)
+            else:
+                unit = army1.force.serve()
+                unit.gain_experience(2)
+                army1.force.append(unit)
+            path = self.template.format(round=0)
+            write_checkpoint(path, army1, army2, formation, 7)
+            restored = read_checkpoint(path)
+            self.assertEqual((restored.formation, restored.rounds), (formation, 7))
+            for original, copy in ((army1, restored.army1), (army2, restored.army2)):
+                self.assertEqual(copy.name, original.name)
+                self.assertEqual(str(copy), str(original))
+                self.assertEqual(len(copy.force.array), len(original.force.array))
+                if formation == 1:
+                    self.assertEqual((copy.force.front, copy.force.rear), (original.force.front, original.force.rear))
+
+    def test_resume_from_every_round(self):
+        for formation in (0, 1):
+            for army1, army2 in self.PAIRINGS:
+                expected = Battle().headless_combat(army1, army2, formation)
+                battle = Battle(checkpoint_path=self.template, checkpoint_every=1)
+                self.assertEqual(battle.headless_combat(army1, army2, formation), expected)
+                paths = os.listdir(self.directory.name)
+                for name in paths:
+                    self.assertEqual(Battle().resume(os.path.join(self.directory.name, name)), expected)
+                    os.remove(os.path.join(self.directory.name, name))
+
+    def test_resolve_duels(self):
+        # duels are fought round by round, so the checkpoints are those of the plain battle
+        army1, army2 = self.PAIRINGS[0]
+        names = []
+        for resolve_duels in (False, True):
+            battle = Battle(resolve_duels=resolve_duels, checkpoint_path=self.template, checkpoint_every=2)
+            self.assertEqual(battle.headless_combat(army1, army2, 0), Battle().headless_combat(army1, army2, 0))
+            names.append(sorted(os.listdir(self.directory.name)))
+            for name in names[-1]:
+                restored = read_checkpoint(os.path.join(self.directory.name, name))
+                self.assertEqual(name, os.path.basename(self.template.format(round=restored.rounds)))
+                os.remove(os.path.join(self.directory.name, name))
+        self.assertEqual(names[0], names[1])
+
+    def test_not_a_checkpoint(self):
+        path = self.template.format(round=0)
+        with open(path, "wb") as checkpoint_file:
+            checkpoint_file.write(b"\0" * 64)
+        self.assertRaises(ValueError, read_checkpoint, path)
+
+
+if __name__ == '__main__':
+    testtorun = TestCheckpoint()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
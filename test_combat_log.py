@@ -0,0 +1,63 @@
+"""
+Tests for combat_log.py.
+"""
+__author__ = "Zaid"
+
+import os
+import tempfile
+import unittest
+
+from battle import Battle
+from combat_log import CombatLog, CombatRecorder, Event
+
+
+class TestCombatLog(unittest.TestCase):
+    """ Tests for CombatRecorder and CombatLog."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "combat.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, pairings, formation, **options) -> list:
+        with open(self.path, "wb") as log_file:
+            recorder = CombatRecorder(log_file)
+            recorder.BUFFER_RECORDS = 3
+            battle = Battle(recorder=recorder, **options)
+            results = [battle.headless_combat(army1, army2, formation) for army1, army2 in pairings]
+            recorder.flush()
+        return results
+
+    def test_rounds_recorded(self):
+        pairings = [((2, 0, 0), (0, 1, 0)), ((0, 0, 1), (3, 0, 0)), ((0, 0, 0), (1, 0, 0)), ((3, 2, 1), (3, 2, 1))]
+        for formation in (0, 1):
+            # resolving duels would skip rounds, and mirrored battles all of them, so it is not used while recording
+            results = self.record(pairings, formation, resolve_duels=True)
+            self.assertEqual(results, [Battle().headless_combat(a, b, formation) for a, b in pairings])
+            log = CombatLog(self.path)
+            events = list(log)
+            self.assertEqual(len(events), len(log))
+            self.assertEqual(events[-1], log[len(log) - 1])
+            self.assertEqual({event.battle for event in events}, {1, 2, 4})
+            for battle in (1, 2, 4):
+                rounds = [event.round for event in events if event.battle == battle]
+                self.assertEqual(rounds, list(range(1, len(rounds) + 1)))
+            # first round of the first battle: a soldier of speed 1 against a faster archer of speed 3, both hit for 1,
+            # survive, then lose a life, ending the round with 1 life each
+            self.assertEqual(events[0], Event(1, 1, 0, 1, 1, 3, 1, 1, 1, 0, 1, 0))
+            log.close()
+
+    def test_empty_log(self):
+        self.record([((0, 0, 0), (0, 0, 0))], 0)
+        log = CombatLog(self.path)
+        self.assertEqual(len(log), 0)
+        self.assertEqual(list(log), [])
+        self.assertRaises(IndexError, log.__getitem__, 0)
+
+
+if __name__ == '__main__':
+    testtorun = TestCombatLog()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,65 @@
+"""
+Tests for matchups.py.
+"""
+__author__ = "Zaid"
+
+import os
+import tempfile
+import unittest
+
+from army import Army, Cavalry, Soldier
+from battle import Battle
+from matchups import MatchupTable, build_table
+
+
+class TestMatchupTable(unittest.TestCase):
+    """ Tests for build_table and MatchupTable, on the armies costing at most 6 points."""
+
+    def setUp(self):
+        self.armies = [army for army in Army().legal_armies() if army[0] + 2 * army[1] + 3 * army[2] <= 6]
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "matchups.bin")
+        build_table(self.path, self.armies, chunk=7)
+        self.table = MatchupTable(self.path)
+
+    def tearDown(self):
+        self.table.close()
+        self.directory.cleanup()
+
+    def test_len(self):
+        self.assertEqual(len(self.table), len(self.armies))
+        self.assertTrue((2, 2, 0) in self.table)
+        self.assertFalse((7, 0, 0) in self.table)
+
+    def test_lookup_matches_simulation(self):
+        for formation in (0, 1):
+            for army1 in self.armies:
+                for army2 in self.armies:
+                    self.assertEqual(self.table.lookup(army1, army2, formation),
+                                     Battle().headless_combat(army1, army2, formation))
+
+    def test_battle_consults_table(self):
+        battle = Battle(matchups=self.table)
+        self.assertEqual(battle.headless_combat((0, 0, 2), (6, 0, 0), 1),
+                         self.table.lookup((0, 0, 2), (6, 0, 0), 1))
+        with self.assertRaises(ValueError):
+            battle.headless_combat((7, 0, 0), (1, 0, 0), 0)
+        for formation in (-1, 2):
+            with self.assertRaises(ValueError):
+                battle.headless_combat((0, 0, 2), (6, 0, 0), formation)
+        # the table was built for the default budget and roster only
+        self.assertRaises(ValueError, Battle, matchups=self.table, budget=45)
+        self.assertRaises(ValueError, Battle, matchups=self.table, roster=(Soldier, Cavalry))
+        self.assertIs(Battle(matchups=self.table, budget=Army.BUDGET, roster=list(Army.ROSTER)).matchups, self.table)
+
+    def test_not_a_table(self):
+        with open(self.path, "wb") as table_file:
+            table_file.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            MatchupTable(self.path)
+
+
+if __name__ == '__main__':
+    testtorun = TestMatchupTable()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,66 @@
+"""
+Tests for optimizer.py.
+"""
+__author__ = "Zaid"
+
+import random
+import unittest
+
+from army import Archer, Army, Cavalry, Soldier
+from battle import Battle
+from fixtures import Ogre
+from optimizer import Optimizer, best_response
+
+
+class TestOptimizer(unittest.TestCase):
+    """ Tests for Optimizer, whose answer must be the one of trying every legal army."""
+
+    def brute_force(self, opponent, formation, budget=Army.BUDGET, roster=Army.ROSTER):
+        battle = Battle(budget=budget, roster=roster)
+        winners = [army for army in Army(budget, roster).legal_armies()
+                   if battle.headless_combat(army, opponent, formation) == 1]
+        if not winners:
+            return None
+        return min(winners, key=lambda army: (sum(count * unit_type.COST for count, unit_type in zip(army, roster)),
+                                              army))
+
+    def test_against_brute_force(self):
+        legal = Army().legal_armies()
+        opponents = random.Random(23).sample(legal, 12) + [(0, 0, 0), (30, 0, 0), (0, 15, 0), (0, 0, 10)]
+        for formation in (0, 1):
+            for opponent in opponents:
+                optimizer = Optimizer(opponent, formation)
+                army = optimizer.solve()
+                self.assertEqual(army, self.brute_force(opponent, formation))
+                if army is not None:
+                    self.assertEqual(optimizer.cost, sum(count * cost for count, cost in zip(army, (1, 2, 3))))
+                self.assertLess(optimizer.nodes, len(legal))
+
+    def test_budget_and_roster(self):
+        for formation in (0, 1):
+            self.assertEqual(best_response((10, 4, 2), formation, budget=45)[0],
+                             self.brute_force((10, 4, 2), formation, budget=45))
+            self.assertEqual(best_response((5, 3), formation, roster=(Soldier, Cavalry))[0],
+                             self.brute_force((5, 3), formation, roster=(Soldier, Cavalry)))
+
+    def test_roster_losing_more_life(self):
+        # ogres lose 3 life a round, their toughness is not a bound and no branch is cut on it
+        roster = (Soldier, Archer, Ogre)
+        for formation in (0, 1):
+            for opponent in ((0, 0, 10), (0, 3, 4), (11, 0, 6), (4, 0, 4)):
+                self.assertEqual(best_response(opponent, formation, roster=roster)[0],
+                                 self.brute_force(opponent, formation, roster=roster))
+
+    def test_no_winner(self):
+        # a lone soldier only draws against a soldier
+        optimizer = Optimizer((1, 0, 0), 0, budget=1)
+        self.assertIsNone(optimizer.solve())
+        self.assertEqual(optimizer.cost, 2)
+        self.assertGreater(optimizer.nodes, 0)
+        self.assertRaises(ValueError, Optimizer, (31, 0, 0), 0)
+
+
+if __name__ == '__main__':
+    testtorun = TestOptimizer()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
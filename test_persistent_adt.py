@@ -0,0 +1,80 @@
+"""
+Tests for persistent_adt.py.
+"""
+__author__ = "Zaid"
+
+import unittest
+
+from persistent_adt import PersistentQueue, PersistentStack
+from queue_adt import CircularQueue
+from stack_adt import ArrayStack
+
+
+class TestPersistentAdt(unittest.TestCase):
+    """ Tests for PersistentStack and PersistentQueue, which must behave as ArrayStack and CircularQueue without
+        ever changing a version."""
+    LARGE = 10
+
+    def test_stack(self):
+        empty = PersistentStack()
+        self.assertTrue(empty.is_empty())
+        self.assertRaises(Exception, empty.pop)
+        self.assertRaises(Exception, empty.peek)
+        stack = PersistentStack(range(self.LARGE))
+        reference = ArrayStack(self.LARGE)
+        for i in range(self.LARGE):
+            reference.push(i)
+        self.assertEqual(len(stack), self.LARGE)
+        self.assertEqual(list(stack), list(reference))
+        self.assertEqual(str(stack), str(reference))
+        while not reference.is_empty():
+            self.assertEqual(stack.peek(), reference.peek())
+            item, stack = stack.pop()
+            self.assertEqual(item, reference.pop())
+        self.assertTrue(stack.is_empty())
+
+    def test_stack_versions(self):
+        base = PersistentStack([1, 2])
+        pushed = base.push(3)
+        top, popped = base.pop()
+        self.assertEqual((list(base), list(pushed), top, list(popped)), ([2, 1], [3, 2, 1], 2, [1]))
+        # both forks share the cells of base
+        self.assertIs(pushed.top[1], base.top)
+        self.assertIs(popped.top, base.top[1])
+
+    def test_queue(self):
+        empty = PersistentQueue()
+        self.assertTrue(empty.is_empty())
+        self.assertRaises(Exception, empty.serve)
+        self.assertRaises(Exception, empty.peek)
+        queue = PersistentQueue(range(self.LARGE))
+        reference = CircularQueue(self.LARGE)
+        reference.extend(range(self.LARGE))
+        # serve and append again, so that the rear list is reversed several times
+        for i in range(3 * self.LARGE):
+            self.assertEqual(queue.peek(), reference.peek())
+            item, queue = queue.serve()
+            self.assertEqual(item, reference.serve())
+            queue = queue.append(i)
+            reference.append(i)
+            self.assertEqual(len(queue), len(reference))
+            self.assertEqual(list(queue), list(reference))
+        self.assertEqual(str(queue), str(reference))
+
+    def test_queue_versions(self):
+        base = PersistentQueue([1]).append(2).append(3)
+        served_item, served = base.serve()
+        appended = base.append(4)
+        self.assertEqual((served_item, list(served), list(appended), list(base)), (1, [2, 3], [1, 2, 3, 4], [1, 2, 3]))
+        # the rear list of a version is reversed once, serving it again reuses the reversal
+        item, rest = served.serve()
+        self.assertEqual(item, 2)
+        self.assertIsNone(served.rear)
+        self.assertIs(served.serve()[1].front, rest.front)
+        self.assertEqual(list(rest), [3])
+
+
+if __name__ == '__main__':
+    testtorun = TestPersistentAdt()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
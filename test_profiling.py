@@ -0,0 +1,49 @@
+"""
+Tests for profiling.py.
+"""
+__author__ = "Zaid"
+
+import unittest
+
+from battle import Battle, COMBAT, PUSH_BACK, RESULT, TAKE
+from profiling import BattleProfiler
+
+
+class TestBattleProfiler(unittest.TestCase):
+    """ Tests for BattleProfiler."""
+
+    def test_counts(self):
+        profiler = BattleProfiler()
+        battle = Battle(profiler=profiler)
+        self.assertEqual(battle.headless_combat((1, 0, 0), (0, 1, 0), 1), 2)
+        # soldier against archer: both survive the first round, the archer kills the soldier in the second
+        self.assertEqual(profiler.calls, {TAKE: 2, COMBAT: 2, PUSH_BACK: 2, RESULT: 1})
+        self.assertTrue(all(seconds >= 0 for seconds in profiler.nanoseconds.values()))
+        self.assertEqual(profiler.as_dict()[COMBAT]["calls"], 2)
+
+    def test_toggle(self):
+        profiler = BattleProfiler(enabled=False)
+        battle = Battle(profiler=profiler)
+        battle.headless_combat((3, 0, 0), (0, 0, 1), 0)
+        self.assertEqual(sum(profiler.calls.values()), 0)
+        profiler.enable()
+        battle.headless_combat((3, 0, 0), (0, 0, 1), 0)
+        self.assertEqual(profiler.calls[RESULT], 1)
+        profiler.disable()
+        profiler.reset()
+        battle.headless_combat((3, 0, 0), (0, 0, 1), 0)
+        self.assertEqual(sum(profiler.calls.values()), 0)
+
+    def test_prometheus(self):
+        profiler = BattleProfiler()
+        profiler.add(COMBAT, 1500000000)
+        text = profiler.to_prometheus()
+        self.assertIn('battle_phase_calls_total{phase="combat"} 1\n', text)
+        self.assertIn('battle_phase_seconds_total{phase="combat"} 1.5\n', text)
+        self.assertIn("# TYPE battle_phase_seconds_total counter\n", text)
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleProfiler()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,183 @@
+"""
+Tests for queue_adt.py.
+"""
+__author__ = "Maria Garcia de la Banda for the base"+"XXXXX student for"
+
+import io
+import unittest
+
+from queue_adt import CircularQueue
+from referential_array import ArrayR
+
+
+class TestQueue(unittest.TestCase):
+    """ Tests for CircularQueue."""
+    EMPTY = 0
+    ROOMY = 5
+    LARGE = 10
+    CAPACITY = 20
+
+    def setUp(self):
+        self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
+        self.queues = [CircularQueue(self.CAPACITY) for i in range(len(self.lengths))]
+        for queue, length in zip(self.queues, self.lengths):
+            for i in range(length):
+                queue.append(i)
+        self.empty_queue = self.queues[0]
+        self.roomy_queue = self.queues[1]
+        self.large_queue = self.queues[2]
+        #we build empty queues from clear.
+        #this is an indirect way of testing if clear works!
+        #(perhaps not the best)
+        self.clear_queue = self.queues[3]
+        self.clear_queue.clear()
+        self.lengths[3] = 0
+        self.queues[4].clear()
+        self.lengths[4] = 0
+
+    def tearDown(self):
+        for s in self.queues:
+            s.clear()
+
+    def test_init(self):
+        self.assertTrue(self.empty_queue.is_empty())
+        self.assertEqual(len(self.empty_queue), 0)
+            
+    def test_len(self):
+        """ Tests the length of all queues created during setup."""
+        for queue, length in zip(self.queues, self.lengths):
+            self.assertEqual(len(queue), length)
+            
+    def test_is_empty_add(self):
+        """ Tests queues that have been created empty/non-empty."""
+        self.assertTrue(self.empty_queue.is_empty())
+        self.assertFalse(self.roomy_queue.is_empty())
+        self.assertFalse(self.large_queue.is_empty())
+    
+    def test_is_empty_clear(self):
+        """ Tests queues that have been cleared."""
+        for queue in self.queues:
+            queue.clear()
+            self.assertTrue(queue.is_empty())
+            
+    def test_is_empty_serve(self):
+        """ Tests queues that have been served completely."""
+        for queue in self.queues:
+            #we empty the queue
+            try:
+                while True:
+                    was_empty = queue.is_empty()
+                    queue.serve()
+                    #if we have served without raising an assertion,
+                    #then the queue was not empty.
+                    self.assertFalse(was_empty)
+            except:
+                self.assertTrue(queue.is_empty())
+            
+    def test_is_full_add(self):
+        """ Tests queues that have been created not full."""
+        self.assertFalse(self.empty_queue.is_full())
+        self.assertFalse(self.roomy_queue.is_full())
+        self.assertFalse(self.large_queue.is_full())
+        
+    def test_append_and_serve(self):
+        for queue in self.queues:
+            nitems = self.ROOMY
+            for i in range(nitems):
+                queue.append(i)
+            for i in range(nitems):
+                self.assertEqual(queue.serve(), i)
+                
+    def test_clear(self):
+        for queue in self.queues:
+            queue.clear()
+            self.assertEqual(len(queue), 0)
+            self.assertTrue(queue.is_empty())
+
+    def test_resizable(self):
+        queue = CircularQueue(3, resizable=True)
+        # wrap around before growing, so that the elements are moved in order
+        queue.append(-2)
+        queue.append(-1)
+        queue.serve()
+        queue.serve()
+        for i in range(self.CAPACITY):
+            queue.append(i)
+            self.assertFalse(queue.is_full())
+        self.assertEqual(len(queue), self.CAPACITY)
+        for i in range(self.CAPACITY):
+            self.assertEqual(queue.serve(), i)
+        self.assertTrue(queue.is_empty())
+        self.assertEqual(len(queue.array), 3)
+        queue.append(self.CAPACITY)
+        self.assertEqual(queue.serve(), self.CAPACITY)
+
+    def test_extend_and_serve_many(self):
+        for backend in (ArrayR.LIST, ArrayR.CTYPES, ArrayR.TYPED):
+            queue = CircularQueue(self.LARGE, backend=backend)
+            # move front and rear close to the end of the array, so that extend wraps around
+            queue.extend(range(self.LARGE - 2))
+            self.assertEqual(queue.serve_many(self.LARGE - 3), list(range(self.LARGE - 3)))
+            queue.extend(range(self.ROOMY))
+            self.assertEqual(len(queue), self.ROOMY + 1)
+            self.assertEqual(queue.serve_many(self.ROOMY + 1), [self.LARGE - 3] + list(range(self.ROOMY)))
+            self.assertRaises(Exception, queue.serve_many, 1)
+            queue.append(1)
+            self.assertRaises(ValueError, queue.serve_many, -2)
+            self.assertEqual(len(queue), 1)
+            self.assertEqual(queue.serve_many(0), [])
+            self.assertEqual(queue.serve(), 1)
+            self.assertRaises(Exception, queue.extend, range(self.LARGE + 1))
+            growing = CircularQueue(3, resizable=True, backend=backend)
+            growing.append(-1)
+            growing.append(-1)
+            growing.serve_many(2)
+            growing.extend(range(self.LARGE))
+            growing.extend(range(self.LARGE))
+            self.assertEqual(growing.serve_many(2 * self.LARGE), 2 * list(range(self.LARGE)))
+            self.assertTrue(growing.is_empty())
+
+    def test_iter_and_str(self):
+        self.large_queue.serve()
+        self.large_queue.append(self.LARGE)
+        self.assertEqual(list(self.large_queue), list(range(1, self.LARGE+1)))
+        self.assertEqual(list(self.empty_queue), [])
+        self.assertEqual(str(self.large_queue), ",".join(str(i) for i in range(1, self.LARGE+1)))
+        self.assertEqual(str(self.empty_queue), "")
+        output = io.StringIO()
+        self.large_queue.write_to(output)
+        self.assertEqual(output.getvalue(), str(self.large_queue))
+        wrapped = CircularQueue(3)
+        wrapped.extend([0, 1])
+        wrapped.serve()
+        wrapped.extend([2, 3])
+        self.assertEqual(list(wrapped), [1, 2, 3])
+
+    def test_backends(self):
+        for backend in (ArrayR.LIST, ArrayR.CTYPES, ArrayR.TYPED):
+            queue = CircularQueue(2, resizable=True, backend=backend)
+            for i in range(self.CAPACITY):
+                queue.append(i)
+            self.assertEqual(queue.array.backend, backend)
+            for i in range(self.CAPACITY):
+                self.assertEqual(queue.serve(), i)
+
+    def test_peek(self):
+        self.assertRaises(Exception, self.empty_queue.peek)
+        self.assertEqual(self.large_queue.peek(), 0)
+        self.assertEqual(len(self.large_queue), self.LARGE)
+        self.large_queue.serve()
+        self.assertEqual(self.large_queue.peek(), 1)
+
+    def test_fixed_is_full(self):
+        queue = CircularQueue(2)
+        queue.append(0)
+        queue.append(1)
+        self.assertTrue(queue.is_full())
+        self.assertRaises(Exception, queue.append, 2)
+
+
+if __name__ == '__main__':
+    testtorun = TestQueue()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
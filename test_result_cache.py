@@ -0,0 +1,73 @@
+"""
+Tests for result_cache.py.
+"""
+__author__ = "Zaid"
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from battle import Battle
+from result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    """ Tests for ResultCache and for Battle with a cache."""
+
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2)
+        cache.put((1, 0, 0), (0, 1, 0), 0, 2)
+        cache.put((2, 0, 0), (0, 1, 0), 0, 1)
+        # using the first result makes the second one the least recently used
+        self.assertEqual(cache.get((1, 0, 0), (0, 1, 0), 0), 2)
+        cache.put((3, 0, 0), (0, 1, 0), 0, 1)
+        self.assertIsNone(cache.get((2, 0, 0), (0, 1, 0), 0))
+        self.assertEqual(cache.get((1, 0, 0), (0, 1, 0), 0), 2)
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 1, "size": 2, "hit_rate": 2 / 3})
+        self.assertRaises(ValueError, ResultCache, 0)
+
+    def test_swapped_armies(self):
+        cache = ResultCache()
+        cache.put((0, 0, 10), (30, 0, 0), 1, 1)
+        self.assertEqual(cache.get((30, 0, 0), (0, 0, 10), 1), 2)
+        self.assertEqual(cache.get((0, 0, 10), (30, 0, 0), 1), 1)
+        self.assertIsNone(cache.get((0, 0, 10), (30, 0, 0), 0))
+        self.assertEqual(len(cache), 1)
+
+    def test_battle_modes(self):
+        cache = ResultCache()
+        battle = Battle(cache=cache)
+        pairings = [((5, 3, 4), (2, 5, 4)), ((2, 5, 4), (5, 3, 4)), ((30, 0, 0), (0, 0, 10))]
+        for formation in (0, 1):
+            for army1, army2 in pairings:
+                self.assertEqual(battle.headless_combat(army1, army2, formation),
+                                 Battle().headless_combat(army1, army2, formation))
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+        # the armies read from stdin are cached by their composition too
+        for formation, mode in ((0, battle.gladiatorial_combat), (1, battle.fairer_combat)):
+            with mock.patch("builtins.input", side_effect=["5 3 4", "2 5 4"]), mock.patch("builtins.print"):
+                self.assertEqual(mode("zaid", "diaz"), Battle().headless_combat((5, 3, 4), (2, 5, 4), formation))
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_shelf(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results")
+            cache = ResultCache(maxsize=1, path=path)
+            Battle(cache=cache).headless_combat((5, 3, 4), (2, 5, 4), 0)
+            Battle(cache=cache).headless_combat((3, 3, 3), (2, 5, 4), 0)
+            # evicted from memory but still on the shelf
+            self.assertEqual(cache.get((5, 3, 4), (2, 5, 4), 0), Battle().headless_combat((5, 3, 4), (2, 5, 4), 0))
+            cache.close()
+
+            reopened = ResultCache(path=path)
+            self.assertEqual(reopened.get((2, 5, 4), (3, 3, 3), 0), Battle().headless_combat((2, 5, 4), (3, 3, 3), 0))
+            self.assertEqual(reopened.stats()["hits"], 1)
+            reopened.close()
+
+
+if __name__ == '__main__':
+    testtorun = TestResultCache()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,111 @@
+"""
+Tests for rle_adt.py.
+"""
+__author__ = "Zaid"
+
+import unittest
+
+from army import Archer, Cavalry, Soldier
+from queue_adt import CircularQueue
+from rle_adt import Run, RunQueue, RunStack
+from stack_adt import ArrayStack
+
+
+def units(states):
+    """Returns new units in the given (type, life, experience) states."""
+    return [Run(unit_type, life, experience, 1).unit() for unit_type, life, experience in states]
+
+
+def state(unit):
+    """Returns the (type, life, experience) state of unit."""
+    return type(unit), unit.get_life(), unit.get_experience()
+
+
+class TestRunAdt(unittest.TestCase):
+    """ Tests for RunStack and RunQueue, which must behave as ArrayStack and CircularQueue of the same units."""
+    STATES = [(Soldier, 3, 0), (Soldier, 3, 0), (Archer, 3, 0), (Soldier, 3, 0), (Soldier, 2, 1), (Soldier, 2, 1),
+              (Cavalry, 4, 0), (Cavalry, 4, 0), (Cavalry, 4, 0)]
+
+    def test_stack(self):
+        stack = RunStack()
+        reference = ArrayStack(len(self.STATES))
+        self.assertTrue(stack.is_empty())
+        self.assertFalse(stack.is_full())
+        for unit in units(self.STATES):
+            stack.push(unit)
+        for unit in units(self.STATES):
+            reference.push(unit)
+        self.assertEqual(len(stack), len(self.STATES))
+        self.assertEqual(len(stack.runs), 5)
+        self.assertEqual(str(stack), str(reference))
+        self.assertEqual([state(unit) for unit in stack], [state(unit) for unit in reference])
+        while not reference.is_empty():
+            self.assertEqual(state(stack.peek()), state(reference.peek()))
+            self.assertEqual(state(stack.pop()), state(reference.pop()))
+        self.assertTrue(stack.is_empty())
+        self.assertRaises(Exception, stack.pop)
+        self.assertRaises(Exception, stack.peek)
+
+    def test_queue(self):
+        queue = RunQueue()
+        reference = CircularQueue(len(self.STATES))
+        self.assertTrue(queue.is_empty())
+        self.assertFalse(queue.is_full())
+        for unit in units(self.STATES):
+            queue.append(unit)
+            reference.append(unit)
+        self.assertEqual(len(queue), len(self.STATES))
+        self.assertEqual(len(queue.runs), 5)
+        self.assertEqual(str(queue), str(reference))
+        self.assertEqual([state(unit) for unit in queue], [state(unit) for unit in reference])
+        # serve and append again, so that the runs wrap around the circular array
+        for _ in range(2 * len(self.STATES)):
+            self.assertEqual(state(queue.peek()), state(reference.peek()))
+            unit = reference.serve()
+            self.assertEqual(state(queue.serve()), state(unit))
+            queue.append(unit)
+            reference.append(unit)
+            self.assertEqual(str(queue), str(reference))
+        while not reference.is_empty():
+            self.assertEqual(state(queue.serve()), state(reference.serve()))
+        self.assertIsNone(queue.last)
+        self.assertRaises(Exception, queue.serve)
+        self.assertRaises(Exception, queue.peek)
+
+    def test_runs(self):
+        stack = RunStack()
+        stack.push_run(Soldier, 3, 0, 4)
+        stack.push_run(Soldier, 3, 0, 2)
+        stack.push_run(Soldier, 3, 0, 0)
+        self.assertEqual((len(stack), len(stack.runs), stack.peek_run().count), (6, 1, 6))
+        stack.take(5)
+        self.assertEqual((len(stack), len(stack.runs)), (1, 1))
+        stack.take(1)
+        self.assertTrue(stack.runs.is_empty())
+
+        queue = RunQueue()
+        queue.append_run(Cavalry, 4, 0, 3)
+        queue.append_run(Archer, 3, 0, 2)
+        queue.append_run(Archer, 3, 0, 2)
+        self.assertEqual((len(queue), len(queue.runs), queue.peek_run().count), (7, 2, 3))
+        queue.take(3)
+        self.assertEqual(queue.peek_run().unit_type, Archer)
+        queue.append_run(Archer, 3, 0, 1)
+        self.assertEqual((len(queue), len(queue.runs), queue.peek_run().count), (5, 1, 5))
+        queue.clear()
+        self.assertTrue(queue.is_empty())
+        self.assertIsNone(queue.last)
+
+    def test_copies(self):
+        # units handed out are copies, changing them leaves the runs as they are
+        stack = RunStack()
+        stack.push_run(Soldier, 3, 0, 2)
+        stack.peek().life = 0
+        self.assertEqual(stack.peek_run().life, 3)
+        self.assertEqual(str(Run(Archer, 3, 0, 2)), ",".join([str(Run(Archer, 3, 0, 1).unit())] * 2))
+
+
+if __name__ == '__main__':
+    testtorun = TestRunAdt()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,161 @@
+"""
+Tests for stack_adt.py.
+"""
+__author__ = "Maria Garcia de la Banda for the base"+"XXXXX student for"
+
+import io
+import unittest
+
+from referential_array import ArrayR
+from stack_adt import ArrayStack
+
+
+class TestStack(unittest.TestCase):
+    """ Tests for ArrayStack."""
+    EMPTY = 0
+    ROOMY = 5
+    LARGE = 10
+    CAPACITY = 20
+
+    def setUp(self):
+        self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
+        self.stacks = [ArrayStack(self.CAPACITY) for i in range(len(self.lengths))]
+        for stack, length in zip(self.stacks, self.lengths):
+            for i in range(length):
+                stack.push(i)
+        self.empty_stack = self.stacks[0]
+        self.roomy_stack = self.stacks[1]
+        self.large_stack = self.stacks[2]
+        #we build empty stacks from clear.
+        #this is an indirect way of testing if clear works!
+        #(perhaps not the best)
+        self.clear_stack = self.stacks[3]
+        self.clear_stack.clear()
+        self.lengths[3] = 0
+        self.stacks[4].clear()
+        self.lengths[4] = 0
+
+    def tearDown(self):
+        for s in self.stacks:
+            s.clear()
+
+    def test_init(self):
+        self.assertTrue(self.empty_stack.is_empty())
+        self.assertEqual(len(self.empty_stack), 0)
+            
+    def test_len(self):
+        """ Tests the length of all stacks created during setup."""
+        for stack, length in zip(self.stacks, self.lengths):
+            self.assertEqual(len(stack), length)
+            
+    def test_is_empty_add(self):
+        """ Tests stacks that have been created empty/non-empty."""
+        self.assertTrue(self.empty_stack.is_empty())
+        self.assertFalse(self.roomy_stack.is_empty())
+        self.assertFalse(self.large_stack.is_empty())
+    
+    def test_is_empty_clear(self):
+        """ Tests stacks that have been cleared."""
+        for stack in self.stacks:
+            stack.clear()
+            self.assertTrue(stack.is_empty())
+            
+    def test_is_empty_pop(self):
+        """ Tests stacks that have been popped completely."""
+        for stack in self.stacks:
+            #we empty the stack
+            try:
+                while True:
+                    was_empty = stack.is_empty()
+                    stack.pop()
+                    #if we have popped without raising an assertion,
+                    #then the stack was not empty.
+                    self.assertFalse(was_empty)
+            except:
+                self.assertTrue(stack.is_empty())
+            
+    def test_is_full_add(self):
+        """ Tests stacks that have been created not full."""
+        self.assertFalse(self.empty_stack.is_full())
+        self.assertFalse(self.roomy_stack.is_full())
+        self.assertFalse(self.large_stack.is_full())
+        
+    def test_push_and_pop(self):
+        for stack in self.stacks:
+            nitems = self.ROOMY
+            for i in range(nitems):
+                stack.push(i)
+            for i in range(nitems-1, -1, -1):
+                self.assertEqual(stack.pop(), i)
+                
+    def test_clear(self):
+        for stack in self.stacks:
+            stack.clear()
+            self.assertEqual(len(stack), 0)
+            self.assertTrue(stack.is_empty())
+
+    def test_resizable(self):
+        stack = ArrayStack(2, resizable=True)
+        for i in range(self.CAPACITY):
+            stack.push(i)
+            self.assertFalse(stack.is_full())
+        self.assertEqual(len(stack), self.CAPACITY)
+        self.assertGreaterEqual(len(stack.array), self.CAPACITY)
+        for i in range(self.CAPACITY-1, -1, -1):
+            self.assertEqual(stack.pop(), i)
+        self.assertEqual(len(stack.array), 2)
+
+    def test_push_many_and_pop_many(self):
+        for backend in (ArrayR.LIST, ArrayR.CTYPES, ArrayR.TYPED):
+            stack = ArrayStack(self.CAPACITY, backend=backend)
+            stack.push(-1)
+            stack.push_many(range(self.ROOMY))
+            self.assertEqual(len(stack), self.ROOMY + 1)
+            self.assertEqual(stack.peek(), self.ROOMY - 1)
+            self.assertEqual(stack.pop_many(self.ROOMY), list(range(self.ROOMY-1, -1, -1)))
+            self.assertEqual(stack.pop(), -1)
+            self.assertRaises(Exception, stack.push_many, range(self.CAPACITY + 1))
+            self.assertRaises(Exception, stack.pop_many, 1)
+            stack.push(1)
+            self.assertRaises(ValueError, stack.pop_many, -2)
+            self.assertEqual(len(stack), 1)
+            self.assertEqual(stack.pop_many(0), [])
+            growing = ArrayStack(1, resizable=True, backend=backend)
+            growing.push_many(range(self.LARGE))
+            growing.push_many(range(self.LARGE))
+            self.assertEqual(growing.pop_many(2 * self.LARGE - 1), list(range(self.LARGE-1, -1, -1)) +
+                             list(range(self.LARGE-1, 0, -1)))
+            self.assertEqual(growing.pop(), 0)
+
+    def test_iter_and_str(self):
+        self.assertEqual(list(self.large_stack), list(range(self.LARGE-1, -1, -1)))
+        self.assertEqual(list(self.empty_stack), [])
+        self.large_stack.pop()
+        self.assertEqual(str(self.large_stack), ",".join(str(i) for i in range(self.LARGE-2, -1, -1)))
+        self.assertEqual(str(self.empty_stack), "")
+        output = io.StringIO()
+        self.large_stack.write_to(output)
+        self.assertEqual(output.getvalue(), str(self.large_stack))
+
+    def test_backends(self):
+        for backend in (ArrayR.LIST, ArrayR.CTYPES, ArrayR.TYPED):
+            stack = ArrayStack(2, resizable=True, backend=backend)
+            for i in range(self.CAPACITY):
+                stack.push(i)
+            self.assertEqual(stack.array.backend, backend)
+            for i in range(self.CAPACITY-1, -1, -1):
+                self.assertEqual(stack.pop(), i)
+        self.assertRaises(ValueError, ArrayR, 1, "unknown")
+
+    def test_fixed_is_full(self):
+        stack = ArrayStack(2)
+        stack.push(0)
+        stack.push(1)
+        self.assertTrue(stack.is_full())
+        self.assertRaises(Exception, stack.push, 2)
+
+
+if __name__ == '__main__':
+    testtorun = TestStack()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,39 @@
+"""
+Tests for tournament.py.
+"""
+__author__ = "Zaid"
+
+import unittest
+
+from tournament import round_robin, shards
+
+
+class TestTournament(unittest.TestCase):
+    """ Tests for round_robin."""
+    ARMIES = [(30, 0, 0), (0, 15, 0), (0, 0, 10), (10, 4, 4), (3, 3, 3), (0, 0, 0)]
+
+    def test_shards_cover_all_rows(self):
+        for count in (0, 1, 2, 7, 50):
+            rows = [row for first, stop in shards(count, 10) for row in range(first, stop)]
+            self.assertEqual(rows, list(range(count)))
+
+    def test_counts(self):
+        standings = round_robin(self.ARMIES, 0, processes=1, pairings_per_shard=4)
+        battles = len(self.ARMIES) - 1
+        for i in range(len(self.ARMIES)):
+            self.assertEqual(standings.wins[i] + standings.draws[i] + standings.losses[i], battles)
+        self.assertEqual(sum(standings.wins), sum(standings.losses))
+
+    def test_pool_matches_serial(self):
+        for formation in (0, 1):
+            serial = round_robin(self.ARMIES, formation, processes=1)
+            pooled = round_robin(self.ARMIES, formation, processes=2, pairings_per_shard=3)
+            self.assertEqual((pooled.wins, pooled.draws, pooled.losses),
+                             (serial.wins, serial.draws, serial.losses))
+            self.assertEqual(pooled.ranking(), serial.ranking())
+
+
+if __name__ == '__main__':
+    testtorun = TestTournament()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,165 @@
+"""
+Tests for unit_rules.py.
+"""
+__author__ = "Zaid"
+
+import unittest
+
+from army import Archer, Cavalry, Fighter, Soldier
+from battle import Battle
+from unit_rules import DAMAGE_LIMIT, ROWS, UnitRules, loses_one_at_most, stats, unit_rules
+
+
+class Pikeman(Fighter):
+    """Unit type unknown to the tables until it first fights: loses 2 life to damage of at least 2 + experience."""
+    __slots__ = ()
+    COST = 2
+
+    def __init__(self) -> None:
+        super().__init__(5, 0)
+
+    def get_speed(self) -> int:
+        return 2
+
+    def get_attack_damage(self) -> int:
+        return 2 + self.get_experience()
+
+    def defend(self, damage: int) -> None:
+        if damage >= 2 + self.get_experience():
+            self.lose_life(2)
+
+    def __str__(self) -> str:
+        return f"Pikeman's life = {self.get_life()} and experience = {self.get_experience()}"
+
+
+class Cursed(Pikeman):
+    """Unit type whose defence is not a threshold on the damage."""
+    __slots__ = ()
+
+    def defend(self, damage: int) -> None:
+        if damage % 2 == 1:
+            self.lose_life(1)
+
+
+class Gapped(Pikeman):
+    """Unit type losing 1 life to damage of at least 2, except to a damage of exactly 7."""
+    __slots__ = ()
+
+    def defend(self, damage: int) -> None:
+        if damage >= 2 and damage != 7:
+            self.lose_life(1)
+
+
+class Frenzied(Pikeman):
+    """Unit type that gets faster and hits harder as it loses life."""
+    __slots__ = ()
+
+    def get_speed(self) -> int:
+        return 7 - self.get_life()
+
+    def get_attack_damage(self) -> int:
+        return 7 - self.get_life()
+
+
+class Giant(Pikeman):
+    """Unit type hitting harder than any damage probed."""
+    __slots__ = ()
+
+    def get_attack_damage(self) -> int:
+        return DAMAGE_LIMIT + 1
+
+
+class Immortal(Pikeman):
+    """Unit type that never loses life."""
+    __slots__ = ()
+
+    def defend(self, damage: int) -> None:
+        pass
+
+
+class TestUnitRules(unittest.TestCase):
+    """ Tests for UnitRules, whose rows must agree with the methods of the unit types."""
+
+    def assertRowsAgree(self, unit_type, experiences) -> None:
+        for experience in experiences:
+            unit = unit_type()
+            unit.experience = experience
+            speed, attack, threshold, lost = stats(unit)
+            self.assertEqual(speed, unit.get_speed())
+            self.assertEqual(attack, unit.get_attack_damage())
+            for damage in range(0, 3 * experience + 4):
+                defender = unit_type()
+                defender.experience = experience
+                defender.defend(damage)
+                self.assertEqual(unit.life - defender.life, lost if damage >= threshold else 0)
+
+    def test_rows(self):
+        for unit_type in (Soldier, Archer, Cavalry, Pikeman):
+            self.assertRowsAgree(unit_type, range(3 * ROWS))
+        self.assertEqual(unit_rules(Soldier).row(2), (-1, 3, 3, 1))
+        self.assertEqual(unit_rules(Archer).row(2), (3, 5, 0, 1))
+        self.assertEqual(unit_rules(Cavalry).row(3), (5, 4, 2, 1))
+
+    def test_extend(self):
+        rules = UnitRules(Cavalry, rows=2)
+        self.assertEqual(len(rules.rows), 2)
+        self.assertEqual(rules.row(9), (11, 10, 5, 1))
+        self.assertGreaterEqual(len(rules.rows), 10)
+        self.assertIs(unit_rules(Cavalry), unit_rules(Cavalry))
+
+    def test_defence(self):
+        self.assertEqual(UnitRules(Immortal).row(0), (2, 2, float("inf"), 0))
+        for unit_type in (Cursed, Gapped, Frenzied):
+            self.assertEqual(UnitRules(unit_type).rows, [None] * ROWS)
+            self.assertFalse(loses_one_at_most((Soldier, unit_type)))
+        # an attack damage over the limit could meet an untried damage
+        self.assertIsNone(UnitRules(Giant).row(0))
+
+    def test_methods_without_rows(self):
+        # units without a row fight through their methods, as if there were no tables
+        for unit_type in (Cursed, Gapped, Frenzied):
+            for opponent_type in (Soldier, Archer, Cavalry, Pikeman, unit_type):
+                for life in range(1, 6):
+                    for experience in range(4):
+                        for damage_taken in (0, 1):
+                            unit, expected_unit = unit_type(), unit_type()
+                            opponent, expected_opponent = opponent_type(), opponent_type()
+                            for fighter in (unit, expected_unit):
+                                fighter.life, fighter.experience = life, experience
+                            for fighter in (opponent, expected_opponent):
+                                fighter.experience = experience + damage_taken
+                            Battle().combat(unit, opponent)
+                            self.dispatch(expected_unit, expected_opponent)
+                            self.assertEqual((unit.life, opponent.life), (expected_unit.life, expected_opponent.life))
+
+    @staticmethod
+    def dispatch(U1, U2):
+        if U1.get_speed() > U2.get_speed():
+            U2.defend(U1.get_attack_damage())
+            if U2.is_alive():
+                U1.defend(U2.get_attack_damage())
+        elif U2.get_speed() > U1.get_speed():
+            U1.defend(U2.get_attack_damage())
+            if U1.is_alive():
+                U2.defend(U1.get_attack_damage())
+        else:
+            U1.defend(U2.get_attack_damage())
+            U2.defend(U1.get_attack_damage())
+
+    def test_new_type_in_battle(self):
+        # a fresh cavalry is too weak to hurt a pikeman, a soldier of experience 2 takes 2 life from one
+        pikeman = Pikeman()
+        cavalry = Cavalry()
+        Battle().combat(pikeman, cavalry)
+        self.assertEqual((pikeman.life, cavalry.life), (5, 3))
+        pikeman.experience = 1
+        soldier = Soldier()
+        soldier.experience = 2
+        Battle().combat(soldier, pikeman)
+        self.assertEqual((soldier.life, pikeman.life), (2, 3))
+
+
+if __name__ == '__main__':
+    testtorun = TestUnitRules()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
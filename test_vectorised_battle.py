@@ -0,0 +1,56 @@
+"""
+Tests for vectorised_battle.py.
+"""
+__author__ = "Zaid"
+
+import random
+import unittest
+
+from battle import Battle
+from vectorised_battle import vectorised_combat
+
+
+class TestVectorisedCombat(unittest.TestCase):
+    """ Checks the kernel against Battle on random legal armies."""
+    BATTLES = 300
+
+    def setUp(self):
+        rng = random.Random(2021)
+        self.armies = []
+        while len(self.armies) < 2 * self.BATTLES:
+            soldiers, archers, cavalry = rng.randint(0, 30), rng.randint(0, 15), rng.randint(0, 10)
+            if soldiers + 2 * archers + 3 * cavalry <= 30:
+                self.armies.append((soldiers, archers, cavalry))
+        self.armies1 = self.armies[:self.BATTLES]
+        self.armies2 = self.armies[self.BATTLES:]
+
+    def test_matches_battle(self):
+        for formation in (0, 1):
+            expected = [Battle().headless_combat(a, b, formation) for a, b in zip(self.armies1, self.armies2)]
+            self.assertEqual(vectorised_combat(self.armies1, self.armies2, formation).tolist(), expected)
+
+    def test_empty_armies(self):
+        for formation in (0, 1):
+            self.assertEqual(vectorised_combat([(0, 0, 0), (1, 0, 0), (0, 0, 0)],
+                                               [(0, 0, 0), (0, 0, 0), (0, 1, 0)], formation).tolist(), [0, 1, 2])
+
+    def test_mismatched_lengths(self):
+        with self.assertRaises(ValueError):
+            vectorised_combat([(1, 0, 0)], [], 0)
+
+    def test_illegal_armies(self):
+        # the same armies as Battle.headless_combat rejects
+        for illegal in ((31, 0, 0), (0, 0, 11), (-1, 0, 0), (1, 0)):
+            with self.assertRaises(ValueError):
+                Battle().headless_combat(illegal, (1, 0, 0), 0)
+            for armies1, armies2 in (([illegal], [(1, 0, 0)]), ([(1, 0, 0)], [illegal])):
+                with self.assertRaises(ValueError):
+                    vectorised_combat(armies1, armies2, 0)
+        self.assertEqual(vectorised_combat([(45, 0, 0)], [(0, 0, 15)], 1, budget=45).tolist(),
+                         [Battle(budget=45).headless_combat((45, 0, 0), (0, 0, 15), 1)])
+
+
+if __name__ == '__main__':
+    testtorun = TestVectorisedCombat()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,134 @@
+"""
+Round-robin tournaments over many armies. The pairings are split into shards of consecutive rows of the pairing
+matrix and resolved by a pool of worker processes. Armies travel to the workers once, as (soldiers, archers, cavalry)
+tuples, and every shard comes back as per-army win/draw/loss counts that are merged into the standings.
+"""
+__author__ = "Zaid"
+
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from battle import Battle
+
+Units = Tuple[int, int, int]
+Shard = Tuple[int, int]
+Counts = Tuple[List[int], List[int], List[int]]
+
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+# set in every worker by _init_worker so that shards only carry row numbers
+_armies: Sequence[Units] = ()
+_formation = 0
+
+
+class Standings:
+    """ Results of a tournament.
+
+    Attributes:
+         armies (Sequence[Units]): armies that took part, standings are indexed like them
+         wins (List[int]): number of battles won by each army
+         draws (List[int]): number of battles drawn by each army
+         losses (List[int]): number of battles lost by each army
+    """
+
+    def __init__(self, armies: Sequence[Units]) -> None:
+        """ Initialises every count to 0.
+        :complexity: O(n) where n is the number of armies
+        """
+        self.armies = armies
+        self.wins = [0] * len(armies)
+        self.draws = [0] * len(armies)
+        self.losses = [0] * len(armies)
+
+    def merge(self, counts: Counts) -> None:
+        """ Adds the (wins, draws, losses) lists of a shard, indexed like armies, to these counts.
+        :complexity: O(n) where n is the number of armies
+        """
+        wins, draws, losses = counts
+        for i in range(len(self.armies)):
+            self.wins[i] += wins[i]
+            self.draws[i] += draws[i]
+            self.losses[i] += losses[i]
+
+    def points(self, index: int) -> int:
+        """ Returns the points of the army at index, WIN_POINTS per win and DRAW_POINTS per draw."""
+        return WIN_POINTS * self.wins[index] + DRAW_POINTS * self.draws[index]
+
+    def ranking(self) -> List[int]:
+        """ Returns the indices of the armies from the most to the fewest points, ties keep the original order.
+        :complexity: O(n*log(n)) where n is the number of armies
+        """
+        return sorted(range(len(self.armies)), key=lambda index: -self.points(index))
+
+
+def _init_worker(armies: Sequence[Units], formation: int) -> None:
+    """ Receives the armies once per worker process."""
+    global _armies, _formation
+    _armies = armies
+    _formation = formation
+
+
+def _play_shard(shard: Shard) -> Counts:
+    """ Plays every pairing (i, j) with first <= i < stop and j > i. Only the counts are sent back, not the armies.
+    :complexity: O(p*n) where p is the number of pairings of the shard and n the size of the largest army
+    """
+    first, stop = shard
+    battle = Battle()
+    standings = Standings(_armies)
+    for i in range(first, stop):
+        for j in range(i + 1, len(_armies)):
+            outcome = battle.headless_combat(_armies[i], _armies[j], _formation)
+            if outcome == 0:
+                standings.draws[i] += 1
+                standings.draws[j] += 1
+            elif outcome == 1:
+                standings.wins[i] += 1
+                standings.losses[j] += 1
+            else:
+                standings.losses[i] += 1
+                standings.wins[j] += 1
+    return standings.wins, standings.draws, standings.losses
+
+
+def shards(count: int, pairings_per_shard: int) -> Iterator[Shard]:
+    """ Splits the rows of the pairing matrix of count armies into ranges holding about pairings_per_shard pairings.
+    :complexity: O(count)
+    """
+    first = 0
+    pairings = 0
+    for row in range(count):
+        pairings += count - 1 - row
+        if pairings >= pairings_per_shard:
+            yield first, row + 1
+            first = row + 1
+            pairings = 0
+    if first < count:
+        yield first, count
+
+
+def round_robin(armies: Sequence[Units], formation: int, processes: Optional[int] = None,
+                pairings_per_shard: int = 2000) -> Standings:
+    """
+    Plays every army against every other army once in the given formation.
+    :param armies: armies taking part as (soldiers, archers, cavalry)
+    :param formation: The formation of all the armies (0 for Stack, 1 for Queue)
+    :param processes: number of worker processes, one per CPU by default. With 1 the tournament runs in this process.
+    :param pairings_per_shard: approximate number of battles sent to a worker at a time
+    :raises ValueError: if an army is not legal
+    :complexity: O(n^2*m) where n is the number of armies and m the size of the largest army, divided among the
+                 worker processes
+    """
+    armies = [tuple(army) for army in armies]
+    standings = Standings(armies)
+    work = shards(len(armies), pairings_per_shard)
+    if processes == 1:
+        _init_worker(armies, formation)
+        for partial in map(_play_shard, work):
+            standings.merge(partial)
+        return standings
+
+    with Pool(processes, initializer=_init_worker, initargs=(armies, formation)) as pool:
+        for partial in pool.imap_unordered(_play_shard, work):
+            standings.merge(partial)
+    return standings
@@ -0,0 +1,134 @@
+"""
+Compiled rules of the unit types. The speed, attack damage and defence of a unit usually only depend on its type
+and its experience, so the rules of a type are tabulated once, one row per experience, by probing units of the type
+built with that experience and every life: get_speed, get_attack_damage, and defend with every damage up to
+DAMAGE_LIMIT to find the smallest damage that costs life and how much it costs. Battle.combat reads a row instead of
+calling the methods of both units. Any subclass of Fighter gets its table the first time one of its units fights,
+and rows for more experience are added as units gain it. An experience whose rules do not fit in a row has no row,
+and units with it fight through their methods. The unit tests are in test_unit_rules.py.
+"""
+from __future__ import annotations
+
+__author__ = "Zaid"
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Sequence, Tuple, Type
+    from army import Fighter
+
+    # speed, attack damage, smallest damage that costs life, life it costs
+    Row = Tuple[int, int, float, int]
+
+# rows tabulated when a table is created, units seldom gain more experience in a battle
+ROWS = 8
+# largest damage probed, every damage up to it is tried, rows with a larger attack damage are not tabulated
+DAMAGE_LIMIT = 2 ** 10
+
+
+class UnitRules:
+    """ Rules of a unit type, tabulated by experience.
+
+    Attributes:
+         unit_type (Type[Fighter]): the unit type
+         rows (List[Optional[Row]]): (speed, attack damage, defence threshold, life lost) of a unit of every
+                                     experience. The unit loses life when it takes at least the threshold in damage,
+                                     an infinite threshold if no damage costs it life. None for an experience whose
+                                     rules do not fit in a row, see __probe.
+    """
+
+    def __init__(self, unit_type: Type[Fighter], rows: int = ROWS) -> None:
+        """
+        :complexity: O(r*l*D) where r is the number of rows, l the life of a new unit and D the damage limit
+        """
+        self.unit_type = unit_type
+        self.rows: List[Optional[Row]] = []
+        self.extend(rows - 1)
+
+    def extend(self, experience: int) -> None:
+        """ Tabulates the rows up to experience included.
+        :complexity: O(r*l*D) where r is the number of rows added, l the life of a new unit and D the damage limit
+        """
+        for row in range(len(self.rows), experience + 1):
+            self.rows.append(self.__probe(row))
+
+    def row(self, experience: int) -> Optional[Row]:
+        """ Returns the row of experience, tabulating it if needed, None if it has none.
+        :complexity: O(1) when the row is tabulated, otherwise see extend
+        """
+        if experience >= len(self.rows):
+            self.extend(max(experience, 2 * len(self.rows)))
+        return self.rows[experience]
+
+    def __unit(self, experience: int, life: int) -> Fighter:
+        """ Returns a new unit of the type with experience and life.
+        :complexity: O(1)
+        """
+        unit = self.unit_type()
+        unit.experience = experience
+        unit.life = life
+        return unit
+
+    def __life_lost(self, experience: int, life: int, damage: int) -> int:
+        """ Returns the life a unit with experience and life loses when it defends against damage.
+        :complexity: O(1)
+        """
+        unit = self.__unit(experience, life)
+        unit.defend(damage)
+        return life - unit.life
+
+    def __probe(self, experience: int) -> Optional[Row]:
+        """ Returns the row of experience, None if its rules do not fit in a row: the speed or attack damage change
+            with the life of the unit, the attack damage is over DAMAGE_LIMIT, or the life lost to some damage up
+            to DAMAGE_LIMIT, at some life, is not the one of a threshold on the damage.
+        :complexity: O(l*D) where l is the life of a new unit and D the damage limit
+        """
+        first = None
+        for life in range(self.unit_type().life, 0, -1):
+            unit = self.__unit(experience, life)
+            lost = tuple(self.__life_lost(experience, life, damage) for damage in range(DAMAGE_LIMIT + 1))
+            if first is None:
+                first = unit.get_speed(), unit.get_attack_damage(), lost
+            elif (unit.get_speed(), unit.get_attack_damage(), lost) != first:
+                return None
+
+        speed, attack, lost = first
+        if attack > DAMAGE_LIMIT:
+            return None
+        # the smallest damage that costs life, every larger one costs the same
+        threshold = next((damage for damage, life_lost in enumerate(lost) if life_lost != 0), None)
+        if threshold is None:
+            return speed, attack, float("inf"), 0
+        if any(life_lost != (lost[threshold] if damage >= threshold else 0) for damage, life_lost in enumerate(lost)):
+            return None
+        return speed, attack, threshold, lost[threshold]
+
+
+_rules: Dict[Type[Fighter], UnitRules] = {}
+
+
+def unit_rules(unit_type: Type[Fighter]) -> UnitRules:
+    """ Returns the rules of unit_type, tabulating them the first time.
+    :complexity: O(1) once the rules are tabulated
+    """
+    rules = _rules.get(unit_type)
+    if rules is None:
+        rules = _rules[unit_type] = UnitRules(unit_type)
+    return rules
+
+
+def loses_one_at_most(roster: Sequence[Type[Fighter]]) -> bool:
+    """ True if no unit of the roster loses more than 1 life when it defends, in the rows tabulated for its type, and
+        none of these experiences lacks a row. The toughness bound of Battle.__life_left relies on it.
+    :complexity: O(r) where r is the number of unit types, once their rules are tabulated
+    """
+    return all(row is not None and row[3] <= 1 for unit_type in roster for row in unit_rules(unit_type).rows)
+
+
+def stats(unit: Fighter) -> Optional[Row]:
+    """ Returns the (speed, attack damage, defence threshold, life lost) row of unit, None if it has none.
+    :complexity: O(1) once the row is tabulated
+    """
+    try:
+        return _rules[type(unit)].rows[unit.experience]
+    except (KeyError, IndexError):
+        return unit_rules(type(unit)).row(unit.experience)
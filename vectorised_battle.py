@@ -0,0 +1,161 @@
+"""
+Struct-of-arrays combat kernel. Runs many independent battles at once by holding every unit as an entry of parallel
+type/life/experience arrays and advancing all the battles one round at a time with NumPy operations. The rules are
+the ones of Soldier, Archer and Cavalry in army.py and the round is the one of Battle.__conduct_combat, so the results
+are identical to Battle.headless_combat. It needs NumPy, see requirements.txt, which the rest of the game does not.
+"""
+__author__ = "Zaid"
+
+from typing import Sequence, Tuple
+import numpy as np
+
+from army import Army
+
+SOLDIER = 0
+ARCHER = 1
+CAVALRY = 2
+
+STARTING_LIFE = np.array([3, 3, 4])
+COST = np.array([unit_type.COST for unit_type in Army.ROSTER])
+
+
+def _speed(unit_type: np.ndarray, experience: np.ndarray) -> np.ndarray:
+    """Vectorised get_speed of Soldier, Archer and Cavalry."""
+    return np.where(unit_type == SOLDIER, 1 - experience,
+                    np.where(unit_type == ARCHER, 3, 2 + experience))
+
+
+def _attack_damage(unit_type: np.ndarray, experience: np.ndarray) -> np.ndarray:
+    """Vectorised get_attack_damage of Soldier, Archer and Cavalry."""
+    return np.where(unit_type == ARCHER, 2 * experience + 1, 1 + experience)
+
+
+def _loses_life(unit_type: np.ndarray, experience: np.ndarray, damage: np.ndarray) -> np.ndarray:
+    """Vectorised defend of Soldier, Archer and Cavalry, returns 1 where the unit loses a life point, 0 otherwise.
+    Cavalry's damage > experience / 2 is compared as 2 * damage > experience to stay in integers.
+    """
+    return np.where(unit_type == SOLDIER, damage > experience,
+                    np.where(unit_type == ARCHER, True, 2 * damage > experience)).astype(np.int64)
+
+
+def _armies(armies: Sequence[Tuple[int, int, int]], budget: int) -> np.ndarray:
+    """Returns the armies as an array of shape (number of armies, 3).
+    :raises ValueError: if an army is not a legal army of the budget, as for Army.set_army
+    """
+    array = np.asarray(armies, dtype=np.int64)
+    if array.size == 0:
+        return array.reshape(0, 3)
+    if array.ndim != 2 or array.shape[1] != 3 or (array < 0).any() or (array @ COST > budget).any():
+        raise ValueError("Invalid number of units")
+    return array
+
+
+def _layout(armies: np.ndarray, formation: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Lays out the units of every army in the order Army.__assign_army puts them in the force.
+    For a stack position 0 is the bottom (cavalry first, soldiers on top), for a queue position 0 is the front
+    (soldiers first, cavalry at the rear).
+    :return: type and life arrays of shape (number of armies, width)
+    """
+    position = np.arange(width)[np.newaxis, :]
+    soldiers, archers, cavalry = armies[:, 0:1], armies[:, 1:2], armies[:, 2:3]
+    if formation == 0:
+        unit_type = np.where(position < cavalry, CAVALRY,
+                             np.where(position < cavalry + archers, ARCHER, SOLDIER))
+    else:
+        unit_type = np.where(position < soldiers, SOLDIER,
+                             np.where(position < soldiers + archers, ARCHER, CAVALRY))
+    return unit_type, STARTING_LIFE[unit_type]
+
+
+def vectorised_combat(armies1: Sequence[Tuple[int, int, int]], armies2: Sequence[Tuple[int, int, int]],
+                      formation: int, budget: int = Army.BUDGET) -> np.ndarray:
+    """
+    Conducts len(armies1) battles in parallel, battle i being armies1[i] against armies2[i] in the given formation.
+    :param armies1: (soldiers, archers, cavalry) of player1 for every battle
+    :param armies2: (soldiers, archers, cavalry) of player2 for every battle
+    :param formation: The formation of all the armies (0 for Stack, 1 for Queue)
+    :param budget: budget every army must fit in
+    :return: array with the result (0, 1 or 2) of every battle, as Battle.result returns it
+    :raises ValueError: if both sequences are not of the same length, or an army is not a legal army of the budget
+    :complexity: O(r*b) where r is the number of rounds of the longest battle and b the number of battles, with
+                 every round being a constant number of NumPy operations over the battles still going on
+    """
+    if len(armies1) != len(armies2):
+        raise ValueError("Both sequences of armies must be of the same length")
+    first = _armies(armies1, budget)
+    second = _armies(armies2, budget)
+    battles = len(first)
+    width = max(1, int(first.sum(axis=1).max(initial=0)), int(second.sum(axis=1).max(initial=0)))
+
+    types1, life1 = _layout(first, formation, width)
+    types2, life2 = _layout(second, formation, width)
+    exp1 = np.zeros_like(life1)
+    exp2 = np.zeros_like(life2)
+
+    length1 = first.sum(axis=1)
+    length2 = second.sum(axis=1)
+    # a stack only needs its length, the top is at length - 1
+    # a queue serves from front and appends at (front + length) % capacity, capacity being the starting size
+    front1 = np.zeros(battles, dtype=np.int64)
+    front2 = np.zeros(battles, dtype=np.int64)
+    capacity1 = np.maximum(length1, 1)
+    capacity2 = np.maximum(length2, 1)
+
+    ongoing = np.flatnonzero((length1 > 0) & (length2 > 0))
+    while len(ongoing):
+        # step 1: pop/serve units
+        if formation == 0:
+            slot1 = length1[ongoing] - 1
+            slot2 = length2[ongoing] - 1
+        else:
+            slot1 = front1[ongoing]
+            slot2 = front2[ongoing]
+        t1, l1, e1 = types1[ongoing, slot1], life1[ongoing, slot1], exp1[ongoing, slot1]
+        t2, l2, e2 = types2[ongoing, slot2], life2[ongoing, slot2], exp2[ongoing, slot2]
+
+        # step 2: attack & defend, the slower unit only strikes back if it survived
+        speed1 = _speed(t1, e1)
+        speed2 = _speed(t2, e2)
+        hurt1 = _loses_life(t1, e1, _attack_damage(t2, e2))
+        hurt2 = _loses_life(t2, e2, _attack_damage(t1, e1))
+        hurt1 = np.where(speed1 > speed2, hurt1 * (l2 - hurt2 > 0), hurt1)
+        hurt2 = np.where(speed2 > speed1, hurt2 * (l1 - hurt1 > 0), hurt2)
+        l1 = l1 - hurt1
+        l2 = l2 - hurt2
+
+        # step 3: both alive lose a life, a lone survivor gains experience
+        both = (l1 > 0) & (l2 > 0)
+        l1 = l1 - both
+        l2 = l2 - both
+        alive1 = l1 > 0
+        alive2 = l2 > 0
+        e1 = e1 + (alive1 & ~alive2)
+        e2 = e2 + (alive2 & ~alive1)
+
+        if formation == 0:
+            # a surviving unit is pushed back into the slot it was popped from
+            life1[ongoing, slot1], exp1[ongoing, slot1] = l1, e1
+            life2[ongoing, slot2], exp2[ongoing, slot2] = l2, e2
+            length1[ongoing] -= ~alive1
+            length2[ongoing] -= ~alive2
+        else:
+            rear1 = (slot1 + length1[ongoing]) % capacity1[ongoing]
+            rear2 = (slot2 + length2[ongoing]) % capacity2[ongoing]
+            front1[ongoing] = (slot1 + 1) % capacity1[ongoing]
+            front2[ongoing] = (slot2 + 1) % capacity2[ongoing]
+            length1[ongoing] -= ~alive1
+            length2[ongoing] -= ~alive2
+            keep1 = ongoing[alive1]
+            keep2 = ongoing[alive2]
+            types1[keep1, rear1[alive1]] = t1[alive1]
+            life1[keep1, rear1[alive1]] = l1[alive1]
+            exp1[keep1, rear1[alive1]] = e1[alive1]
+            types2[keep2, rear2[alive2]] = t2[alive2]
+            life2[keep2, rear2[alive2]] = l2[alive2]
+            exp2[keep2, rear2[alive2]] = e2[alive2]
+
+        # step 4: at least one army is empty, end
+        ongoing = ongoing[(length1[ongoing] > 0) & (length2[ongoing] > 0)]
+
+    # Declaring the winners, same order of checks as Battle.result
+    return np.where(length2 == 0, np.where(length1 == 0, 0, 1), 2)